@@ -4,19 +4,42 @@ Exposes the main data model (`JobPost`) and convenience `run_pipeline()` helper
 library consumers can do:
 
     from jd_filter import run_pipeline
+
+Both are resolved on first access, so ``import jd_filter`` (and therefore
+``cli.py --help``) does not pay for pydantic, httpx or the optional sinks.
 """
 
+from importlib import import_module as _import_module
 from importlib import metadata as _metadata
-
-from .models import JobPost  # noqa: F401 re-export
-from .pipeline import run as run_pipeline  # noqa: F401
+from typing import Any
 
 __all__: list[str] = [
     "JobPost",
     "run_pipeline",
 ]
 
+# name -> (module, attribute), imported on first access (PEP 562).
+_LAZY = {
+    "JobPost": ("jd_filter.models", "JobPost"),
+    "run_pipeline": ("jd_filter.pipeline", "run"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(_import_module(module), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
+
+
 try:
     __version__ = _metadata.version("jd-filter")
 except _metadata.PackageNotFoundError:  # pragma: no cover – local dev
-    __version__ = "0.0.0" 
\ No newline at end of file
+    __version__ = "0.0.0"
@@ -0,0 +1,544 @@
+"""Append-only archive of every fetched posting, for backfills without re-fetching.
+
+Only filtered postings reach the sinks, so changing a filter used to mean
+hammering the ATS APIs again.  An :class:`Archive` keeps every posting exactly
+as the connectors return it (HTML descriptions and titles as fetched, before
+normalization, dedupe and filters), so a backfill can re-run normalization
+as well as the filters.  It lives in a directory:
+
+    <root>/segment-000001.jda        compressed blocks of JSON lines
+    <root>/segment-000002.jda        started once the previous one passes segment_bytes
+    <root>/index-000001-000004.bin   sorted (source, id) -> location runs, memory-mapped
+    <root>/index-000005-000005.bin
+    <root>/LOCK                      held by the single writer
+
+Postings are buffered into blocks of about ``block_bytes``, each written as
+one zlib-compressed record, so similar descriptions compress together and a
+lookup decompresses one block.  Each index run holds a sorted array of
+64-bit ``(source, id)`` hashes next to ``(segment, block offset, offset in
+block, content digest)`` rows; runs are opened with ``numpy.memmap`` and
+searched newest first by bisection.  A posting identical to its archived
+version is skipped; a changed one is appended and the index points at the
+newest copy.
+
+    with Archive("archive/") as archive:
+        archive.append(job)                       # during a run
+    archive = Archive("archive/", readonly=True)
+    archive.get("greenhouse", "123")              # JobPost or None
+    for job in archive.scan(source="lever"):      # one block in memory at a time
+        ...
+
+:meth:`Archive.commit` (and close) syncs the segments, then adds the
+locations written since the previous commit as a new run, named after the
+commit generations it covers, so a commit costs O(new postings) rather than
+rewriting the whole index.  Whenever the newest run is at least half the size
+of the one before it the two are merged, which keeps O(log n) runs and
+rewrites each entry O(log n) times overall.  Runs are written to a temporary
+file and renamed, so the index never points at data that is not on disk; a
+run left behind by a crash during a merge is covered by the merged one and
+ignored.  A block cut short by a crash is truncated when the archive is next
+opened for writing.
+
+Requires NumPy (installed with pandas).
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Job, JobPost, JobRecord
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover – Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Block header: magic, compressed length, uncompressed length.
+_BLOCK = struct.Struct("<4sII")
+_BLOCK_MAGIC = b"JDAB"
+# Index run header: magic, entry count; keys (uint64) and locations follow.
+_INDEX = struct.Struct("<8sQ")
+_INDEX_MAGIC = b"JDAIDX01"
+# "index-<first>-<last>.bin": the run holding commits first..last.
+_RUN = re.compile(r"^index-(?P<first>\d{6})-(?P<last>\d{6})\.bin$")
+_LOC = np.dtype([("segment", "<u4"), ("inner", "<u4"), ("offset", "<u8"), ("digest", "<u8")])
+_FIELDS = ("id", "title", "company", "location", "url", "description", "created_at", "source")
+
+Loc = Tuple[int, int, int, int]
+# Blocks handed to the writer thread but not yet on disk, at most.
+_MAX_QUEUED_BLOCKS = 4
+
+
+def _key(source: str, id: str) -> int:
+    # 64-bit keys keep the index fixed-width; rows are checked against the
+    # stored source/id on lookup.
+    return int.from_bytes(hashlib.blake2b(f"{source}\x1f{id}".encode(), digest_size=8).digest(), "little")
+
+
+def _digest(line: bytes) -> int:
+    # Detects changed postings only.  Unlike blake2b, these keep the GIL for
+    # posting-sized inputs, which avoids handoffs with the writer thread.
+    return zlib.crc32(line) << 32 | zlib.adler32(line)
+
+
+def _segment_name(n: int) -> str:
+    return f"segment-{n:06d}.jda"
+
+
+def _run_name(first: int, last: int) -> str:
+    return f"index-{first:06d}-{last:06d}.bin"
+
+
+def _newest_per_key(keys: np.ndarray, locs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort by key, keeping the last of equal keys (inputs are oldest first)."""
+    # A stable sort keeps older entries first among equal keys.
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    locs = locs[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[:-1] = keys[1:] != keys[:-1]
+    return keys[keep], locs[keep]
+
+
+@dataclass
+class _Run:
+    """One memory-mapped index run, covering commits ``first..last``."""
+
+    first: int
+    last: int
+    path: Path
+    keys: np.ndarray
+    locs: np.ndarray
+
+
+@dataclass
+class ArchiveStats:
+    """What a writer did since the archive was opened."""
+
+    appended: int = 0
+    unchanged: int = 0
+    blocks: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    secs: float = 0.0
+
+
+class Archive:
+    """Segmented, compressed, append-only store of postings keyed by ``(source, id)``.
+
+    Parameters
+    ----------
+    root
+        Directory holding segments and the index (created if needed).
+    readonly
+        Open for :meth:`get` / :meth:`scan` only; no lock is taken, so a
+        reader can run next to the writer and sees its last commit.
+    segment_bytes
+        A new segment file is started once the current one passes this size.
+    block_bytes
+        Uncompressed size at which buffered postings are written as a block;
+        a lookup decompresses one block.
+    level
+        zlib level; 1 compresses about three times faster than 6 for an
+        output roughly a sixth larger.
+    threaded
+        Compress and write full blocks on a background thread (zlib releases
+        the GIL), so archiving overlaps fetching instead of stalling the
+        event loop.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        readonly: bool = False,
+        segment_bytes: int = 64 << 20,
+        block_bytes: int = 64 << 10,
+        level: int = 1,
+        threaded: bool = True,
+    ) -> None:
+        self.root = Path(root)
+        self.readonly = readonly
+        self.segment_bytes = segment_bytes
+        self.block_bytes = block_bytes
+        self.level = level
+        self.stats = ArchiveStats()
+        self._lock: Optional[IO[bytes]] = None
+        self._readers: Dict[int, IO[bytes]] = {}
+        # Last decompressed block, as ((segment, offset), data).
+        self._block_cache: Optional[Tuple[Tuple[int, int], bytes]] = None
+        # Writer state: the open segment, the block being filled and the
+        # locations written since the last commit.
+        self._fh: Optional[IO[bytes]] = None
+        self._segment = 0
+        self._lines: List[bytes] = []
+        self._line_keys: List[Tuple[int, int, int]] = []
+        self._block_size = 0
+        self._digests: Dict[int, int] = {}
+        self._latest: Dict[int, Loc] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queued: Deque[Future] = deque()
+
+        if readonly:
+            if not self.root.is_dir():
+                raise ValueError(f"No archive at {self.root}")
+        else:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._acquire_lock()
+        self._load_index()
+        if not readonly:
+            self._open_segment()
+            if threaded:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _acquire_lock(self) -> None:
+        self._lock = (self.root / "LOCK").open("ab")
+        if fcntl is None:  # pragma: no cover – Windows
+            return
+        try:
+            fcntl.flock(self._lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock.close()
+            self._lock = None
+            raise RuntimeError(f"Archive {self.root} is open for writing by another process") from None
+
+    def segments(self) -> List[int]:
+        """Numbers of the segment files, oldest first."""
+        return sorted(int(p.stem.split("-")[1]) for p in self.root.glob("segment-*.jda"))
+
+    def _load_index(self) -> None:
+        """Map the index runs, oldest first, skipping runs a merge has superseded."""
+        while True:
+            spans = []
+            for path in self.root.glob("index-*.bin"):
+                m = _RUN.match(path.name)
+                if m:
+                    spans.append((int(m["first"]), int(m["last"]), path))
+            # A merge renames its output before removing its inputs; after a
+            # crash in between, the inputs lie inside the merged run's span.
+            spans.sort(key=lambda r: (r[0], -r[1]))
+            live: List[Tuple[int, int, Path]] = []
+            for first, last, path in spans:
+                if live and last <= live[-1][1]:
+                    if not self.readonly:
+                        path.unlink()
+                    continue
+                live.append((first, last, path))
+            try:
+                self._runs = [self._map_run(*span) for span in live]
+                return
+            except FileNotFoundError:
+                # A reader raced the writer's merge; list the runs again.
+                continue
+
+    @staticmethod
+    def _map_run(first: int, last: int, path: Path) -> _Run:
+        with path.open("rb") as fh:
+            magic, count = _INDEX.unpack(fh.read(_INDEX.size))
+        if magic != _INDEX_MAGIC:
+            raise ValueError(f"{path} is not an archive index")
+        keys = np.memmap(path, dtype="<u8", mode="r", offset=_INDEX.size, shape=(count,))
+        locs = np.memmap(path, dtype=_LOC, mode="r", offset=_INDEX.size + 8 * count, shape=(count,))
+        return _Run(first, last, path, keys, locs)
+
+    def _open_segment(self) -> None:
+        numbers = self.segments()
+        self._segment = numbers[-1] if numbers else 1
+        path = self.root / _segment_name(self._segment)
+        if path.exists():
+            self._repair_tail(path)
+        self._fh = path.open("ab")
+
+    @staticmethod
+    def _repair_tail(path: Path) -> None:
+        """Truncate a block left incomplete by a crash at the end of *path*."""
+        size = path.stat().st_size
+        pos = 0
+        with path.open("rb") as fh:
+            while pos + _BLOCK.size <= size:
+                fh.seek(pos)
+                magic, clen, _ = _BLOCK.unpack(fh.read(_BLOCK.size))
+                if magic != _BLOCK_MAGIC or pos + _BLOCK.size + clen > size:
+                    break
+                pos += _BLOCK.size + clen
+        if pos < size:
+            logger.warning("Truncating %d bytes of an incomplete block from %s", size - pos, path)
+            with path.open("r+b") as fh:
+                fh.truncate(pos)
+
+    def _reader(self, segment: int) -> IO[bytes]:
+        fh = self._readers.get(segment)
+        if fh is None:
+            fh = self._readers[segment] = (self.root / _segment_name(segment)).open("rb")
+        return fh
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit (when writing) and release files and the lock."""
+        if not self.readonly and self._fh is not None:
+            try:
+                self.commit()
+            finally:
+                if self._executor is not None:
+                    self._executor.shutdown()
+                    self._executor = None
+                self._fh.close()
+                self._fh = None
+        for fh in self._readers.values():
+            fh.close()
+        self._readers.clear()
+        self._runs = []
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def __len__(self) -> int:
+        """Distinct postings in the committed index."""
+        if len(self._runs) == 1:
+            return len(self._runs[0].keys)
+        return len(np.unique(np.concatenate([r.keys for r in self._runs]))) if self._runs else 0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, job: Job) -> bool:
+        """Archive *job* as given; return False if it is identical to its archived version.
+
+        The posting is serialized immediately, so the caller may go on to
+        normalize it in place.
+        """
+        start = time.perf_counter()
+        try:
+            return self._append(job)
+        finally:
+            self.stats.secs += time.perf_counter() - start
+
+    def _append(self, job: Job) -> bool:
+        row = {f: getattr(job, f) for f in _FIELDS}
+        row["url"] = str(row["url"])
+        if row["created_at"] is not None:
+            row["created_at"] = row["created_at"].isoformat()
+        line = json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+        key = _key(job.source, job.id)
+        digest = _digest(line)
+        if digest == self._current_digest(key):
+            self.stats.unchanged += 1
+            return False
+        self._digests[key] = digest
+        self._line_keys.append((key, self._block_size, digest))
+        self._lines.append(line)
+        self._block_size += len(line)
+        self.stats.appended += 1
+        if self._block_size >= self.block_bytes:
+            self._write_block()
+        return True
+
+    def _current_digest(self, key: int) -> Optional[int]:
+        digest = self._digests.get(key)
+        if digest is not None:
+            return digest
+        row = self._find(key)
+        return int(row["digest"]) if row is not None else None
+
+    def _write_block(self) -> None:
+        """Hand the buffered postings over as one block (to the writer thread, if any)."""
+        if not self._lines or self._fh is None:
+            return
+        raw = b"".join(self._lines)
+        line_keys = list(self._line_keys)
+        self._lines.clear()
+        self._line_keys.clear()
+        self._block_size = 0
+        if self._executor is None:
+            self._store(raw, line_keys)
+            return
+        while self._queued and (self._queued[0].done() or len(self._queued) >= _MAX_QUEUED_BLOCKS):
+            self._queued.popleft().result()
+        self._queued.append(self._executor.submit(self._store, raw, line_keys))
+
+    def _sync(self) -> None:
+        """Write the buffered block and wait until every block is on disk."""
+        self._write_block()
+        while self._queued:
+            self._queued.popleft().result()
+
+    def _store(self, raw: bytes, line_keys: List[Tuple[int, int, int]]) -> None:
+        assert self._fh is not None
+        payload = zlib.compress(raw, self.level)
+        if self._fh.tell() and self._fh.tell() + _BLOCK.size + len(payload) > self.segment_bytes:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._segment += 1
+            self._fh = (self.root / _segment_name(self._segment)).open("ab")
+        offset = self._fh.tell()
+        self._fh.write(_BLOCK.pack(_BLOCK_MAGIC, len(payload), len(raw)) + payload)
+        self._fh.flush()
+        for key, inner, digest in line_keys:
+            self._latest[key] = (self._segment, inner, offset, digest)
+        self.stats.blocks += 1
+        self.stats.bytes_in += len(raw)
+        self.stats.bytes_out += _BLOCK.size + len(payload)
+
+    def commit(self) -> None:
+        """Write the buffered block, sync the segment and add new locations to the index."""
+        if self.readonly:
+            raise ValueError("Archive was opened read-only")
+        self._sync()
+        if not self._latest:
+            return
+        assert self._fh is not None
+        os.fsync(self._fh.fileno())
+
+        # Keys are distinct, so sorting is all a new run needs.
+        keys, locs = _newest_per_key(
+            np.fromiter(self._latest.keys(), dtype="<u8", count=len(self._latest)),
+            np.array(list(self._latest.values()), dtype=_LOC),
+        )
+        generation = self._runs[-1].last + 1 if self._runs else 1
+        self._runs.append(self._write_run(generation, generation, keys, locs))
+        # Everything appended so far is now in the index.
+        self._digests.clear()
+        self._latest.clear()
+        while len(self._runs) > 1 and 2 * len(self._runs[-1].keys) >= len(self._runs[-2].keys):
+            older, newer = self._runs[-2], self._runs.pop()
+            keys, locs = _newest_per_key(
+                np.concatenate([older.keys, newer.keys]), np.concatenate([older.locs, newer.locs])
+            )
+            self._runs[-1] = self._write_run(older.first, newer.last, keys, locs)
+            older.path.unlink()
+            newer.path.unlink()
+
+    def _write_run(self, first: int, last: int, keys: np.ndarray, locs: np.ndarray) -> _Run:
+        path = self.root / _run_name(first, last)
+        tmp = path.with_name(f"{path.name}.tmp")
+        with tmp.open("wb") as fh:
+            fh.write(_INDEX.pack(_INDEX_MAGIC, len(keys)))
+            fh.write(keys.tobytes())
+            fh.write(locs.tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        return self._map_run(first, last, path)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _find(self, key: int) -> Optional[np.void]:
+        """Newest location row of *key* in the committed index, or None."""
+        k = np.uint64(key)
+        for run in reversed(self._runs):
+            i = int(np.searchsorted(run.keys, k))
+            if i < len(run.keys) and run.keys[i] == k:
+                return run.locs[i]
+        return None
+
+    def _location(self, key: int) -> Optional[Loc]:
+        if key in self._digests and key not in self._latest:
+            # Still buffered or queued for the writer thread.
+            self._sync()
+        loc = self._latest.get(key)
+        if loc is not None:
+            return loc
+        row = self._find(key)
+        if row is None:
+            return None
+        return int(row["segment"]), int(row["inner"]), int(row["offset"]), int(row["digest"])
+
+    def _read_block(self, segment: int, offset: int) -> bytes:
+        cached = self._block_cache
+        if cached is not None and cached[0] == (segment, offset):
+            return cached[1]
+        fh = self._reader(segment)
+        fh.seek(offset)
+        magic, clen, _ = _BLOCK.unpack(fh.read(_BLOCK.size))
+        if magic != _BLOCK_MAGIC:
+            raise ValueError(f"Corrupt block at {_segment_name(segment)}:{offset}")
+        data = zlib.decompress(fh.read(clen))
+        self._block_cache = ((segment, offset), data)
+        return data
+
+    def get(self, source: str, id: str, *, validate: bool = True) -> Optional[JobPost]:
+        """Return the newest archived version of a posting, or None.
+
+        Its description is the raw one the connector returned; backfills
+        convert it with :func:`jd_filter.text.html_to_text` as runs do.
+        """
+        loc = self._location(_key(source, id))
+        if loc is None:
+            return None
+        segment, inner, offset, _ = loc
+        data = self._read_block(segment, offset)
+        row = json.loads(data[inner : data.index(b"\n", inner)])
+        if row["source"] != source or row["id"] != id:  # pragma: no cover – 64-bit hash collision
+            return None
+        return _to_post(row, validate)
+
+    def scan(
+        self, *, source: Optional[str] = None, latest_only: bool = True, validate: bool = True
+    ) -> Iterator[JobPost]:
+        """Yield archived postings in append order, one block in memory at a time.
+
+        With *latest_only*, superseded versions of changed postings are
+        skipped.  A writer's buffered block is written out first.
+        """
+        if not self.readonly:
+            self._sync()
+        for segment in self.segments():
+            fh = (self.root / _segment_name(segment)).open("rb")
+            with fh:
+                while True:
+                    offset = fh.tell()
+                    header = fh.read(_BLOCK.size)
+                    if len(header) < _BLOCK.size:
+                        break
+                    magic, clen, _ = _BLOCK.unpack(header)
+                    payload = fh.read(clen)
+                    if magic != _BLOCK_MAGIC or len(payload) < clen:
+                        break
+                    data = zlib.decompress(payload)
+                    inner = 0
+                    for line in data.splitlines(keepends=True):
+                        pos, inner = inner, inner + len(line)
+                        row = json.loads(line)
+                        if source is not None and row["source"] != source:
+                            continue
+                        if latest_only:
+                            loc = self._location(_key(row["source"], row["id"]))
+                            if loc is None or loc[:3] != (segment, pos, offset):
+                                continue
+                        yield _to_post(row, validate)
+
+
+def _to_post(row: Dict[str, Any], validate: bool) -> JobPost:
+    if row.get("created_at"):
+        row["created_at"] = _dt.datetime.fromisoformat(row["created_at"])
+    return JobRecord(**row).to_post(validate=validate)
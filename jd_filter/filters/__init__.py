@@ -5,10 +5,20 @@ Convenience re-exports allow:
     from jd_filter.filters import is_us, passes_keyword_filter
 """
 
-from .location import is_us  # noqa: F401
-from .keywords import passes_keyword_filter  # noqa: F401
+from .location import LocationClassifier, LocationVerdict, classify_location, is_us  # noqa: F401
+from .keywords import keyword_reject_reason, passes_keyword_filter  # noqa: F401
+from .profiles import DEFAULT_PROFILE, FilterProfile, ProfileMatch, ProfileSet, load_profiles  # noqa: F401
 
 __all__: list[str] = [
+    "DEFAULT_PROFILE",
+    "FilterProfile",
+    "ProfileMatch",
+    "ProfileSet",
+    "load_profiles",
+    "LocationClassifier",
+    "LocationVerdict",
+    "classify_location",
     "is_us",
+    "keyword_reject_reason",
     "passes_keyword_filter",
 ] 
\ No newline at end of file
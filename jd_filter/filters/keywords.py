@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Set
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple
 
-from ..models import JobPost
+from ..models import Job
 
 _BAD_KEYWORDS: Set[str] = {
     "sales",
@@ -39,13 +41,149 @@ _GOOD_KEYWORDS: Set[str] = {
 }
 
 
-def passes_keyword_filter(job: JobPost) -> bool:  # noqa: D401
-    """Return True if the job does *not* contain obvious bad keywords."""
-    blob = f"{job.title or ''} {job.description or ''}".lower()
+@dataclass(frozen=True)
+class KeywordMatch:
+    """Good and bad terms found in a single posting."""
 
-    # 1. Must include at least one good keyword
-    if not any(good in blob for good in _GOOD_KEYWORDS):
-        return False
+    good: FrozenSet[str]
+    bad: FrozenSet[str]
 
-    # 2. Must NOT include any bad keywords
-    return not any(bad in blob for bad in _BAD_KEYWORDS) 
\ No newline at end of file
+    @property
+    def passes(self) -> bool:
+        return bool(self.good) and not self.bad
+
+
+def _normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class _Term:
+    """One compiled term's word-bounded pattern."""
+
+    __slots__ = ("term", "pattern", "check_before")
+
+    def __init__(self, term: str) -> None:
+        self.term = term
+        body = r"\s+".join(re.escape(piece) for piece in term.split())
+        tail = r"(?!\w)" if _is_word_char(term[-1]) else ""
+        # No leading lookaround, so ``re`` can use its fast literal-prefix scan;
+        # the leading boundary is checked by hand in :meth:`search`.
+        self.pattern: Pattern[str] = re.compile(body + tail)
+        self.check_before = _is_word_char(term[0])
+
+    def search(self, blob: str) -> bool:
+        pos = 0
+        while True:
+            m = self.pattern.search(blob, pos)
+            if m is None:
+                return False
+            start = m.start()
+            if not (self.check_before and start and _is_word_char(blob[start - 1])):
+                return True
+            pos = start + 1
+
+
+# Byte translation table: ASCII letters are lowercased, digits and "_" are
+# kept, every other byte becomes a space.  Non-ASCII characters (their UTF-8
+# bytes) therefore separate words, like the curly quotes, dashes and
+# non-breaking spaces common in descriptions.
+_WORD_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if 97 <= c <= 122 or 48 <= c <= 57 or c == 95 else 32 for c in range(256)
+)
+
+
+def _tokens(text: str) -> List[bytes]:
+    """Return the lowercase ASCII word tokens of *text*."""
+    return text.encode("utf-8", "replace").translate(_WORD_TABLE).split()
+
+
+class KeywordMatcher:
+    """Word-bounded matcher for a fixed set of good and bad terms.
+
+    Terms are compiled once into one vocabulary of their words.  Each text
+    is tokenized a single time (a byte translation and split) and looked up
+    against that vocabulary in one pass, so the cost does not grow with the
+    number of terms.  Plain one-word terms are decided by the lookup alone;
+    any other term ("machine learning", "5+ years") is confirmed with its
+    word-bounded pattern, and only when all of its words occur.
+
+    This is not a speed-up: for the default ~25 terms a bare verdict runs
+    at roughly half the throughput of the substring scan it replaced (see
+    ``scripts/bench_keywords.py``).  What it buys is correct matches and the
+    set of matching terms at no extra cost.  Terms match as whole words
+    only, so "ai" does not fire inside "maintain" nor "hr" inside "three";
+    whitespace inside a term matches any whitespace run.
+    """
+
+    def __init__(self, good: Iterable[str], bad: Iterable[str]) -> None:
+        self._good = frozenset(_normalize_term(t) for t in good)
+        self._bad = frozenset(_normalize_term(t) for t in bad)
+        # word -> term for plain one-word terms; (words, pattern) for the rest.
+        self._words: Dict[bytes, str] = {}
+        self._phrases: List[Tuple[FrozenSet[bytes], _Term]] = []
+        for term in sorted(self._good | self._bad):
+            tokens = _tokens(term)
+            if not tokens:
+                raise ValueError(f"Keyword {term!r} has no ASCII letters or digits")
+            if tokens == [term.encode()]:
+                self._words[tokens[0]] = term
+            else:
+                self._phrases.append((frozenset(tokens), _Term(term)))
+        self._vocab = frozenset(self._words).union(*(words for words, _ in self._phrases))
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Return the set of (normalised) terms occurring in *text*."""
+        hits = self._vocab.intersection(_tokens(text))
+        if not hits:
+            return frozenset()
+        found = {self._words[w] for w in hits if w in self._words}
+        blob = ""
+        for words, term in self._phrases:
+            if words <= hits:
+                blob = blob or text.lower()
+                if term.search(blob):
+                    found.add(term.term)
+        return frozenset(found)
+
+    def match(self, text: str) -> KeywordMatch:
+        """Return every good and bad term found in *text*."""
+        found = self.find(text)
+        return KeywordMatch(good=found & self._good, bad=found & self._bad)
+
+    def passes(self, text: str) -> bool:
+        """Same verdict as ``match(text).passes``."""
+        return self.reject_reason(text) is None
+
+    def reject_reason(self, text: str) -> Optional[str]:
+        """Return ``"no_good_keyword"``, ``"bad_keyword"`` or None if *text* passes.
+
+        Costs the same as :meth:`find`; used for per-reason rejection counts.
+        """
+        found = self.find(text)
+        if self._good.isdisjoint(found):
+            return "no_good_keyword"
+        if not self._bad.isdisjoint(found):
+            return "bad_keyword"
+        return None
+
+
+_MATCHER = KeywordMatcher(_GOOD_KEYWORDS, _BAD_KEYWORDS)
+
+
+def match_keywords(job: Job) -> KeywordMatch:
+    """Return the good/bad keywords present in *job*'s title and description."""
+    return _MATCHER.match(f"{job.title or ''} {job.description or ''}")
+
+
+def keyword_reject_reason(job: Job) -> Optional[str]:
+    """Return why *job* fails the keyword filter, or None if it passes."""
+    return _MATCHER.reject_reason(f"{job.title or ''} {job.description or ''}")
+
+
+def passes_keyword_filter(job: Job) -> bool:  # noqa: D401
+    """Return True if the job has a good keyword and no bad keywords."""
+    return _MATCHER.passes(f"{job.title or ''} {job.description or ''}")
@@ -1,55 +1,360 @@
-"""USA location filter for JobPost objects."""
+"""USA location filter for JobPost objects.
+
+Location strings repeat heavily ("Remote - US", "San Francisco, CA"), so
+verdicts are computed once per distinct string and memoized:
+
+    with LocationClassifier("locations.sqlite3") as locations:
+        verdict = locations.classify("Austin, TX")  # LocationVerdict(country="US", state="TX", ...)
+        keep = locations.is_us(job)
+
+A verdict comes from the location string alone.  Only when that is
+inconclusive (empty, "Remote", a bare city) does :meth:`LocationClassifier.is_us`
+fall back to scanning the description.  The module-level :func:`is_us` uses
+a process-wide in-memory classifier.
+"""
 
 from __future__ import annotations
 
 import re
-from functools import lru_cache
-from typing import Optional
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from uszipcode import SearchEngine
-
-from ..models import JobPost
+from ..models import Job
+from .zipstate import zip_to_state
 
 # Precompile common patterns
 _US_WORDS = re.compile(r"\b(United States|USA|U\.S\.|US)\b", re.I)
 _REMOTE_US = re.compile(r"remote[^\n,;]*\b(us|united states)\b", re.I)
+_ZIP = re.compile(r"\b(\d{5})\b")
+_REMOTE = re.compile(r"\b(remote|anywhere|distributed)\b", re.I)
+# "Austin, TX" / "Toronto, ON": a two-letter code after a comma, upper case
+# only, so "..., or remote" is not Oregon.
+_REGION_CODE = re.compile(r",\s*([A-Z]{2})\b")
+# Checked before state names, which would read "Washington, DC" as WA.
+_DC = re.compile(r"\bWashington,?\s*D\.?\s?C\b\.?|\bDistrict\s+of\s+Columbia\b", re.I)
+# What precedes a region code: "Remote - San Francisco, CA" -> "San Francisco".
+_CITY_SEP = re.compile(r"[,;|/()\-–—]")
+_SPACE = re.compile(r"\s+")
 
-# Create a single shared zipcode searcher (lazy)
-@lru_cache(maxsize=1)
-def _zip_searcher():
-    return SearchEngine(simple_zipcode=True)
+# Bump when the rules below change so cached verdicts are recomputed.
+RULES_VERSION = 3
 
+_STATE_NAMES: Dict[str, str] = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC",
+    "florida": "FL", "hawaii": "HI", "idaho": "ID", "illinois": "IL", "indiana": "IN",
+    "iowa": "IA", "kansas": "KS", "kentucky": "KY", "louisiana": "LA", "maine": "ME",
+    "maryland": "MD", "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+    "mississippi": "MS", "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK",
+    "oregon": "OR", "pennsylvania": "PA", "puerto rico": "PR", "rhode island": "RI",
+    "south carolina": "SC", "south dakota": "SD", "tennessee": "TN", "texas": "TX",
+    "utah": "UT", "vermont": "VT", "virginia": "VA", "washington": "WA",
+    "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+    # "Georgia" is left out: it is also a country.  "Atlanta, GA" still matches.
+}
+_STATE_CODES = frozenset(_STATE_NAMES.values()) | {"GA"}
 
-def _structured_check(loc: Optional[str]) -> bool:
-    if not loc:
-        return False
-    return bool(_US_WORDS.search(loc) or _REMOTE_US.search(loc))
+# Countries that commonly appear in ATS location strings, by ISO code.
+_COUNTRY_NAMES: Dict[str, str] = {
+    "canada": "CA", "mexico": "MX", "united kingdom": "GB", "uk": "GB", "england": "GB",
+    "scotland": "GB", "wales": "GB", "northern ireland": "GB", "ireland": "IE",
+    "germany": "DE", "france": "FR", "spain": "ES", "portugal": "PT", "italy": "IT",
+    "netherlands": "NL", "belgium": "BE", "switzerland": "CH", "austria": "AT",
+    "sweden": "SE", "norway": "NO", "denmark": "DK", "finland": "FI", "poland": "PL",
+    "czech republic": "CZ", "czechia": "CZ", "romania": "RO", "ukraine": "UA",
+    "estonia": "EE", "lithuania": "LT", "latvia": "LV", "serbia": "RS", "greece": "GR",
+    "hungary": "HU", "turkey": "TR", "israel": "IL", "united arab emirates": "AE",
+    "uae": "AE", "india": "IN", "singapore": "SG", "japan": "JP", "china": "CN",
+    "hong kong": "HK", "taiwan": "TW", "south korea": "KR", "korea": "KR",
+    "australia": "AU", "new zealand": "NZ", "philippines": "PH", "vietnam": "VN",
+    "indonesia": "ID", "brazil": "BR", "argentina": "AR", "colombia": "CO", "chile": "CL",
+    "south africa": "ZA", "nigeria": "NG", "kenya": "KE", "egypt": "EG", "malta": "MT",
+}
+_PROVINCE_CODES = frozenset("AB BC MB NB NL NS NT NU ON PE QC SK YT".split())
+# State codes that are also the ISO code of a country above: "Toronto, CA",
+# "Berlin, DE", "Bengaluru, IN".  After a comma they are read as the state
+# unless the city before them is a known foreign one.
+_AMBIGUOUS_CODES = _STATE_CODES & frozenset(_COUNTRY_NAMES.values())
+
+# Cities that read an ambiguous code as a country: "Vancouver, CA" is in
+# Canada, while "Vancouver, WA" and "Santa Cruz, CA" are in the US.
+_FOREIGN_CITIES: Dict[str, str] = {
+    "toronto": "CA", "vancouver": "CA", "montreal": "CA", "montréal": "CA", "ottawa": "CA",
+    "calgary": "CA", "edmonton": "CA", "waterloo": "CA", "kitchener": "CA", "halifax": "CA",
+    "berlin": "DE", "munich": "DE", "münchen": "DE", "hamburg": "DE", "frankfurt": "DE",
+    "cologne": "DE", "köln": "DE", "stuttgart": "DE", "düsseldorf": "DE",
+    "tel aviv": "IL", "jerusalem": "IL", "haifa": "IL", "herzliya": "IL",
+    "bengaluru": "IN", "bangalore": "IN", "mumbai": "IN", "delhi": "IN", "new delhi": "IN",
+    "hyderabad": "IN", "pune": "IN", "chennai": "IN", "gurgaon": "IN", "gurugram": "IN",
+    "noida": "IN",
+    "bogota": "CO", "bogotá": "CO", "medellin": "CO", "medellín": "CO", "cali": "CO",
+    "jakarta": "ID", "bandung": "ID", "surabaya": "ID",
+    "valletta": "MT", "sliema": "MT", "st julian's": "MT",
+    "buenos aires": "AR", "cordoba": "AR", "córdoba": "AR", "rosario": "AR",
+}
+
+
+def _names_pattern(names: Dict[str, str]) -> re.Pattern[str]:
+    # Longest first, so "northern ireland" wins over "ireland".
+    alternatives = sorted(names, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(n).replace(r"\ ", r"\s+") for n in alternatives) + r")\b", re.I)
+
+
+_STATE_NAME_RE = _names_pattern(_STATE_NAMES)
+_COUNTRY_NAME_RE = _names_pattern(_COUNTRY_NAMES)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS locations (
+        location  TEXT PRIMARY KEY,
+        country   TEXT,
+        state     TEXT,
+        remote    INTEGER NOT NULL,
+        last_used REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
 
 
-def _zip_code_check(loc: Optional[str]) -> bool:
+@dataclass(frozen=True)
+class LocationVerdict:
+    """What a location string says about where a job is."""
+
+    # ISO 3166 alpha-2 code ("US", "GB", ...), or None when the string does
+    # not say.
+    country: Optional[str] = None
+    # Two-letter US state (or territory) code, when known.
+    state: Optional[str] = None
+    remote: bool = False
+
+    @property
+    def is_us(self) -> bool:
+        return self.country == "US"
+
+    @property
+    def ambiguous(self) -> bool:
+        """True when only the description can tell whether the job is in the US."""
+        return self.country is None
+
+
+def normalize_location(loc: Optional[str]) -> str:
+    """Return the cache key for *loc*: whitespace collapsed and stripped."""
+    return _SPACE.sub(" ", loc).strip() if loc else ""
+
+
+def _region_code_verdict(loc: str, code: str, start: int, remote: bool) -> Optional[LocationVerdict]:
+    """Read the region *code* found at *start* of *loc*, or None if it says nothing."""
+    if code in _AMBIGUOUS_CODES:
+        city = _CITY_SEP.split(loc[:start])[-1].strip().lower()
+        if _FOREIGN_CITIES.get(city) == code:
+            return LocationVerdict(country=code, remote=remote)
+    if code in _STATE_CODES:
+        return LocationVerdict(country="US", state=code, remote=remote)
+    if code in _PROVINCE_CODES:
+        return LocationVerdict(country="CA", remote=remote)
+    return None
+
+
+def classify_location(loc: Optional[str]) -> LocationVerdict:
+    """Classify one location string (uncached; see :class:`LocationClassifier`).
+
+    In order: explicit US wording ("United States", "Remote - US"), a known
+    ZIP code, Washington DC, a US state name, a foreign country name, then a
+    trailing state or Canadian province code.  Codes that are also country
+    codes are states ("Santa Cruz, CA", "Boulder, CO") unless a known
+    foreign city comes before them ("Toronto, CA", "Berlin, DE").  Anything
+    else is ambiguous.
+    """
     if not loc:
-        return False
-    # Heuristic: extract 5-digit zip
-    m = re.search(r"\b(\d{5})\b", loc)
-    if not m:
-        return False
-    zipc = m.group(1)
-    res = _zip_searcher().by_zipcode(zipc)
-    return bool(res and res.to_dict().get("state"))
+        return LocationVerdict()
+    remote = bool(_REMOTE.search(loc))
+    us = LocationVerdict(country="US", remote=remote)
+    if _US_WORDS.search(loc) or _REMOTE_US.search(loc):
+        m = _REGION_CODE.search(loc)
+        state = m.group(1) if m and m.group(1) in _STATE_CODES else None
+        if state is None and _DC.search(loc):
+            state = "DC"
+        if state is None and (m := _STATE_NAME_RE.search(loc)):
+            state = _STATE_NAMES[_SPACE.sub(" ", m.group(1).lower())]
+        return replace(us, state=state)
+    m = _ZIP.search(loc)
+    if m and (state := zip_to_state(m.group(1))) is not None:
+        return replace(us, state=state)
+    if _DC.search(loc):
+        return replace(us, state="DC")
+    if m := _STATE_NAME_RE.search(loc):
+        return replace(us, state=_STATE_NAMES[_SPACE.sub(" ", m.group(1).lower())])
+    if m := _COUNTRY_NAME_RE.search(loc):
+        return LocationVerdict(country=_COUNTRY_NAMES[_SPACE.sub(" ", m.group(1).lower())], remote=remote)
+    for m in _REGION_CODE.finditer(loc):
+        verdict = _region_code_verdict(loc, m.group(1), m.start(), remote)
+        if verdict is not None:
+            return verdict
+    return LocationVerdict(remote=remote)
 
 
-def is_us(job: JobPost) -> bool:  # noqa: D401
-    """Return True if the job appears to be US-based or Remote (US)."""
-    # 1. Structured location field
-    if _structured_check(job.location):
-        return True
+@dataclass
+class LocationStats:
+    """Counters for one :class:`LocationClassifier`."""
 
-    # 2. Zip code pattern in location
-    if _zip_code_check(job.location):
-        return True
+    hits: int = 0
+    misses: int = 0
+    # Ambiguous locations resolved by scanning the description.
+    description_scans: int = 0
 
-    # 3. Scan description if available
-    if job.description and _US_WORDS.search(job.description):
-        return True
 
-    return False 
\ No newline at end of file
+class LocationClassifier:
+    """Memoize :func:`classify_location` per normalized location string.
+
+    Parameters
+    ----------
+    cache_path
+        Optional SQLite file persisting verdicts between runs; its most
+        recently used entries are loaded when opened.  Entries unused for
+        ``max_age_days`` are dropped by :meth:`expire`, and all of them when
+        :data:`RULES_VERSION` changes.
+    max_entries
+        Size of the in-memory LRU.
+    """
+
+    def __init__(self, cache_path: str | Path | None = None, *, max_entries: int = 20_000) -> None:
+        self.stats = LocationStats()
+        self._max_entries = max_entries
+        self._lru: "OrderedDict[str, LocationVerdict]" = OrderedDict()
+        # Keys used since the last flush, written with a fresh last_used.
+        self._touched: Dict[str, LocationVerdict] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        if cache_path is not None:
+            path = Path(cache_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                for stmt in _SCHEMA:
+                    self._conn.execute(stmt)
+                self._check_version()
+            self._warm()
+
+    def _check_version(self) -> None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'rules_version'").fetchone()
+        if row is None or int(row[0]) != RULES_VERSION:
+            self._conn.execute("DELETE FROM locations")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('rules_version', ?)", (str(RULES_VERSION),)
+            )
+
+    def _warm(self) -> None:
+        rows = self._conn.execute(
+            "SELECT location, country, state, remote FROM locations ORDER BY last_used DESC LIMIT ?",
+            (self._max_entries,),
+        ).fetchall()
+        # Oldest first, so the LRU order matches recency.
+        for location, country, state, remote in reversed(rows):
+            self._lru[location] = LocationVerdict(country, state, bool(remote))
+
+    def __enter__(self) -> "LocationClassifier":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def flush(self) -> None:
+        """Write verdicts used since the last flush to the cache file."""
+        if self._conn is None or not self._touched:
+            self._touched.clear()
+            return
+        now = time.time()
+        rows: List[Tuple[Any, ...]] = [
+            (key, v.country, v.state, int(v.remote), now) for key, v in self._touched.items()
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO locations (location, country, state, remote, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (location) DO UPDATE SET last_used = excluded.last_used",
+                rows,
+            )
+        self._touched.clear()
+
+    def expire(self, max_age_days: float) -> int:
+        """Delete file entries unused for *max_age_days*; return the number removed."""
+        if self._conn is None:
+            return 0
+        self.flush()
+        cutoff = time.time() - max_age_days * 86400
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM locations WHERE last_used < ?", (cutoff,))
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: str) -> Optional[LocationVerdict]:
+        verdict = self._lru.get(key)
+        if verdict is not None:
+            self._lru.move_to_end(key)
+            return verdict
+        if self._conn is None:
+            return None
+        row = self._conn.execute(
+            "SELECT country, state, remote FROM locations WHERE location = ?", (key,)
+        ).fetchone()
+        return LocationVerdict(row[0], row[1], bool(row[2])) if row else None
+
+    def classify(self, loc: Optional[str]) -> LocationVerdict:
+        """Return the verdict for *loc*, computing it on first sight only."""
+        key = normalize_location(loc)
+        verdict = self._lookup(key)
+        if verdict is None:
+            self.stats.misses += 1
+            verdict = classify_location(key)
+        else:
+            self.stats.hits += 1
+        self._lru[key] = verdict
+        if len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
+        if self._conn is not None:
+            self._touched[key] = verdict
+        return verdict
+
+    def classify_job(self, job: Job) -> LocationVerdict:
+        """Return *job*'s location verdict, resolving ambiguous ones from the description.
+
+        The description is scanned for US wording only when the location
+        string is inconclusive; such per-job verdicts are not cached.
+        """
+        verdict = self.classify(job.location)
+        if verdict.ambiguous and job.description:
+            self.stats.description_scans += 1
+            if _US_WORDS.search(job.description):
+                return replace(verdict, country="US")
+        return verdict
+
+    def is_us(self, job: Job) -> bool:
+        """Return True if the job appears to be US-based or Remote (US)."""
+        return self.classify_job(job).is_us
+
+
+_default = LocationClassifier()
+
+
+def is_us(job: Job) -> bool:  # noqa: D401
+    """Return True if the job appears to be US-based or Remote (US)."""
+    return _default.is_us(job)
@@ -0,0 +1,271 @@
+"""Declarative filter profiles evaluated together in one pass per posting.
+
+Each team's criteria are a :class:`FilterProfile` (keywords, exclusions,
+locations, seniority, a date window), usually loaded from a JSON or TOML
+file:
+
+    # profiles.toml
+    [[profiles]]
+    name = "ml-us"
+    keywords = ["pytorch", "machine learning", "llm"]
+    exclude = ["sales", "recruiter"]
+    locations = ["US"]
+    seniority = ["junior", "mid"]
+
+    [[profiles]]
+    name = "infra-remote"
+    keywords = ["kubernetes", "terraform"]
+    locations = ["remote", "US-CA", "GB"]
+    max_age_hrs = 48
+
+A :class:`ProfileSet` compiles the terms of every profile into one shared
+matcher, so each posting's text is scanned once however many profiles and
+terms there are, and reports the names of the profiles it satisfies:
+
+    profiles = load_profiles("profiles.toml")
+    result = profiles.evaluate(job)
+    result.matched   # ("ml-us",)
+    result.reason    # None, or why no profile matched
+
+Location entries are ISO country codes (``"US"``, ``"GB"``), US states as
+``"US-CA"``, or ``"remote"``; a posting matches if any entry does.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ..models import Job
+from .keywords import _BAD_KEYWORDS, _GOOD_KEYWORDS, KeywordMatcher, _normalize_term
+from .location import LocationClassifier, LocationVerdict
+from .location import _default as _default_locations
+
+SENIORITY_LEVELS: Tuple[str, ...] = ("intern", "junior", "mid", "senior", "staff", "manager")
+
+# First match wins; titles matching none are "mid".
+_SENIORITY_PATTERNS: Tuple[Tuple[str, re.Pattern[str]], ...] = tuple(
+    (level, re.compile(pattern, re.I))
+    for level, pattern in (
+        ("intern", r"\b(intern|internship|co-?op)\b"),
+        ("manager", r"\b(manager|director|head of|vp|vice president)\b"),
+        ("staff", r"\b(staff|principal|distinguished|fellow)\b"),
+        ("senior", r"\b(senior|sr|lead)\b"),
+        ("junior", r"\b(junior|jr|entry[- ]level|new grad|graduate|associate)\b"),
+    )
+)
+
+_PROFILE_KEYS = frozenset(("name", "keywords", "exclude", "locations", "seniority", "max_age_hrs"))
+
+
+def seniority_of(title: Optional[str]) -> str:
+    """Return the seniority level (one of :data:`SENIORITY_LEVELS`) implied by *title*."""
+    if title:
+        for level, pattern in _SENIORITY_PATTERNS:
+            if pattern.search(title):
+                return level
+    return "mid"
+
+
+@dataclass(frozen=True)
+class FilterProfile:
+    """One team's hard-filter criteria; empty criteria accept everything."""
+
+    name: str
+    # At least one must occur in the title or description.
+    keywords: Tuple[str, ...] = ()
+    # None may occur in the title or description.
+    exclude: Tuple[str, ...] = ()
+    # "US", "US-CA", "GB", "remote", ...
+    locations: Tuple[str, ...] = ()
+    # Allowed levels from SENIORITY_LEVELS.
+    seniority: Tuple[str, ...] = ()
+    # Postings created longer ago are rejected; undated postings pass.
+    max_age_hrs: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            raise ValueError("Filter profile needs a name")
+        object.__setattr__(self, "keywords", tuple(dict.fromkeys(_normalize_term(t) for t in self.keywords)))
+        object.__setattr__(self, "exclude", tuple(dict.fromkeys(_normalize_term(t) for t in self.exclude)))
+        object.__setattr__(self, "locations", tuple(loc.strip().upper() for loc in self.locations))
+        object.__setattr__(self, "seniority", tuple(s.strip().lower() for s in self.seniority))
+        unknown = set(self.seniority) - set(SENIORITY_LEVELS)
+        if unknown:
+            raise ValueError(f"Profile {self.name!r}: unknown seniority {sorted(unknown)}; use {SENIORITY_LEVELS}")
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "FilterProfile":
+        unknown = set(data) - _PROFILE_KEYS
+        if unknown:
+            raise ValueError(f"Profile {data.get('name')!r}: unknown keys {sorted(unknown)}")
+        return cls(
+            name=str(data.get("name") or ""),
+            keywords=tuple(data.get("keywords") or ()),
+            exclude=tuple(data.get("exclude") or ()),
+            locations=tuple(data.get("locations") or ()),
+            seniority=tuple(data.get("seniority") or ()),
+            max_age_hrs=data.get("max_age_hrs"),
+        )
+
+    @property
+    def location_reason(self) -> str:
+        # The historical reason name for the US-only filter.
+        return "not_us" if self.locations == ("US",) else "location"
+
+    def accepts_location(self, verdict: LocationVerdict) -> bool:
+        for loc in self.locations:
+            if loc == "REMOTE":
+                if verdict.remote:
+                    return True
+            elif "-" in loc:
+                country, _, state = loc.partition("-")
+                if verdict.country == country and verdict.state == state:
+                    return True
+            elif verdict.country == loc:
+                return True
+        return False
+
+
+# The criteria jd_filter has always applied: ML keywords, no excluded terms, US only.
+DEFAULT_PROFILE = FilterProfile(
+    name="default",
+    keywords=tuple(sorted(_GOOD_KEYWORDS)),
+    exclude=tuple(sorted(_BAD_KEYWORDS)),
+    locations=("US",),
+)
+
+
+@dataclass(frozen=True)
+class ProfileMatch:
+    """Outcome of evaluating every profile against one posting."""
+
+    # Names of the satisfied profiles, in profile order.
+    matched: Tuple[str, ...]
+    # Why each other profile rejected the posting.
+    reasons: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def reason(self) -> Optional[str]:
+        """None if any profile matched, else the shared rejection reason (or ``"no_profile"``)."""
+        if self.matched:
+            return None
+        distinct = set(self.reasons.values())
+        return distinct.pop() if len(distinct) == 1 else "no_profile"
+
+
+class ProfileSet:
+    """Evaluate several :class:`FilterProfile` against each posting in one pass.
+
+    The union of every profile's terms is compiled into one
+    :class:`~jd_filter.filters.keywords.KeywordMatcher`.  A posting's text
+    is scanned once for the set of terms it contains, and each profile is
+    then decided by set lookups.  Location verdicts and seniority are
+    computed once per posting, only if some profile asks for them.  Cheap
+    criteria run first, so the text is not scanned at all when they already
+    rule out every profile.
+    """
+
+    def __init__(self, profiles: Sequence[FilterProfile]) -> None:
+        if not profiles:
+            raise ValueError("At least one filter profile is required")
+        names = [p.name for p in profiles]
+        dupes = {n for n in names if names.count(n) > 1}
+        if dupes:
+            raise ValueError(f"Duplicate filter profile names: {sorted(dupes)}")
+        self.profiles: Tuple[FilterProfile, ...] = tuple(profiles)
+        terms = {t for p in profiles for t in (*p.keywords, *p.exclude)}
+        self._matcher = KeywordMatcher(terms, ())
+        self._good: Dict[str, FrozenSet[str]] = {p.name: frozenset(p.keywords) for p in profiles}
+        self._bad: Dict[str, FrozenSet[str]] = {p.name: frozenset(p.exclude) for p in profiles}
+
+    @classmethod
+    def default(cls) -> "ProfileSet":
+        return cls([DEFAULT_PROFILE])
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(p.name for p in self.profiles)
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def evaluate(
+        self,
+        job: Job,
+        locations: Optional[LocationClassifier] = None,
+        *,
+        now: Optional[_dt.datetime] = None,
+    ) -> ProfileMatch:
+        """Return which profiles *job* satisfies (and why the others do not).
+
+        *locations* memoizes location verdicts (the module-wide classifier by
+        default); *now* (naive UTC) anchors ``max_age_hrs``.
+        """
+        reasons: Dict[str, str] = {}
+        created = job.created_at
+        if created is not None and created.tzinfo is not None:
+            created = created.astimezone(_dt.timezone.utc).replace(tzinfo=None)
+        verdict: Optional[LocationVerdict] = None
+        level: Optional[str] = None
+        live: List[FilterProfile] = []
+        for p in self.profiles:
+            if p.max_age_hrs is not None and created is not None:
+                now = now or _dt.datetime.utcnow()
+                if created < now - _dt.timedelta(hours=p.max_age_hrs):
+                    reasons[p.name] = "too_old"
+                    continue
+            if p.seniority:
+                level = level or seniority_of(job.title)
+                if level not in p.seniority:
+                    reasons[p.name] = "seniority"
+                    continue
+            if p.locations:
+                if verdict is None:
+                    classifier = locations if locations is not None else _default_locations
+                    verdict = classifier.classify_job(job)
+                if not p.accepts_location(verdict):
+                    reasons[p.name] = p.location_reason
+                    continue
+            live.append(p)
+
+        matched: List[str] = []
+        found: Optional[FrozenSet[str]] = None
+        for p in live:
+            if found is None and (p.keywords or p.exclude):
+                found = self._matcher.find(f"{job.title or ''} {job.description or ''}")
+            if p.keywords and self._good[p.name].isdisjoint(found):
+                reasons[p.name] = "no_good_keyword"
+            elif p.exclude and not self._bad[p.name].isdisjoint(found):
+                reasons[p.name] = "bad_keyword"
+            else:
+                matched.append(p.name)
+        return ProfileMatch(tuple(matched), reasons)
+
+    def match(self, job: Job, locations: Optional[LocationClassifier] = None) -> Tuple[str, ...]:
+        """Return the names of the profiles *job* satisfies."""
+        return self.evaluate(job, locations).matched
+
+
+def load_profiles(path: str | Path) -> ProfileSet:
+    """Load a :class:`ProfileSet` from a JSON or TOML (``.toml``) file.
+
+    The file holds a ``profiles`` list of tables (a bare JSON list works
+    too); see the module docstring for the keys.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError as exc:  # pragma: no cover – Python < 3.11
+            raise ImportError("TOML profiles need Python 3.11+; use JSON instead") from exc
+        data: Any = tomllib.loads(text)
+    else:
+        data = json.loads(text)
+    entries: Iterable[Mapping[str, Any]] = data.get("profiles", []) if isinstance(data, dict) else data
+    return ProfileSet([FilterProfile.from_dict(entry) for entry in entries])
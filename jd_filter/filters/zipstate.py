@@ -0,0 +1,75 @@
+"""In-memory ZIP -> state lookup backed by a bundled, precomputed table.
+
+The table (``zip_states.bin``) is generated offline by
+``scripts/build_zip_table.py``.  Layout:
+
+    b"ZST1" | n_states (u8) | n_states * 2 ASCII bytes | zlib(100_000 bytes)
+
+Byte *i* of the decompressed body holds ``1 + index`` of the state owning the
+ZIP ``f"{i:05d}"``, or 0 when the ZIP is unknown.  Decompressed it occupies
+100 kB and every lookup is a single index operation with no I/O.
+
+Data source: the committed table was built with ``--source zipcodes`` (the
+``zipcodes`` package, 42,789 ZIPs including territories and military APO/FPO
+codes) because uszipcode's simple DB is a network download that was not
+available to the build.  Both datasets are derived from USPS ZIP listings;
+``tests/test_zipstate.py`` checks the table against a checked-in sample of
+uszipcode answers (``tests/data/uszipcode_states.json``, from the database
+uszipcode 0.1.3 bundled; later releases download theirs at runtime), and
+against the live uszipcode lookup whenever its DB is installed.  Every ZIP
+in that database resolves to the same state here; the table also knows
+about 9,700 ZIPs (mostly PO-box and unique-organisation codes) it lacks.  ``zipcodes`` is a build-time dependency only and is not in
+``requirements.txt``; rebuild from uszipcode (the script's default) to
+restore the previous data exactly.
+"""
+
+from __future__ import annotations
+
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+TABLE_FILE: Path = Path(__file__).with_name("zip_states.bin")
+MAGIC = b"ZST1"
+ZIP_SPACE = 100_000
+
+
+def encode_table(mapping: dict[str, str]) -> bytes:
+    """Serialise a ``{"94301": "CA", ...}`` mapping into the on-disk format."""
+    states = sorted(set(mapping.values()))
+    if len(states) > 255:
+        raise ValueError("Too many distinct states for a one-byte table")
+    index = {s: i + 1 for i, s in enumerate(states)}
+    body = bytearray(ZIP_SPACE)
+    for zipc, state in mapping.items():
+        body[int(zipc)] = index[state]
+    header = MAGIC + bytes([len(states)]) + "".join(states).encode("ascii")
+    return header + zlib.compress(bytes(body), 9)
+
+
+def decode_table(blob: bytes) -> Tuple[bytes, Tuple[str, ...]]:
+    """Return ``(body, states)`` from the serialised table *blob*."""
+    if blob[:4] != MAGIC:
+        raise ValueError("Not a ZIP/state table")
+    n = blob[4]
+    codes = blob[5 : 5 + 2 * n].decode("ascii")
+    states = tuple(codes[i : i + 2] for i in range(0, len(codes), 2))
+    body = zlib.decompress(blob[5 + 2 * n :])
+    if len(body) != ZIP_SPACE:
+        raise ValueError("Corrupt ZIP/state table")
+    return body, states
+
+
+@lru_cache(maxsize=1)
+def _table() -> Tuple[bytes, Tuple[str, ...]]:
+    return decode_table(TABLE_FILE.read_bytes())
+
+
+def zip_to_state(zipc: str) -> Optional[str]:
+    """Return the two-letter state for a 5-digit ZIP string, or None if unknown."""
+    if len(zipc) != 5 or not zipc.isdigit():
+        return None
+    body, states = _table()
+    idx = body[int(zipc)]
+    return states[idx - 1] if idx else None
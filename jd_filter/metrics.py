@@ -0,0 +1,228 @@
+"""Minimal metrics registry with Prometheus text and JSON output.
+
+The pipeline records into a :class:`MetricsRegistry` passed down from the
+caller: the transport observes per-host request latency and bytes, connectors
+count postings and fetch time per board, and the filter stages report their
+time and rejection reasons.  At the end of a run the registry can be written
+as Prometheus text exposition (for a node-exporter textfile collector or a
+scrape endpoint) or as a JSON run report.
+
+Typical usage:
+
+    metrics = MetricsRegistry()
+    await run(orgs, metrics=metrics)
+    metrics.write_json("run_report.json")
+    metrics.write_prometheus("/var/lib/node_exporter/jd_filter.prom")
+
+Labels are positional, in the order given when the metric was declared, to
+keep the hot-path cost at one dict update.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(v) for v in labels)
+
+    def _labelstr(self, values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, values))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {_escape(self.help)}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        return dict(self._values)
+
+    def expose(self) -> List[str]:
+        lines = self._header()
+        for values, v in sorted(self._values.items()):
+            lines.append(f"{self.name}{self._labelstr(values)} {_fmt(v)}")
+        return lines
+
+    def to_dict(self) -> Any:
+        if not self.labelnames:
+            return self._values.get((), 0.0)
+        return [dict(zip(self.labelnames, k), value=v) for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value per label set that may go up or down."""
+
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., +Inf overflow], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def _cumulative(self, key: LabelValues) -> List[int]:
+        out, running = [], 0
+        for c in self._counts[key]:
+            running += c
+            out.append(running)
+        return out
+
+    def expose(self) -> List[str]:
+        lines = self._header()
+        for key in sorted(self._counts):
+            cum = self._cumulative(key)
+            for bound, c in zip(self.buckets + (math.inf,), cum):
+                lines.append(f"{self.name}_bucket{self._labelstr(key, ('le', _fmt(bound)))} {c}")
+            lines.append(f"{self.name}_sum{self._labelstr(key)} {_fmt(self._sums[key])}")
+            lines.append(f"{self.name}_count{self._labelstr(key)} {cum[-1]}")
+        return lines
+
+    def to_dict(self) -> Any:
+        out = []
+        for key in sorted(self._counts):
+            cum = self._cumulative(key)
+            out.append(
+                dict(
+                    zip(self.labelnames, key),
+                    count=cum[-1],
+                    sum=round(self._sums[key], 6),
+                    buckets={_fmt(b): c for b, c in zip(self.buckets + (math.inf,), cum)},
+                )
+            )
+        return out
+
+
+class MetricsRegistry:
+    """Named collection of metrics; ``counter``/``gauge``/``histogram`` get or create."""
+
+    def __init__(self, prefix: str = "jd_") -> None:
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs):
+        full = self.prefix + name
+        metric = self._metrics.get(full)
+        if metric is None:
+            metric = self._metrics[full] = cls(full, help, labelnames, **kwargs)
+        elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"metric {full} already registered with a different type or labels")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Return the metric registered as *name* (with or without prefix)."""
+        return self._metrics.get(name) or self._metrics.get(self.prefix + name)
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def to_prometheus(self) -> str:
+        """Render every metric in Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].expose())
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> Dict[str, Any]:
+        """Return every metric as plain data, suitable for a JSON run report."""
+        return {name: self._metrics[name].to_dict() for name in sorted(self._metrics)}
+
+    def write_prometheus(self, path: str | Path) -> None:
+        # Write-then-rename so a textfile collector never reads a partial file.
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.to_prometheus())
+        tmp.replace(path)
+
+    def write_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.report(), indent=2))
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Sequence, Union
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -19,5 +19,64 @@ class JobPost(BaseModel):
     description: Optional[str] = None
     created_at: Optional[datetime] = None
     source: str = Field(..., description="lever | greenhouse | ashby | serpapi | …")
+    profiles: List[str] = Field(default_factory=list, description="Filter profiles the posting satisfies")
+    score: Optional[float] = Field(None, description="Relevance to the ranking profile; higher is better")
 
-    model_config = {"extra": "ignore"} 
\ No newline at end of file
+    model_config = {"extra": "ignore"}
+
+
+class JobRecord:
+    """Compact, unvalidated posting used on the pipeline's hot path.
+
+    Connectors build these instead of :class:`JobPost` so the per-posting cost
+    is a plain ``__slots__`` assignment; pydantic validation (``HttpUrl``
+    parsing included) happens once, in :meth:`to_post`, for postings that
+    reach a public boundary.  Attribute names mirror ``JobPost`` so filters
+    and sinks accept either type.
+    """
+
+    __slots__ = ("id", "title", "company", "location", "url", "description", "created_at", "source", "profiles", "score")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        company: str,
+        location: Optional[str],
+        url: str,
+        description: Optional[str],
+        created_at: Optional[datetime],
+        source: str,
+        profiles: Sequence[str] = (),
+        score: Optional[float] = None,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.company = company
+        self.location = location
+        self.url = url
+        self.description = description
+        self.created_at = created_at
+        self.source = source
+        # Set by the pipeline to the names of the filter profiles it satisfies.
+        self.profiles = profiles
+        # Set by the ranking stage, if enabled.
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"JobRecord(source={self.source!r}, id={self.id!r}, title={self.title!r})"
+
+    def as_dict(self) -> dict:
+        row = {name: getattr(self, name) for name in self.__slots__}
+        row["profiles"] = list(self.profiles)
+        return row
+
+    def to_post(self, *, validate: bool = True) -> JobPost:
+        """Return a :class:`JobPost`; ``validate=False`` trusts the fields as-is."""
+        if validate:
+            return JobPost.model_validate(self.as_dict())
+        return JobPost.model_construct(**self.as_dict())
+
+
+# Anything the filters and sinks can consume.
+Job = Union[JobPost, JobRecord]
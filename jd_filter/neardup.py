@@ -0,0 +1,311 @@
+"""Near-duplicate detection with MinHash signatures and a persistent LSH index.
+
+Many orgs post the same role once per city, each under its own URL, so
+:class:`~jd_filter.utils.UrlDeduper` lets every copy through.  This index
+compares postings by content instead:
+
+* the normalized title + description is cut into word shingles and summarized
+  by a MinHash signature, whose agreement rate estimates Jaccard similarity;
+* signatures are split into bands and each band is hashed into a bucket, so
+  candidates are found by a handful of indexed lookups rather than a scan
+  (sub-linear in the number of stored postings);
+* candidates are confirmed against ``threshold`` and the posting joins the
+  cluster of its closest match, or starts a new cluster of its own.
+
+Company and location are deliberately left out of the signature.  Everything
+lives in one SQLite file, so duplicates are also caught across runs:
+
+    with NearDupIndex("neardup.sqlite3", threshold=0.8) as index:
+        match = index.check(job)
+        if match is not None:
+            print(job.id, "is in cluster", match.cluster, f"({match.similarity:.2f})")
+
+Requires NumPy (installed with pandas).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Job
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS signatures (
+        source    TEXT NOT NULL,
+        id        TEXT NOT NULL,
+        cluster   TEXT NOT NULL,
+        -- Estimated Jaccard to the closest match; NULL for a cluster's first member.
+        similarity REAL,
+        signature BLOB NOT NULL,
+        last_seen REAL NOT NULL,
+        PRIMARY KEY (source, id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS buckets (
+        bucket INTEGER NOT NULL,
+        source TEXT NOT NULL,
+        id     TEXT NOT NULL,
+        PRIMARY KEY (bucket, source, id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS buckets_by_key ON buckets (source, id)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+_WORDS = re.compile(r"\w+")
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def _lsh_params(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Return ``(bands, rows)`` for signatures of *num_perm* values.
+
+    Two postings with Jaccard similarity ``s`` share at least one bucket with
+    probability ``1 - (1 - s**rows) ** bands``, which rises steeply around
+    ``(1 / bands) ** (1 / rows)``.  The steepest curve whose midpoint is still
+    at or below *threshold* is chosen: candidates are verified anyway, so
+    extra candidates cost little while missed ones are lost duplicates.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and (rows / num_perm) ** (1 / rows) <= threshold:
+            best = (num_perm // rows, rows)
+    return best
+
+
+@dataclass(frozen=True)
+class DupMatch:
+    """Why a posting was judged a near-duplicate."""
+
+    # ``"<source>:<id>"`` of the cluster's first member.
+    cluster: str
+    # Estimated Jaccard similarity to the closest stored posting.
+    similarity: float
+
+
+class MinHasher:
+    """Compute MinHash signatures of word shingles.
+
+    The ``num_perm`` hash functions are multiply-shift hashes over the CRC32
+    of each shingle, evaluated for all shingles at once with NumPy.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_words: int = 3, seed: int = 1) -> None:
+        self.num_perm = num_perm
+        self.shingle_words = shingle_words
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> List[str]:
+        words = _WORDS.findall(text.lower())
+        k = self.shingle_words
+        if len(words) <= k:
+            return [" ".join(words)] if words else []
+        return [" ".join(words[i : i + k]) for i in range(len(words) - k + 1)]
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Return the ``uint32`` signature of *text*, or None if it has no words."""
+        shingles = set(self.shingles(text))
+        if not shingles:
+            return None
+        h = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # Wrapping uint64 arithmetic is intended: the top 32 bits of a*x+b.
+        with np.errstate(over="ignore"):
+            hashed = (np.outer(h, self._a) + self._b) >> np.uint64(32)
+        return (hashed & _MASK32).min(axis=0).astype(np.uint32)
+
+
+class NearDupIndex:
+    """Persistent MinHash/LSH index assigning postings to near-duplicate clusters.
+
+    Parameters
+    ----------
+    path
+        SQLite file holding signatures, LSH buckets and cluster ids (use
+        ``":memory:"`` for a single run).
+    threshold
+        Estimated Jaccard similarity of shingle sets at or above which two
+        postings are the same role.
+    num_perm, shingle_words
+        Signature length and shingle size.  Both are fixed when the file is
+        created; reopening it with other values raises ``ValueError``.  The
+        LSH banding is derived from *threshold* at creation and kept too, so
+        a later threshold only changes which candidates are confirmed.
+    flush_every
+        Commit after this many indexed postings, so the write lock is held
+        only briefly and several processes (e.g. sharded workers) can share
+        one file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_words: int = 3,
+        flush_every: int = 200,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self._flush_every = flush_every
+        self._unflushed = 0
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Workers sharing the file may open it at once: create the schema and
+        # settle the stored parameters under one write lock.
+        self._conn.execute("BEGIN IMMEDIATE")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+        params = self._params(num_perm, shingle_words, _lsh_params(num_perm, threshold)[0])
+        self._hasher = MinHasher(num_perm, shingle_words)
+        self.bands = params["bands"]
+        self.rows = num_perm // self.bands
+        self._conn.commit()
+
+    def _params(self, num_perm: int, shingle_words: int, bands: int) -> Dict[str, int]:
+        wanted = {"num_perm": num_perm, "shingle_words": shingle_words}
+        stored = {k: int(v) for k, v in self._conn.execute("SELECT key, value FROM meta")}
+        if not stored:
+            stored = {**wanted, "bands": bands}
+            self._conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [(k, str(v)) for k, v in stored.items()])
+            return stored
+        found = {k: stored.get(k) for k in wanted}
+        if found != wanted:
+            raise ValueError(f"Near-duplicate index was built with {found}, not {wanted}")
+        return stored
+
+    def __enter__(self) -> "NearDupIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def flush(self) -> None:
+        """Commit postings added since the last flush."""
+        self._conn.commit()
+        self._unflushed = 0
+
+    def _wrote(self) -> None:
+        self._unflushed += 1
+        if self._unflushed >= self._flush_every:
+            self.flush()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _buckets(self, sig: np.ndarray) -> List[int]:
+        """One signed 64-bit bucket key per band (band number mixed in)."""
+        keys = []
+        raw = sig.tobytes()
+        width = self.rows * 4
+        for band in range(self.bands):
+            digest = hashlib.blake2b(raw[band * width : (band + 1) * width], digest_size=8, salt=band.to_bytes(2, "little")).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def _candidates(self, buckets: List[int]) -> List[Tuple[str, bytes]]:
+        marks = ",".join("?" * len(buckets))
+        return self._conn.execute(
+            "SELECT s.cluster, s.signature FROM signatures s "
+            f"JOIN (SELECT DISTINCT source, id FROM buckets WHERE bucket IN ({marks})) b "
+            "ON s.source = b.source AND s.id = b.id",
+            buckets,
+        ).fetchall()
+
+    def check(self, job: Job) -> Optional[DupMatch]:
+        """Index *job* and return its match if it near-duplicates a stored posting.
+
+        A posting already in the index keeps the verdict it got when first
+        added (its ``last_seen`` is refreshed), so re-fetching a board does
+        not turn a cluster's representative into a duplicate of its copies.
+        """
+        key = (job.source, str(job.id))
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT cluster, similarity FROM signatures WHERE source = ? AND id = ?", key
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("UPDATE signatures SET last_seen = ? WHERE source = ? AND id = ?", (now, *key))
+            self._wrote()
+            cluster, similarity = row
+            return None if similarity is None else DupMatch(cluster, similarity)
+
+        sig = self._hasher.signature(f"{job.title or ''}\n{job.description or ''}")
+        if sig is None:
+            return None
+        buckets = self._buckets(sig)
+        best: Optional[DupMatch] = None
+        for cluster, blob in self._candidates(buckets):
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == sig))
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = DupMatch(cluster, similarity)
+
+        if best is None:
+            cluster, similarity = f"{key[0]}:{key[1]}", None
+        else:
+            cluster, similarity = best.cluster, best.similarity
+        self._conn.execute(
+            "INSERT INTO signatures (source, id, cluster, similarity, signature, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (*key, cluster, similarity, sig.tobytes(), now),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO buckets (bucket, source, id) VALUES (?, ?, ?)",
+            [(b, *key) for b in buckets],
+        )
+        self._wrote()
+        return best
+
+    # ------------------------------------------------------------------
+    # Reporting and maintenance
+    # ------------------------------------------------------------------
+
+    def cluster_of(self, source: str, id: str) -> Optional[str]:
+        """Return the cluster id of a stored posting (``"<source>:<id>"`` of its first member)."""
+        row = self._conn.execute(
+            "SELECT cluster FROM signatures WHERE source = ? AND id = ?", (source, id)
+        ).fetchone()
+        return row[0] if row else None
+
+    def members(self, cluster: str) -> List[Tuple[str, str]]:
+        """Return ``(source, id)`` of every stored posting in *cluster*."""
+        return self._conn.execute(
+            "SELECT source, id FROM signatures WHERE cluster = ? ORDER BY source, id", (cluster,)
+        ).fetchall()
+
+    def expire(self, max_age_days: float) -> int:
+        """Forget postings not seen for *max_age_days*; return the number removed."""
+        cutoff = time.time() - max_age_days * 86400
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM buckets WHERE (source, id) IN "
+                "(SELECT source, id FROM signatures WHERE last_seen < ?)",
+                (cutoff,),
+            )
+            cur = self._conn.execute("DELETE FROM signatures WHERE last_seen < ?", (cutoff,))
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
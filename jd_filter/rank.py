@@ -0,0 +1,245 @@
+"""Relevance ranking of filtered postings with a locally fitted BM25 model.
+
+Hard filters decide *whether* a posting is kept; a :class:`Ranker` orders
+the survivors by how closely they match a target profile text, e.g. the
+description a team would write for its ideal role:
+
+    with Ranker(Path("target.txt").read_text(), cache_path="rank.sqlite3") as ranker:
+        ranker.observe(job)      # every fetched posting, kept or not
+        ranker.rank(batch)       # sets job.score, sorts the batch best-first
+
+Scores are Okapi BM25 over lowercase word tokens of title and description,
+with the profile text as the query.  Each batch is tokenized once and its
+query-term counts gathered into a dense postings x query-terms matrix that
+is scored with a few vectorized operations; there is no network access and
+no model download.
+
+Document frequencies are fitted on every posting passed to
+:meth:`Ranker.observe` -- the pipeline passes every unique fetched posting,
+before the hard filters, since postings that passed them are full of the
+profile's own terms, which would then get the lowest weights.  They are
+kept in a SQLite file, so IDF statistics accumulate across runs instead of
+being re-estimated from one day's postings.  Flushes add this process's
+counts to the stored ones, so sharded workers can share the file, and
+prune the stored vocabulary to the ``max_terms`` most frequent terms; only
+the query terms' rows are ever read back.  Scoring uses the statistics as
+they were when the ranker was opened, so scores from different batches,
+and from workers that opened the same file, are comparable and can be
+sorted together.  With no stored statistics (a fresh or no cache file)
+every term has the same IDF and lengths are normalized to a typical
+posting, i.e. scores then reflect term frequencies only, until a later run
+loads what this one stored.
+
+Requires NumPy (installed with pandas).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from .models import Job
+
+# Bump when tokenization changes; stored statistics are then discarded.
+TOKENIZER_VERSION = 1
+
+# Average posting length (tokens) assumed until statistics are stored.
+_DEFAULT_AVGDL = 300.0
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS terms (
+        term TEXT PRIMARY KEY,
+        df   INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+# Byte translation table: ASCII letters are lowercased, digits, "+", "#" and
+# non-ASCII bytes (so UTF-8 sequences stay whole) are kept, everything else
+# becomes a space.  Tokens are the runs left by ``bytes.split``, which keeps
+# "c++", "c#" and "k8s" whole and runs at C speed.
+_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if 97 <= c <= 122 or 48 <= c <= 57 or c in b"+#" or c >= 128 else 32
+    for c in range(256)
+)
+
+
+def tokenize(text: str) -> List[bytes]:
+    """Return the ranking tokens of *text* (UTF-8 encoded)."""
+    return text.encode("utf-8", "replace").translate(_TABLE).split()
+
+
+@dataclass
+class RankStats:
+    """Work done by a :class:`Ranker` since it was opened."""
+
+    scored: int = 0
+    secs: float = 0.0
+
+
+class Ranker:
+    """Score postings against *profile_text* with BM25 and sort them best-first.
+
+    Parameters
+    ----------
+    profile_text
+        The target profile; repeated words weigh more.
+    cache_path
+        If provided, a SQLite file holding the document frequencies across
+        runs; otherwise they live for this instance only.
+    k1, b
+        BM25 term-frequency saturation and length normalization.
+    max_terms
+        Stored terms kept by :meth:`flush`, most frequent first; rarer terms
+        are dropped and then score like terms never seen.
+    max_pending
+        Distinct terms observed since the last flush at which
+        :meth:`observe` flushes on its own.
+    """
+
+    def __init__(
+        self,
+        profile_text: str,
+        cache_path: str | Path | None = None,
+        *,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_terms: int = 200_000,
+        max_pending: int = 200_000,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.max_terms = max_terms
+        self.max_pending = max_pending
+        self.stats = RankStats()
+        path = ":memory:" if cache_path is None else str(cache_path)
+        if cache_path is not None:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+        self._check_version()
+        self._conn.commit()
+        # Counts observed since the last flush.
+        self._pending: Counter = Counter()
+        self._pending_docs = 0
+        self._pending_tokens = 0
+        self._terms: Optional[int] = None
+
+        counts = Counter(tokenize(profile_text))
+        if not counts:
+            raise ValueError("Ranking profile text has no words")
+        self._query = list(counts)
+        self._query_tf = np.array(list(counts.values()), dtype=np.float64)
+        # Scoring statistics are fixed here; see the module docstring.
+        stored = dict(
+            self._conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({', '.join('?' for _ in self._query)})",
+                [t.decode("utf-8", "replace") for t in self._query],
+            )
+        )
+        df = np.array([stored.get(t.decode("utf-8", "replace"), 0) for t in self._query], dtype=np.float64)
+        meta = {k: int(v) for k, v in self._conn.execute("SELECT key, value FROM meta WHERE key IN ('docs', 'tokens')")}
+        docs = meta.get("docs", 0)
+        tokens = meta.get("tokens", 0)
+        self._weight = self._query_tf * np.log1p((docs - df + 0.5) / (df + 0.5))
+        self._avgdl = tokens / docs if tokens else _DEFAULT_AVGDL
+
+    def _check_version(self) -> None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'tokenizer'").fetchone()
+        if row is not None and int(row[0]) == TOKENIZER_VERSION:
+            return
+        self._conn.execute("DELETE FROM terms")
+        self._conn.execute("DELETE FROM meta")
+        self._conn.execute("INSERT INTO meta (key, value) VALUES ('tokenizer', ?)", (str(TOKENIZER_VERSION),))
+
+    def __enter__(self) -> "Ranker":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.flush()
+        len(self)  # still answers once the connection is closed
+        self._conn.close()
+
+    def __len__(self) -> int:
+        """Number of terms in the stored vocabulary."""
+        if self._terms is None:
+            self._terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        return self._terms
+
+    def observe(self, job: Job) -> None:
+        """Count *job* in the document frequencies (used by rankers opened later)."""
+        start = time.perf_counter()
+        tokens = tokenize(f"{job.title or ''} {job.description or ''}")
+        self._pending.update(set(tokens))
+        self._pending_docs += 1
+        self._pending_tokens += len(tokens)
+        if len(self._pending) >= self.max_pending:
+            self.flush()
+        self.stats.secs += time.perf_counter() - start
+
+    def flush(self) -> None:
+        """Add the counts observed since the last flush to the stored statistics."""
+        if not self._pending_docs:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT (term) DO UPDATE SET df = df + excluded.df",
+                [(t.decode("utf-8", "replace"), n) for t, n in self._pending.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + CAST(excluded.value AS INTEGER)",
+                [("docs", self._pending_docs), ("tokens", self._pending_tokens)],
+            )
+            self._terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+            if self._terms > self.max_terms:
+                self._conn.execute(
+                    "DELETE FROM terms WHERE term NOT IN (SELECT term FROM terms ORDER BY df DESC LIMIT ?)",
+                    (self.max_terms,),
+                )
+                self._terms = self.max_terms
+        self._pending.clear()
+        self._pending_docs = 0
+        self._pending_tokens = 0
+
+    def score(self, jobs: Sequence[Job]) -> np.ndarray:
+        """Return the BM25 scores of *jobs* (they are not added to the statistics)."""
+        if not jobs:
+            return np.zeros(0)
+        start = time.perf_counter()
+        query = self._query
+        tf = np.zeros((len(jobs), len(query)), dtype=np.float64)
+        lengths = np.empty(len(jobs), dtype=np.float64)
+        for i, job in enumerate(jobs):
+            tokens = tokenize(f"{job.title or ''} {job.description or ''}")
+            counts = Counter(tokens)
+            tf[i] = [counts.get(t, 0) for t in query]
+            lengths[i] = len(tokens)
+
+        norm = self.k1 * (1 - self.b + self.b * lengths / self._avgdl)
+        scores = (self._weight * tf * (self.k1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+        self.stats.scored += len(jobs)
+        self.stats.secs += time.perf_counter() - start
+        return scores
+
+    def rank(self, jobs: List[Job]) -> List[Job]:
+        """Set ``score`` on each of *jobs* and sort them in place, best first."""
+        for job, s in zip(jobs, self.score(jobs).tolist()):
+            job.score = round(s, 4)
+        jobs.sort(key=lambda j: j.score, reverse=True)
+        return jobs
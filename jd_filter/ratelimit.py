@@ -0,0 +1,120 @@
+"""Per-host rate limiting and retry helpers used by :mod:`jd_filter.transport`.
+
+* :class:`TokenBucket` – smooths request starts to ``rate`` per second with a
+  ``burst`` allowance, and can be paused when a host answers 429.
+* :class:`RetryPolicy` – which failures are transient and how long to wait
+  (full-jitter exponential backoff, overridden by ``Retry-After``; a
+  ``Retry-After`` beyond ``max_delay`` gives up instead of retrying early).
+* :class:`RetryBudget` – run-wide cap on retries and total backoff sleep so
+  a misbehaving host cannot blow out the run's latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import httpx
+
+
+class TokenBucket:
+    """Async token bucket; ``acquire`` waits until a request may start."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for *seconds* (e.g. after a 429 with ``Retry-After``)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry transient failures with jittered exponential backoff."""
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number *attempt* (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def should_retry(self, resp: Optional[httpx.Response], exc: Optional[Exception]) -> bool:
+        if exc is not None:
+            return isinstance(exc, httpx.TransportError)
+        return resp is not None and resp.status_code in self.retry_statuses
+
+    def delay(self, attempt: int, resp: Optional[httpx.Response]) -> Optional[float]:
+        """Return the wait before the next attempt, honouring ``Retry-After``.
+
+        Returns None when the server asks for more than ``max_delay``: retrying
+        sooner would only earn another 429, so the request should give up.
+        """
+        hinted = retry_after(resp) if resp is not None else None
+        if hinted is not None:
+            return hinted if hinted <= self.max_delay else None
+        return self.backoff(attempt)
+
+
+def retry_after(resp: httpx.Response) -> Optional[float]:
+    """Parse a ``Retry-After`` header (seconds or HTTP date) into seconds."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryBudget:
+    """Run-wide allowance of retries and cumulative backoff seconds."""
+
+    def __init__(self, max_retries: int = 500, max_sleep_secs: float = 120.0) -> None:
+        self.max_retries = max_retries
+        self.max_sleep_secs = max_sleep_secs
+        self.retries = 0
+        self.slept = 0.0
+
+    def try_spend(self, delay: float) -> bool:
+        """Reserve one retry sleeping *delay* seconds; False once exhausted."""
+        if self.retries >= self.max_retries or self.slept + delay > self.max_sleep_secs:
+            return False
+        self.retries += 1
+        self.slept += delay
+        return True
@@ -0,0 +1,477 @@
+"""Long-running poller that schedules every board independently.
+
+Instead of re-fetching every org on a fixed cron, :class:`Scheduler` keeps one
+warm process (pooled transport, open sinks and seen index) and gives each
+``(source, org)`` its own poll interval:
+
+* first polls are staggered by a stable hash of the org so a restart does not
+  fire thousands of requests at once;
+* after each poll the board's posting rate (new postings per hour, smoothed
+  with an EWMA) sets the next interval so that roughly
+  ``target_new_per_poll`` new postings are expected per poll, clamped to
+  ``[min_interval, max_interval]``; quiet boards back off geometrically;
+* failed fetches are retried after ``error_backoff`` without touching the
+  learned rate;
+* state lives in a small SQLite file and survives restarts.
+
+    scheduler = Scheduler(orgs, state_path="schedule.sqlite3", seen_path="seen.sqlite3")
+    asyncio.run(scheduler.serve())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as _dt
+import logging
+import math
+import sqlite3
+import time
+import zlib
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+from .filters import LocationClassifier, ProfileSet, load_profiles
+from .metrics import MetricsRegistry
+from .models import JobRecord
+from .pipeline import PipelineStats, _open_sinks, _persist_batch, _record_run, stream
+from .ratelimit import RetryBudget
+from .seen import SeenIndex
+from .text import TextNormalizer
+from .transport import HostLimits, Transport
+from .watermarks import WatermarkStore
+
+if TYPE_CHECKING:
+    from .archive import Archive
+    from .neardup import NearDupIndex
+    from .rank import Ranker
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedule (
+    source      TEXT NOT NULL,
+    org         TEXT NOT NULL,
+    interval    REAL NOT NULL,
+    next_due    REAL NOT NULL,
+    last_polled REAL,
+    rate        REAL NOT NULL DEFAULT 0,
+    polls       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, org)
+) WITHOUT ROWID
+"""
+
+Key = Tuple[str, str]
+
+
+@dataclass
+class OrgSchedule:
+    """Polling state of one board."""
+
+    source: str
+    org: str
+    interval: float
+    next_due: float
+    last_polled: Optional[float] = None
+    # Smoothed new postings per hour.
+    rate: float = 0.0
+    polls: int = 0
+
+
+def _stagger(key: Key, span: float) -> float:
+    """Stable offset in ``[0, span)`` for *key*, so restarts keep the same spread."""
+    return (zlib.crc32(f"{key[0]}/{key[1]}".encode()) / 2**32) * span
+
+
+class ScheduleState:
+    """SQLite-backed ``(source, org) -> OrgSchedule`` table."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def __enter__(self) -> "ScheduleState":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def load(self) -> Dict[Key, OrgSchedule]:
+        rows = self._conn.execute(
+            "SELECT source, org, interval, next_due, last_polled, rate, polls FROM schedule"
+        )
+        return {(r[0], r[1]): OrgSchedule(*r) for r in rows}
+
+    def save(self, entries: List[OrgSchedule]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO schedule (source, org, interval, next_due, last_polled, rate, polls) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, org) DO UPDATE SET interval = excluded.interval, "
+                "next_due = excluded.next_due, last_polled = excluded.last_polled, "
+                "rate = excluded.rate, polls = excluded.polls",
+                [(e.source, e.org, e.interval, e.next_due, e.last_polled, e.rate, e.polls) for e in entries],
+            )
+
+
+class Scheduler:
+    """Poll each board on its own adaptive interval inside one process.
+
+    Parameters
+    ----------
+    orgs
+        Mapping like ``{"lever": ["openai"], "greenhouse": ["deepmind"]}``.
+    state_path
+        SQLite file holding per-board intervals and rates.
+    seen_path
+        Seen index used to emit only new or changed postings across polls.
+    csv_path, db_uri, parquet_dir
+        Sinks, as for :func:`jd_filter.pipeline.run`; kept open while serving.
+        The CSV is appended to across restarts.
+    min_interval, max_interval, initial_interval
+        Bounds and starting point for each board's poll interval, in seconds.
+    target_new_per_poll
+        New postings a poll should find on average; lower polls hot boards
+        more often.
+    max_since_hrs
+        Upper bound of the look-back window requested from the ATS.
+    max_orgs_per_cycle
+        Boards fetched together in one cycle at most; the rest wait their turn.
+    coalesce_secs
+        Boards due within this many seconds join the current cycle, so
+        staggered boards are still fetched in batches.
+    retries_per_cycle
+        Retry budget of each cycle (the transport itself lives for the process).
+    metrics, metrics_path
+        Registry updated every cycle and, optionally, a Prometheus text file
+        rewritten after each cycle.
+    normalize, text_cache_path
+        Convert HTML descriptions to plain text, optionally caching the
+        conversions in a SQLite file (see :mod:`jd_filter.text`).
+    near_dup_path, near_dup_threshold
+        Optional near-duplicate index dropping the same role posted under
+        several URLs (see :mod:`jd_filter.neardup`).
+    location_cache_path
+        Optional SQLite file memoizing location verdicts across restarts.
+    profiles_path
+        Optional JSON/TOML filter profiles replacing the built-in filter
+        (see :mod:`jd_filter.filters.profiles`); read once at start-up.
+    watermarks_path
+        Optional SQLite file of per-board high-water marks (see
+        :mod:`jd_filter.watermarks`); boards with a mark are fetched from it
+        instead of from the cycle's ``since_hrs`` window, and marks advance
+        after each cycle's postings have been written.
+    rank_profile_path, rank_cache_path
+        Optional target profile text scoring kept postings with BM25, and a
+        SQLite file keeping its statistics (see :mod:`jd_filter.rank`); the
+        CSV is sorted by score when the scheduler stops.
+    archive_dir
+        Optional directory of a :class:`~jd_filter.archive.Archive` receiving
+        every fetched posting; its index is committed after each cycle.
+    """
+
+    def __init__(
+        self,
+        orgs: Mapping[str, List[str]],
+        *,
+        state_path: str | Path = "schedule.sqlite3",
+        seen_path: str | Path = "seen.sqlite3",
+        csv_path: str | Path | None = None,
+        db_uri: str | None = None,
+        parquet_dir: str | Path | None = None,
+        min_interval: float = 600.0,
+        max_interval: float = 86400.0,
+        initial_interval: float = 3600.0,
+        target_new_per_poll: float = 1.0,
+        rate_alpha: float = 0.3,
+        error_backoff: float = 900.0,
+        max_since_hrs: float = 24.0,
+        max_orgs_per_cycle: int = 2000,
+        coalesce_secs: float = 30.0,
+        seen_max_age_days: float = 30.0,
+        retries_per_cycle: int = 500,
+        host_limits: Optional[Mapping[str, HostLimits]] = None,
+        default_limits: HostLimits = HostLimits(),
+        metrics: Optional[MetricsRegistry] = None,
+        metrics_path: str | Path | None = None,
+        normalize: bool = True,
+        text_cache_path: str | Path | None = None,
+        near_dup_path: str | Path | None = None,
+        near_dup_threshold: float = 0.8,
+        location_cache_path: str | Path | None = None,
+        profiles_path: str | Path | None = None,
+        watermarks_path: str | Path | None = None,
+        rank_profile_path: str | Path | None = None,
+        rank_cache_path: str | Path | None = None,
+        archive_dir: str | Path | None = None,
+    ) -> None:
+        self.orgs = {src: list(dict.fromkeys(names)) for src, names in orgs.items()}
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = min(max(initial_interval, min_interval), max_interval)
+        self.target_new_per_poll = target_new_per_poll
+        self.rate_alpha = rate_alpha
+        self.error_backoff = error_backoff
+        self.max_since_hrs = max_since_hrs
+        self.max_orgs_per_cycle = max_orgs_per_cycle
+        self.coalesce_secs = coalesce_secs
+        self.seen_max_age_days = seen_max_age_days
+        self.retries_per_cycle = retries_per_cycle
+        self.host_limits = host_limits
+        self.default_limits = default_limits
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.metrics_path = metrics_path
+        self._sink_args = (csv_path, db_uri, parquet_dir)
+        self._seen_path = seen_path
+        self._normalize = normalize
+        self._text_cache_path = text_cache_path
+        self._near_dup_args = (near_dup_path, near_dup_threshold)
+        self._location_cache_path = location_cache_path
+        self._watermarks_path = watermarks_path
+        self._rank_profile = Path(rank_profile_path).read_text(encoding="utf-8") if rank_profile_path else None
+        self._rank_cache_path = rank_cache_path
+        self._archive_dir = archive_dir
+        self.profiles: Optional[ProfileSet] = load_profiles(profiles_path) if profiles_path else None
+        self._state = ScheduleState(state_path)
+        self._entries = self._init_entries(time.time())
+        self._results: Dict[Key, Tuple[int, bool]] = {}
+        self._stop = asyncio.Event()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _init_entries(self, now: float) -> Dict[Key, OrgSchedule]:
+        stored = self._state.load()
+        entries: Dict[Key, OrgSchedule] = {}
+        for source, names in self.orgs.items():
+            for org in names:
+                key = (source, org)
+                entry = stored.get(key)
+                if entry is None:
+                    entry = OrgSchedule(
+                        source=source,
+                        org=org,
+                        interval=self.initial_interval,
+                        next_due=now + _stagger(key, self.initial_interval),
+                    )
+                entries[key] = entry
+        logger.info(
+            "scheduler: %d boards (%d restored from %s)",
+            len(entries),
+            sum(k in stored for k in entries),
+            self._state.path,
+        )
+        return entries
+
+    def due(self, now: float) -> List[OrgSchedule]:
+        """Boards whose next poll is due, most overdue first, capped per cycle."""
+        horizon = now + self.coalesce_secs
+        ready = [e for e in self._entries.values() if e.next_due <= horizon]
+        ready.sort(key=lambda e: e.next_due)
+        return ready[: self.max_orgs_per_cycle]
+
+    def next_wakeup(self) -> float:
+        return min((e.next_due for e in self._entries.values()), default=time.time() + self.max_interval)
+
+    def _update(self, entry: OrgSchedule, new: int, ok: bool, now: float) -> None:
+        """Fold one poll's outcome into *entry* and pick its next due time."""
+        if not ok:
+            entry.next_due = now + min(entry.interval, self.error_backoff)
+            return
+        elapsed_hrs = (now - entry.last_polled) / 3600 if entry.last_polled else self.max_since_hrs
+        observed = new / max(elapsed_hrs, 1e-6)
+        if entry.polls == 0:
+            entry.rate = observed
+        else:
+            entry.rate = self.rate_alpha * observed + (1 - self.rate_alpha) * entry.rate
+        if entry.rate > 0:
+            interval = 3600 * self.target_new_per_poll / entry.rate
+        else:
+            interval = entry.interval * 2
+        entry.interval = min(max(interval, self.min_interval), self.max_interval)
+        entry.last_polled = now
+        entry.polls += 1
+        entry.next_due = now + entry.interval
+
+    async def _tap(self, source: str, org: str, items: AsyncIterator[JobRecord]) -> AsyncIterator[JobRecord]:
+        """Count postings newer than the board's previous poll while passing them on."""
+        entry = self._entries[(source, org)]
+        if entry.last_polled is not None:
+            cutoff = entry.last_polled
+        else:
+            cutoff = time.time() - self.max_since_hrs * 3600
+        new, ok = 0, False
+        try:
+            async for job in items:
+                created = job.created_at
+                if created is not None and created.replace(tzinfo=_dt.timezone.utc).timestamp() > cutoff:
+                    new += 1
+                yield job
+            ok = True
+        finally:
+            self._results[(source, org)] = (new, ok)
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def stop(self) -> None:
+        """Ask :meth:`serve` to return after the current cycle."""
+        self._stop.set()
+
+    async def run_cycle(
+        self,
+        due: List[OrgSchedule],
+        transport: Transport,
+        sinks,
+        seen: SeenIndex,
+        normalizer: Optional[TextNormalizer] = None,
+        near_dup: Optional[NearDupIndex] = None,
+        locations: Optional[LocationClassifier] = None,
+        watermarks: Optional[WatermarkStore] = None,
+        ranker: Optional[Ranker] = None,
+        archive: Optional[Archive] = None,
+    ) -> PipelineStats:
+        """Fetch the *due* boards once and reschedule them."""
+        start = time.time()
+        orgs: Dict[str, List[str]] = {}
+        for entry in due:
+            orgs.setdefault(entry.source, []).append(entry.org)
+        oldest = min((e.last_polled or 0.0) for e in due)
+        since_hrs = min(self.max_since_hrs, math.ceil((start - oldest) / 3600) + 1)
+
+        stats = PipelineStats()
+        self._results.clear()
+        transport.budget = RetryBudget(max_retries=self.retries_per_cycle)
+        async for batch in stream(
+            orgs,
+            since_hrs=int(since_hrs),
+            stats=stats,
+            transport=transport,
+            probe=False,
+            metrics=self.metrics,
+            org_tap=self._tap,
+            normalizer=normalizer,
+            near_dup=near_dup,
+            locations=locations,
+            profiles=self.profiles,
+            watermarks=watermarks,
+            ranker=ranker,
+            archive=archive,
+        ):
+            _persist_batch(batch, sinks, seen, stats)
+        # The sinks stay open across cycles, so they are flushed before the
+        # marks move past the postings they hold.
+        for sink in sinks:
+            sink.flush()
+        if watermarks is not None:
+            watermarks.commit()
+        if archive is not None:
+            archive.commit()
+
+        now = time.time()
+        for entry in due:
+            # Boards never started (dropped as dead slugs) count as quiet polls.
+            new, ok = self._results.get((entry.source, entry.org), (0, True))
+            self._update(entry, new, ok, now)
+        self._state.save(due)
+        _record_run(self.metrics, stats, now - start)
+        logger.info(
+            "scheduler: polled %d boards in %.1fs, %d new/changed postings",
+            len(due),
+            now - start,
+            stats.emitted,
+        )
+        return stats
+
+    async def serve(self, *, cycles: Optional[int] = None, transport: Optional[Transport] = None) -> None:
+        """Poll until :meth:`stop` is called (or *cycles* cycles have run).
+
+        A pre-built *transport* (left open) may be supplied, e.g. one redirected
+        to a mock server.
+        """
+        polls = self.metrics.counter("scheduler_polls_total", "Board polls made by the scheduler.", ("source",))
+        interval_gauge = self.metrics.gauge(
+            "scheduler_interval_seconds", "Current poll interval per board.", ("source", "org")
+        )
+        done = 0
+        if transport is None:
+            scope = Transport(limits=self.host_limits, default_limits=self.default_limits, metrics=self.metrics)
+        else:
+            scope = nullcontext(transport)
+        async with scope as transport:
+            # Appending: the seen index outlives restarts, so rows written before
+            # one are never emitted again and must stay in the CSV.
+            sinks = _open_sinks(*self._sink_args, sort_by="score" if self._rank_profile else None, append=True)
+            seen = SeenIndex(self._seen_path)
+            normalizer = TextNormalizer(self._text_cache_path) if self._normalize else None
+            locations = LocationClassifier(self._location_cache_path)
+            watermarks = WatermarkStore(self._watermarks_path) if self._watermarks_path else None
+            ranker = None
+            if self._rank_profile:
+                from .rank import Ranker
+
+                ranker = Ranker(self._rank_profile, self._rank_cache_path)
+            archive = None
+            if self._archive_dir:
+                from .archive import Archive
+
+                archive = Archive(self._archive_dir)
+            near_dup_path, near_dup_threshold = self._near_dup_args
+            near_dup = None
+            if near_dup_path:
+                from .neardup import NearDupIndex
+
+                near_dup = NearDupIndex(near_dup_path, threshold=near_dup_threshold)
+            last_expire = 0.0
+            try:
+                while not self._stop.is_set() and (cycles is None or done < cycles):
+                    now = time.time()
+                    due = self.due(now)
+                    if not due:
+                        wait = max(0.0, min(self.next_wakeup() - now, 60.0))
+                        try:
+                            await asyncio.wait_for(self._stop.wait(), timeout=wait)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+                    await self.run_cycle(due, transport, sinks, seen, normalizer, near_dup, locations, watermarks, ranker, archive)
+                    for entry in due:
+                        polls.inc(entry.source)
+                        interval_gauge.set(entry.source, entry.org, value=entry.interval)
+                    if now - last_expire > 3600:
+                        seen.expire(self.seen_max_age_days)
+                        if normalizer is not None:
+                            normalizer.expire(self.seen_max_age_days)
+                        locations.expire(self.seen_max_age_days)
+                        if near_dup is not None:
+                            near_dup.expire(self.seen_max_age_days)
+                        last_expire = now
+                    if self.metrics_path:
+                        self.metrics.write_prometheus(self.metrics_path)
+                    done += 1
+            finally:
+                for sink in sinks:
+                    sink.close()
+                seen.close()
+                if normalizer is not None:
+                    normalizer.close()
+                if near_dup is not None:
+                    near_dup.close()
+                locations.close()
+                if watermarks is not None:
+                    watermarks.close()
+                if ranker is not None:
+                    ranker.close()
+                if archive is not None:
+                    archive.close()
+                self._state.close()
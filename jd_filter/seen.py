@@ -0,0 +1,147 @@
+"""Persistent cross-run index of already-emitted postings.
+
+Keyed by ``(source, id)`` with a content hash, so a run can emit only postings
+that are new or whose content changed since they were last written.  Backed by
+a single SQLite file; rows not seen for ``max_age_days`` are expired.
+
+    with SeenIndex("seen.sqlite3") as seen:
+        fresh = seen.filter_new(jobs)
+        ...write fresh...
+        seen.mark(fresh)
+        seen.expire(30)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .models import Job
+from .utils import chunk
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    source       TEXT NOT NULL,
+    id           TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen   REAL NOT NULL,
+    last_seen    REAL NOT NULL,
+    PRIMARY KEY (source, id)
+) WITHOUT ROWID
+"""
+
+# SQLite's default host-parameter limit is 999; two per key.
+_LOOKUP_BATCH = 400
+
+
+def content_hash(job: Job) -> str:
+    """Return a stable hash of the fields whose change warrants re-emitting *job*."""
+    parts = (
+        job.title,
+        job.company,
+        job.location or "",
+        str(job.url),
+        job.description or "",
+        job.created_at.isoformat() if job.created_at else "",
+        # A posting newly matching a profile is re-emitted for that team.
+        ",".join(job.profiles),
+    )
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+
+class SeenIndex:
+    """SQLite-backed ``(source, id) -> content hash`` index."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Sharded workers may share one index; wait out each other's writes.
+        self._conn = sqlite3.connect(self.path, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def __enter__(self) -> "SeenIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _lookup(self, keys: Sequence[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        found: Dict[Tuple[str, str], str] = {}
+        for batch in chunk(keys, _LOOKUP_BATCH):
+            where = " OR ".join(["(source = ? AND id = ?)"] * len(batch))
+            params = [v for key in batch for v in key]
+            for source, id_, h in self._conn.execute(
+                f"SELECT source, id, content_hash FROM seen WHERE {where}", params
+            ):
+                found[(source, id_)] = h
+        return found
+
+    def filter_new(self, jobs: Sequence[Job]) -> List[Job]:
+        """Return the subset of *jobs* that is unseen or changed, order preserved."""
+        if not jobs:
+            return []
+        known = self._lookup([(j.source, j.id) for j in jobs])
+        return [j for j in jobs if known.get((j.source, j.id)) != content_hash(j)]
+
+    def mark(self, jobs: Iterable[Job]) -> None:
+        """Record *jobs* as seen now (call after sinks have committed).
+
+        Pass every job that is still listed, not just the emitted ones, so that
+        unchanged postings keep a fresh ``last_seen`` and do not expire.
+        """
+        now = time.time()
+        rows = [(j.source, j.id, content_hash(j), now, now) for j in jobs]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO seen (source, id, content_hash, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, id) DO UPDATE SET "
+                "content_hash = excluded.content_hash, last_seen = excluded.last_seen",
+                rows,
+            )
+
+    def expire(self, max_age_days: float) -> int:
+        """Delete entries not seen for *max_age_days*; return the number removed."""
+        cutoff = time.time() - max_age_days * 86400
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM seen WHERE last_seen < ?", (cutoff,))
+        return cur.rowcount
+
+    def merge(self, other: str | Path) -> int:
+        """Fold another index file (e.g. a shard's) into this one.
+
+        For keys present in both, the more recently seen entry wins and the
+        earliest ``first_seen`` is kept, so merging is order-independent.
+        Returns the number of rows read from *other*.
+        """
+        self._conn.execute("ATTACH DATABASE ? AS other", (str(other),))
+        try:
+            with self._conn:
+                n = self._conn.execute("SELECT COUNT(*) FROM other.seen").fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO seen (source, id, content_hash, first_seen, last_seen) "
+                    "SELECT source, id, content_hash, first_seen, last_seen FROM other.seen WHERE true "
+                    "ON CONFLICT (source, id) DO UPDATE SET "
+                    "content_hash = CASE WHEN excluded.last_seen > seen.last_seen "
+                    "THEN excluded.content_hash ELSE seen.content_hash END, "
+                    "first_seen = MIN(seen.first_seen, excluded.first_seen), "
+                    "last_seen = MAX(seen.last_seen, excluded.last_seen)"
+                )
+        finally:
+            self._conn.execute("DETACH DATABASE other")
+        return n
+
+    def compact(self) -> None:
+        """Reclaim space after large expiries."""
+        self._conn.execute("VACUUM")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
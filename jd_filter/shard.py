@@ -0,0 +1,197 @@
+"""Sharded execution over the org list.
+
+Orgs are assigned to one of ``N`` shards by a stable hash of
+``source/org`` (independent of ``PYTHONHASHSEED``, list order and the other
+orgs), so every node or process agrees on the split without coordination and
+a board always lands in the same shard from run to run.
+
+Two ways to use it:
+
+* one node, several cores – :func:`run_sharded` runs each shard in its own
+  worker process, then merges the per-shard CSVs;
+* several nodes – each runs ``cli.py run --shard i/N`` with its own output
+  paths, and ``cli.py merge`` combines the shard CSVs and seen indexes.
+
+Merging is deterministic: rows are ordered by ``(source, id)`` and duplicate
+URLs across shards keep the smallest ``(source, id)``, whatever order the
+shards finished in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import hashlib
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .seen import SeenIndex
+from .sinks.base import COLUMNS
+from .transport import HostLimits
+
+logger = logging.getLogger(__name__)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"i/N"`` (0-based *i*) into ``(i, N)``."""
+    try:
+        index_s, count_s = spec.split("/")
+        index, count = int(index_s), int(count_s)
+    except ValueError:
+        raise ValueError(f"shard must look like 'i/N', got {spec!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"shard index must be in [0, {count}), got {spec!r}")
+    return index, count
+
+
+def shard_of(source: str, org: str, count: int) -> int:
+    """Return the shard (``0 <= shard < count``) that owns ``source/org``."""
+    digest = hashlib.blake2b(f"{source}/{org}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def select_shard(orgs: Mapping[str, List[str]], index: int, count: int) -> Dict[str, List[str]]:
+    """Return the part of *orgs* owned by shard *index* of *count*, order preserved."""
+    return {src: [o for o in names if shard_of(src, o, count) == index] for src, names in orgs.items()}
+
+
+def partition(orgs: Mapping[str, List[str]], count: int) -> List[Dict[str, List[str]]]:
+    """Split *orgs* into *count* shards."""
+    shards: List[Dict[str, List[str]]] = [{src: [] for src in orgs} for _ in range(count)]
+    for src, names in orgs.items():
+        for org in names:
+            shards[shard_of(src, org, count)][src].append(org)
+    return shards
+
+
+def shard_path(path: str | Path, index: int, count: int) -> Path:
+    """``latest_jobs.csv`` -> ``latest_jobs.shard-0-of-4.csv``."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.shard-{index}-of-{count}{path.suffix}")
+
+
+# ---------------------------------------------------------------------------
+# Merging
+# ---------------------------------------------------------------------------
+
+
+def merge_csv(inputs: Sequence[str | Path], output: str | Path, *, sort_by: Optional[str] = None) -> int:
+    """Merge shard CSVs into *output*; return the number of rows written.
+
+    Rows are sorted by ``(source, id)``, or by the numeric *sort_by* column
+    (highest first) when given; a ``(source, id)`` or URL seen in more than
+    one shard is written once.  Missing inputs (shards with no matches) are
+    skipped.
+    """
+    rows: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for path in inputs:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with path.open(newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                rows.setdefault((row["source"], row["id"]), row)
+
+    seen_urls = set()
+    out: List[Dict[str, str]] = []
+    for key in sorted(rows):
+        row = rows[key]
+        if row["url"] in seen_urls:
+            continue
+        seen_urls.add(row["url"])
+        out.append(row)
+    if sort_by:
+        out.sort(key=lambda r: float(r[sort_by]) if r.get(sort_by) else float("-inf"), reverse=True)
+
+    if out:
+        with Path(output).open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(out)
+    logger.info("Merged %d shard CSVs into %s (%d rows)", len(inputs), output, len(out))
+    return len(out)
+
+
+def merge_seen(inputs: Sequence[str | Path], output: str | Path) -> int:
+    """Fold shard seen indexes into *output*; return the resulting entry count."""
+    with SeenIndex(output) as seen:
+        for path in inputs:
+            if Path(path).exists() and Path(path).resolve() != seen.path.resolve():
+                seen.merge(path)
+        return len(seen)
+
+
+# ---------------------------------------------------------------------------
+# Local worker processes
+# ---------------------------------------------------------------------------
+
+
+def _run_shard(orgs: Dict[str, List[str]], host_map: Optional[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: run one shard in a fresh event loop."""
+    from .pipeline import PipelineStats, run
+    from .transport import Transport
+
+    async def _main() -> PipelineStats:
+        stats = PipelineStats()
+        async with Transport(
+            limits=kwargs.pop("host_limits", None),
+            default_limits=kwargs.pop("default_limits"),
+            budget=kwargs.pop("retry_budget", None),
+            host_map=host_map,
+        ) as transport:
+            await run(orgs, transport=transport, stats=stats, **kwargs)
+        return stats
+
+    return asdict(asyncio.run(_main()))
+
+
+def run_sharded(
+    orgs: Mapping[str, List[str]],
+    workers: int,
+    *,
+    csv_path: str | Path | None = "latest_jobs.csv",
+    host_map: Optional[Dict[str, str]] = None,
+    **run_kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """Run :func:`jd_filter.pipeline.run` over *workers* shards in parallel processes.
+
+    Each worker writes ``shard_path(csv_path, i, workers)``; these are merged
+    into *csv_path* and removed.  Other sinks are shared: Parquet shards
+    write separate part files and database sinks upsert by key.  The
+    ``seen_path`` and ``near_dup_path`` indexes are opened by every worker
+    (SQLite WAL serialises the writes, and the near-duplicate index commits
+    every ``flush_every`` postings), so a posting seen by one shard is
+    skipped or clustered by the others too.  An ``archive_dir`` has a single
+    writer and is rejected with :class:`ValueError` when *workers* > 1.
+    Ranked shards are merged by ``score``; every worker scores
+    against the ranking statistics stored when it started (see
+    :mod:`jd_filter.rank`), so their scores are comparable.  Remaining
+    keyword arguments go to ``run``.  Returns each shard's
+    :class:`~jd_filter.pipeline.PipelineStats` as a dict.
+    """
+    if workers > 1 and run_kwargs.get("archive_dir"):
+        raise ValueError("an archive has a single writer; run_sharded needs workers=1 with archive_dir")
+    run_kwargs.setdefault("default_limits", HostLimits())
+    shards = partition(orgs, workers)
+    csv_parts = [shard_path(csv_path, i, workers) if csv_path else None for i in range(workers)]
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = [
+            pool.submit(_run_shard, shard, host_map, {**run_kwargs, "csv_path": part})
+            for shard, part in zip(shards, csv_parts)
+        ]
+        results = [f.result() for f in futures]
+
+    if csv_path:
+        sort_by = "score" if run_kwargs.get("rank_profile_path") else None
+        merge_csv([p for p in csv_parts if p is not None], csv_path, sort_by=sort_by)
+        for part in csv_parts:
+            if part is not None:
+                part.unlink(missing_ok=True)
+    for i, stats in enumerate(results):
+        logger.info("shard %d/%d: %s", i, workers, {k: v for k, v in stats.items() if isinstance(v, int)})
+    return results
@@ -0,0 +1,42 @@
+"""Output sinks that persist batches of filtered job postings.
+
+Convenience re-exports allow:
+
+    from jd_filter.sinks import CsvSink, ParquetSink, PostgresSink, SqlSink
+
+Each sink's module is imported on first access, so using the CSV sink never
+loads pandas or SQLAlchemy.
+"""
+
+from importlib import import_module
+from typing import Any
+
+__all__: list[str] = [
+    "Sink",
+    "CsvSink",
+    "SqlSink",
+    "PostgresSink",
+    "ParquetSink",
+]
+
+_LAZY = {
+    "Sink": "base",
+    "CsvSink": "csvfile",
+    "SqlSink": "sql",
+    "PostgresSink": "postgres",
+    "ParquetSink": "parquet",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
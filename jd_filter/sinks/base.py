@@ -0,0 +1,44 @@
+"""Common interface for output sinks."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+from ..models import Job, JobPost
+
+# Column order for tabular outputs; follows the model's field order.
+COLUMNS: List[str] = list(JobPost.model_fields)
+
+
+def job_row(job: Job) -> Dict[str, Any]:
+    """Return *job* as a flat dict of column -> Python value."""
+    row = {c: getattr(job, c) for c in COLUMNS}
+    row["url"] = str(row["url"])
+    row["profiles"] = ",".join(row["profiles"])
+    return row
+
+
+class Sink:
+    """Receives bounded batches of postings as the pipeline produces them.
+
+    ``write`` may be called any number of times (including zero); ``close``
+    is always called once at the end of a run.  Each ``write`` should be
+    durable on return so callers can checkpoint after it; ``flush`` is
+    called before longer-lived checkpoints (board watermarks) for sinks that
+    only reach stable storage lazily.
+    """
+
+    def write(self, jobs: Sequence[Job]) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Force rows written so far to stable storage (e.g. before a checkpoint)."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
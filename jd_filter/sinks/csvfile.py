@@ -0,0 +1,85 @@
+"""CSV sink written incrementally, one batch at a time."""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+from pathlib import Path
+from typing import IO, Optional, Sequence
+
+from ..models import Job
+from .base import COLUMNS, Sink, job_row
+
+logger = logging.getLogger(__name__)
+
+
+class CsvSink(Sink):
+    """Write postings to *path*, replacing any previous file.
+
+    The file is created lazily on the first non-empty batch, so a run with no
+    matches leaves an earlier output untouched.  With *append*, rows are
+    added to an existing file instead (the header is written only when the
+    file is new or empty), so a restarted long-running process keeps what
+    it wrote before.  With *sort_by* (a numeric
+    column such as ``score``), :meth:`close` rewrites the finished file
+    sorted by that column, highest first; until then rows are in arrival
+    order.
+    """
+
+    def __init__(self, path: str | Path, *, sort_by: Optional[str] = None, append: bool = False) -> None:
+        self.path = Path(path)
+        self.sort_by = sort_by
+        self.append = append
+        self._fh: Optional[IO[str]] = None
+        self._writer: Optional[csv.DictWriter] = None
+        self.rows = 0
+
+    def write(self, jobs: Sequence[Job]) -> None:
+        if not jobs:
+            return
+        if self._writer is None:
+            self._open()
+        self._writer.writerows(job_row(j) for j in jobs)
+        assert self._fh is not None
+        self._fh.flush()
+        self.rows += len(jobs)
+
+    def _open(self) -> None:
+        fresh = True
+        if self.append and self.path.exists() and self.path.stat().st_size:
+            with self.path.open(newline="", encoding="utf-8") as fh:
+                header = next(csv.reader(fh), [])
+            if header != COLUMNS:
+                raise ValueError(f"Cannot append to {self.path}: its columns {header} differ from {COLUMNS}")
+            fresh = False
+        self._fh = self.path.open("a" if self.append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._fh, fieldnames=COLUMNS)
+        if fresh:
+            self._writer.writeheader()
+
+    def flush(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            if self.sort_by:
+                self._sort(self.sort_by)
+            logger.info("Wrote %d rows to %s", self.rows, self.path)
+
+    def _sort(self, column: str) -> None:
+        # Filtered output is small enough to sort in memory; the rename keeps
+        # the unsorted file intact if anything fails.
+        with self.path.open(newline="", encoding="utf-8") as fh:
+            rows = list(csv.DictReader(fh))
+        rows.sort(key=lambda r: float(r[column]) if r[column] else float("-inf"), reverse=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp, self.path)
@@ -0,0 +1,291 @@
+"""Columnar Parquet sink, partitioned by source and run date.
+
+Layout (Hive-style, readable by pyarrow, DuckDB, Spark, pandas):
+
+    <root>/source=lever/run_date=2024-05-01/part-<run_id>-00000.parquet
+
+Each :meth:`ParquetSink.write` stages its rows per partition in a hidden,
+fsynced file (``.<run_id>-00000-00003.stage``), so they are durable as soon
+as ``write`` returns, as the :class:`Sink` contract requires.  A partition's
+staged batches are compacted into one part file, written in row groups of
+``row_group_size`` rows, once they hold ``rows_per_file`` rows and on every
+:meth:`~ParquetSink.flush` and :meth:`~ParquetSink.close`; only then do
+scans see them.  A run therefore leaves one part file per partition (per
+scheduler cycle when serving), not one per batch.  Batches staged by a run
+that crashed are compacted by the next sink opened on the same root.
+
+The partition date is taken at write time, so a long-running scheduler
+rolls over to a new ``run_date`` at midnight UTC.  ``company``,
+``location`` and ``profiles`` are dictionary-encoded, ``description`` is
+zstd-compressed, and ``source`` / ``run_date`` live in the directory names.
+Use :func:`scan` to read history back as a projected, filtered columnar scan.
+
+Requires the optional ``pyarrow`` dependency.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import logging
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models import Job
+from .base import Sink
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover – Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_DATA_COLUMNS = ["id", "title", "company", "location", "url", "description", "created_at", "profiles", "score"]
+_DICTIONARY_COLUMNS = ["company", "location", "profiles"]
+_COMPRESSION = {c: ("zstd" if c == "description" else "snappy") for c in _DATA_COLUMNS}
+# ".<run_id>-<part>-<batch>.stage": batch *batch* of part file *part*.
+_STAGED = re.compile(r"^\.(?P<run_id>.+)-(?P<part>\d{5})-(?P<batch>\d{5})\.stage$")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:  # pragma: no cover – optional dependency
+        raise ImportError("ParquetSink requires 'pyarrow' (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def _schema(pa):
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("title", pa.string()),
+            ("company", pa.string()),
+            ("location", pa.string()),
+            ("url", pa.string()),
+            ("description", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            # Comma-separated filter profile names, as in the CSV and DB sinks.
+            ("profiles", pa.string()),
+            ("score", pa.float64()),
+        ]
+    )
+
+
+@dataclass
+class _Partition:
+    """Staged batches of one ``source=/run_date=`` directory."""
+
+    path: Path
+    part: int = 0
+    staged: List[Path] = field(default_factory=list)
+    rows: int = 0
+
+
+class ParquetSink(Sink):
+    """Write postings to a partitioned Parquet dataset under *root*.
+
+    Part files are named ``part-<run_id>-<seq>.parquet``, so repeated runs on
+    the same day (and sharded workers sharing *root*) add files rather than
+    overwrite them.  Pass *run_date* to pin every write to one partition.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        run_date: Optional[_dt.date] = None,
+        run_id: Optional[str] = None,
+        row_group_size: int = 10_000,
+        rows_per_file: int = 100_000,
+    ) -> None:
+        self._pa = _pyarrow()
+        self.root = Path(root)
+        self.run_date = run_date.isoformat() if run_date else None
+        self.run_id = run_id or f"{_dt.datetime.utcnow():%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.row_group_size = row_group_size
+        self.rows_per_file = rows_per_file
+        self._schema = _schema(self._pa)
+        self._partitions: Dict[Tuple[str, str], _Partition] = {}
+        self.rows = 0
+        self.files = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = self._acquire_lock()
+        self._recover()
+
+    # ------------------------------------------------------------------
+    # Run locks and crash recovery
+    # ------------------------------------------------------------------
+
+    def _acquire_lock(self) -> IO[bytes]:
+        # Held while the sink is open; a run whose lock is free has ended.
+        lock = (self.root / f".run-{self.run_id}.lock").open("ab")
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return lock
+
+    def _recover(self) -> None:
+        """Compact batches staged by runs that ended without closing their sink."""
+        if fcntl is None:  # pragma: no cover – Windows: cannot tell live runs apart
+            return
+        for lock_path in self.root.glob(".run-*.lock"):
+            run_id = lock_path.name[len(".run-") : -len(".lock")]
+            if run_id == self.run_id:
+                continue
+            with lock_path.open("ab") as fh:
+                try:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # still running, e.g. another shard
+                groups: Dict[Path, List[Path]] = {}
+                for staged in self.root.glob("source=*/run_date=*/.*.stage"):
+                    m = _STAGED.match(staged.name)
+                    if m and m["run_id"] == run_id:
+                        part = staged.with_name(f"part-{run_id}-{m['part']}.parquet")
+                        groups.setdefault(part, []).append(staged)
+                for part, staged_files in groups.items():
+                    self._compact(part, sorted(staged_files))
+                    logger.info("Recovered %d staged batches into %s", len(staged_files), part)
+                lock_path.unlink()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write(self, jobs: Sequence[Job]) -> None:
+        if not jobs:
+            return
+        run_date = self.run_date or _dt.datetime.utcnow().date().isoformat()
+        if self.run_date is None:
+            # A new day: finish the previous day's files.
+            for key in [k for k in self._partitions if k[1] != run_date]:
+                self._rotate(key)
+                del self._partitions[key]
+        by_source: Dict[str, Dict[str, List[Any]]] = {}
+        for job in jobs:
+            buf = by_source.get(job.source)
+            if buf is None:
+                buf = by_source[job.source] = {c: [] for c in _DATA_COLUMNS}
+            buf["id"].append(job.id)
+            buf["title"].append(job.title)
+            buf["company"].append(job.company)
+            buf["location"].append(job.location)
+            buf["url"].append(str(job.url))
+            buf["description"].append(job.description)
+            buf["created_at"].append(job.created_at)
+            buf["profiles"].append(",".join(job.profiles))
+            buf["score"].append(job.score)
+        for source, buf in by_source.items():
+            key = (source, run_date)
+            part = self._partitions.get(key)
+            if part is None:
+                path = self.root / f"source={source}" / f"run_date={run_date}"
+                part = self._partitions[key] = _Partition(path)
+            staged = part.path / f".{self.run_id}-{part.part:05d}-{len(part.staged):05d}.stage"
+            self._write_file(staged, self._pa.Table.from_pydict(buf, schema=self._schema), staged=True)
+            part.staged.append(staged)
+            part.rows += len(buf["id"])
+            if part.rows >= self.rows_per_file:
+                self._rotate(key)
+        self.rows += len(jobs)
+
+    def _rotate(self, key: Tuple[str, str]) -> None:
+        """Compact *key*'s staged batches into its next part file."""
+        part = self._partitions[key]
+        if not part.staged:
+            return
+        self._compact(part.path / f"part-{self.run_id}-{part.part:05d}.parquet", part.staged)
+        part.part += 1
+        part.staged = []
+        part.rows = 0
+
+    def _compact(self, path: Path, staged: List[Path]) -> None:
+        """Write the rows of *staged* as the part file *path*, then remove them."""
+        # After a crash between the rename and the unlinks the part file is
+        # already complete; writing it again would duplicate its rows.
+        if not path.exists():
+            pq = self._pa.parquet
+            table = self._pa.concat_tables([pq.read_table(p, schema=self._schema) for p in staged])
+            self._write_file(path, table)
+            self.files += 1
+        for p in staged:
+            p.unlink(missing_ok=True)
+
+    def _write_file(self, path: Path, table: Any, *, staged: bool = False) -> None:
+        """Write *table* to *path* atomically and durably.
+
+        Staged batches are read back once, so they skip compression and
+        dictionary encoding; part files get both.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Dot-prefixed, so dataset scans skip it until it is renamed into place.
+        tmp = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(tmp, "wb") as fh:
+                self._pa.parquet.write_table(
+                    table,
+                    fh,
+                    row_group_size=self.row_group_size,
+                    use_dictionary=False if staged else _DICTIONARY_COLUMNS,
+                    compression="none" if staged else _COMPRESSION,
+                )
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def flush(self) -> None:
+        """Compact every partition's staged batches, making them visible to scans."""
+        for key in list(self._partitions):
+            self._rotate(key)
+
+    def close(self) -> None:
+        if self._lock is None:
+            return
+        self.flush()
+        lock_path = Path(self._lock.name)
+        self._lock.close()
+        self._lock = None
+        lock_path.unlink(missing_ok=True)
+        if self.files:
+            logger.info("Wrote %d rows in %d files to %s", self.rows, self.files, self.root)
+
+
+def scan(
+    root: str | Path,
+    *,
+    columns: Optional[List[str]] = None,
+    since: Optional[_dt.date] = None,
+    until: Optional[_dt.date] = None,
+    sources: Optional[List[str]] = None,
+):
+    """Return a ``pyarrow.Table`` of history under *root*.
+
+    Only the requested *columns* are read, and partitions outside
+    ``[since, until]`` or *sources* are pruned without being opened.
+    """
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(
+        pa.schema([("source", pa.string()), ("run_date", pa.string())]), flavor="hive"
+    )
+    dataset = ds.dataset(str(root), format="parquet", partitioning=partitioning)
+    conds = []
+    if since is not None:
+        conds.append(ds.field("run_date") >= since.isoformat())
+    if until is not None:
+        conds.append(ds.field("run_date") <= until.isoformat())
+    if sources:
+        conds.append(ds.field("source").isin(sources))
+    expr = None
+    for cond in conds:
+        expr = cond if expr is None else expr & cond
+    return dataset.to_table(columns=columns, filter=expr)
@@ -0,0 +1,217 @@
+"""Keyed, idempotent database sink: bulk ``COPY`` + ``ON CONFLICT`` upsert.
+
+Rows are keyed by ``(source, id)`` so re-running a scrape updates postings in
+place instead of duplicating them.  On PostgreSQL each batch is streamed with
+``COPY`` into a temporary staging table and merged with a single
+``INSERT ... ON CONFLICT (source, id) DO UPDATE``.  SQLite URIs (handy for
+local runs and tests) use an ``executemany`` upsert with the same semantics.
+No pandas objects are built on this path.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+from typing import Any, List, Sequence, Tuple
+
+import sqlalchemy as sa
+
+from ..models import Job
+from .base import COLUMNS, Sink
+from .sql import get_engine
+
+logger = logging.getLogger(__name__)
+
+_KEY = ("source", "id")
+_COLUMN_TYPES = {
+    "id": "TEXT NOT NULL",
+    "title": "TEXT",
+    "company": "TEXT",
+    "location": "TEXT",
+    "url": "TEXT",
+    "description": "TEXT",
+    "created_at": "TIMESTAMP",
+    "source": "TEXT NOT NULL",
+    "profiles": "TEXT",
+    "score": "DOUBLE PRECISION",
+}
+
+
+def _copy_field(v: Any) -> str:
+    # COPY's CSV format reads an unquoted empty field as NULL and any quoted
+    # field as text, so every value is quoted and NULL is left empty: no
+    # string (not even "" or a literal \N) can turn into NULL.
+    if v is None:
+        return ""
+    if hasattr(v, "isoformat"):
+        v = v.isoformat()
+    return '"' + str(v).replace('"', '""') + '"'
+
+
+def _copy_csv(rows: List[Tuple[Any, ...]]) -> str:
+    """Render *rows* as COPY ... WITH (FORMAT csv) input."""
+    return "".join(",".join(map(_copy_field, row)) + "\n" for row in rows)
+
+
+def _row(job: Job) -> Tuple[Any, ...]:
+    return (
+        job.id,
+        job.title,
+        job.company,
+        job.location,
+        str(job.url),
+        job.description,
+        job.created_at,
+        job.source,
+        ",".join(job.profiles),
+        job.score,
+    )
+
+
+class PostgresSink(Sink):
+    """Upsert batches into *table*, creating it (keyed on ``source, id``) if needed.
+
+    The SQLAlchemy engine comes from :func:`~jd_filter.sinks.sql.get_engine`, so
+    repeated runs in one process (e.g. a scheduler) reuse its connection pool.
+    """
+
+    def __init__(self, db_uri: str, *, table: str = "jobs") -> None:
+        self.table = table
+        self._engine = get_engine(db_uri)
+        self._dialect = self._engine.dialect.name
+        if self._dialect not in ("postgresql", "sqlite"):
+            raise ValueError(f"PostgresSink does not support the {self._dialect!r} dialect")
+        self.rows = 0
+        self._ensure_schema()
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def _ensure_schema(self) -> None:
+        cols = ", ".join(f"{c} {_COLUMN_TYPES[c]}" for c in COLUMNS)
+        with self._engine.begin() as conn:
+            conn.execute(
+                sa.text(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} "
+                    f"({cols}, PRIMARY KEY ({', '.join(_KEY)}))"
+                )
+            )
+            # Tables created before a column was added to the model get it now
+            # (NULL for existing rows).
+            existing = {c["name"] for c in sa.inspect(conn).get_columns(self.table)}
+            for c in COLUMNS:
+                if c not in existing:
+                    conn.execute(sa.text(f"ALTER TABLE {self.table} ADD COLUMN {c} {_COLUMN_TYPES[c]}"))
+            # Tables created by the old ``to_sql`` append path have no key;
+            # a unique index makes them usable as an ON CONFLICT target.
+            if not self._has_key(conn):
+                self._drop_duplicates(conn)
+                conn.execute(
+                    sa.text(
+                        f"CREATE UNIQUE INDEX IF NOT EXISTS {self.table}_source_id_key "
+                        f"ON {self.table} ({', '.join(_KEY)})"
+                    )
+                )
+            # Ranked runs are read back best-first.
+            conn.execute(sa.text(f"CREATE INDEX IF NOT EXISTS {self.table}_score_idx ON {self.table} (score DESC)"))
+
+    def _has_key(self, conn: sa.Connection) -> bool:
+        """True if *table* already has a primary key or unique index on ``(source, id)``."""
+        inspector = sa.inspect(conn)
+        if sorted(inspector.get_pk_constraint(self.table)["constrained_columns"]) == sorted(_KEY):
+            return True
+        return any(
+            ix["unique"] and sorted(ix["column_names"]) == sorted(_KEY)
+            for ix in inspector.get_indexes(self.table)
+        )
+
+    def _drop_duplicates(self, conn: sa.Connection) -> None:
+        """Keep only the most recently appended row for each ``(source, id)``.
+
+        The append path never updated rows, so physical order (``ctid`` /
+        ``rowid``) is append order and the highest one is the newest copy.
+        """
+        key = ", ".join(_KEY)
+        if self._dialect == "postgresql":
+            sql = (
+                f"DELETE FROM {self.table} a USING {self.table} b "
+                f"WHERE {' AND '.join(f'a.{c} = b.{c}' for c in _KEY)} AND a.ctid < b.ctid"
+            )
+        else:
+            sql = (
+                f"DELETE FROM {self.table} WHERE rowid NOT IN "
+                f"(SELECT MAX(rowid) FROM {self.table} GROUP BY {key})"
+            )
+        removed = conn.execute(sa.text(sql)).rowcount
+        if removed:
+            logger.info("Removed %d duplicate (%s) rows from %s before keying it", removed, key, self.table)
+
+    def _upsert_sql(self, select_from: str | None = None) -> str:
+        cols = ", ".join(COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in COLUMNS if c not in _KEY)
+        if select_from is None:
+            values = "VALUES (" + ", ".join("?" for _ in COLUMNS) + ")"
+        else:
+            # DISTINCT ON keeps one row per key (ON CONFLICT may not touch a
+            # row twice within one statement): the last one in the batch, as
+            # on the executemany path.
+            key = ", ".join(_KEY)
+            values = f"SELECT DISTINCT ON ({key}) {cols} FROM {select_from} ORDER BY {key}, _ord DESC"
+        return (
+            f"INSERT INTO {self.table} ({cols}) {values} "
+            f"ON CONFLICT ({', '.join(_KEY)}) DO UPDATE SET {updates}"
+        )
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write(self, jobs: Sequence[Job]) -> None:
+        if not jobs:
+            return
+        rows = [_row(j) for j in jobs]
+        if self._dialect == "postgresql":
+            self._copy_upsert(rows)
+        else:
+            self._executemany_upsert(rows)
+        self.rows += len(rows)
+
+    def _copy_upsert(self, rows: List[Tuple[Any, ...]]) -> None:
+        buf = io.StringIO(_copy_csv(rows))
+
+        stage = f"_{self.table}_stage"
+        raw = self._engine.raw_connection()
+        try:
+            cur = raw.cursor()
+            cur.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+                # _ord numbers the rows in COPY (i.e. batch) order.
+                f"(LIKE {self.table} INCLUDING DEFAULTS, _ord BIGSERIAL) ON COMMIT DELETE ROWS"
+            )
+            cur.copy_expert(f"COPY {stage} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buf)
+            cur.execute(self._upsert_sql(select_from=stage))
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+    def _executemany_upsert(self, rows: List[Tuple[Any, ...]]) -> None:
+        rows = [
+            tuple(v.isoformat(sep=" ") if hasattr(v, "isoformat") else v for v in row)
+            for row in rows
+        ]
+        raw = self._engine.raw_connection()
+        try:
+            raw.cursor().executemany(self._upsert_sql(), rows)
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+    def close(self) -> None:
+        logger.info("Upserted %d rows into %s", self.rows, self.table)
@@ -0,0 +1,44 @@
+"""Generic SQLAlchemy sink appending rows to a ``jobs`` table."""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Sequence
+
+import sqlalchemy as sa
+
+from ..models import Job
+from .base import Sink, job_row
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_engine(db_uri: str) -> sa.Engine:
+    """Return a process-wide pooled engine for *db_uri*, created on first use."""
+    return sa.create_engine(db_uri, pool_pre_ping=True)
+
+
+class SqlSink(Sink):
+    """Append each batch to ``jobs`` via ``DataFrame.to_sql`` in its own transaction."""
+
+    def __init__(self, db_uri: str, *, table: str = "jobs") -> None:
+        self.table = table
+        self._engine = get_engine(db_uri)
+        self.rows = 0
+
+    def write(self, jobs: Sequence[Job]) -> None:
+        if not jobs:
+            return
+        # Imported here so the PostgreSQL/SQLite sinks, which share
+        # get_engine, do not load pandas.
+        import pandas as pd
+
+        df = pd.DataFrame([job_row(j) for j in jobs])
+        with self._engine.begin() as conn:
+            df.to_sql(self.table, conn, if_exists="append", index=False, method="multi")
+        self.rows += len(jobs)
+
+    def close(self) -> None:
+        logger.info("Inserted %d rows into %s", self.rows, self.table)
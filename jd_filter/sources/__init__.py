@@ -1,21 +1,29 @@
 """Source connectors that retrieve job postings from various ATS/job boards.
 
-Each module exposes an async `fetch_<source>() -> list[jd_filter.models.JobPost]`.
+Each module exposes an async `fetch_<source>() -> list[jd_filter.models.JobPost]`
+and a streaming `iter_<source>()` async generator yielding compact
+`jd_filter.models.JobRecord`s as they are decoded.
 """
 
 from importlib import import_module
 from types import ModuleType
-from typing import Any, Callable, List
-
-from ..models import JobPost
+from typing import Any, Callable
 
 __all__: list[str] = [
     "fetch_lever",
     "fetch_greenhouse",
     "fetch_ashby",
+    "iter_lever",
+    "iter_greenhouse",
+    "iter_ashby",
+    "validate_lever_slugs",
+    "validate_ashby_boards",
+    "load_lever_registry",
+    "load_ashby_registry",
 ]
 
-# Lazy import wrappers so the heavy dependencies are loaded only when used.
+# Lazy import wrappers so the heavy dependencies (httpx, pydantic) are loaded
+# only when used; the pipeline imports the slug helpers through these too.
 
 def _lazy(name: str, func_name: str) -> Callable[..., Any]:
     def _wrapper(*args: Any, **kwargs: Any):
@@ -27,4 +35,11 @@ def _lazy(name: str, func_name: str) -> Callable[..., Any]:
 
 fetch_lever: Callable[..., Any] = _lazy("lever", "fetch_lever")  # type: ignore
 fetch_greenhouse: Callable[..., Any] = _lazy("greenhouse", "fetch_greenhouse")  # type: ignore
-fetch_ashby: Callable[..., Any] = _lazy("ashby", "fetch_ashby")  # type: ignore 
\ No newline at end of file
+fetch_ashby: Callable[..., Any] = _lazy("ashby", "fetch_ashby")  # type: ignore
+iter_lever: Callable[..., Any] = _lazy("lever", "iter_lever")  # type: ignore
+iter_greenhouse: Callable[..., Any] = _lazy("greenhouse", "iter_greenhouse")  # type: ignore
+iter_ashby: Callable[..., Any] = _lazy("ashby", "iter_ashby")  # type: ignore
+validate_lever_slugs: Callable[..., Any] = _lazy("lever", "validate_lever_slugs")  # type: ignore
+validate_ashby_boards: Callable[..., Any] = _lazy("ashby", "validate_ashby_boards")  # type: ignore
+load_lever_registry: Callable[..., Any] = _lazy("lever", "load_registry")  # type: ignore
+load_ashby_registry: Callable[..., Any] = _lazy("ashby", "load_registry")  # type: ignore
@@ -0,0 +1,161 @@
+"""Incremental decoding of the JSON arrays returned by ATS board APIs.
+
+Board responses are one big array of postings (Lever), or an object wrapping
+it under a key (``{"jobs": [...]}`` for Greenhouse and Ashby).  Calling
+``resp.json()`` on them materializes every posting, HTML description
+included, before the first one can be used.  :func:`iter_array` instead
+decodes the body chunk by chunk and yields each element as soon as it is
+complete, so memory is bounded by the largest single posting rather than by
+the size of the board.
+
+Only the standard library is used: elements are decoded with
+``json.JSONDecoder.raw_decode`` once enough bytes have arrived.  A failed
+attempt waits for the element's pending text to double before retrying, so
+a multi-megabyte element costs O(size) in total rather than one decode per
+chunk.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Mapping, Optional
+
+from ..transport import Transport
+
+_WS = " \t\r\n"
+_SCALAR_END = re.compile(r"[\s,\]}:]")
+_decoder = json.JSONDecoder()
+
+# Once this many consumed characters pile up at the front of the buffer
+# they are dropped, instead of slicing after every element.
+_COMPACT_AT = 1 << 16
+
+
+class _Buffer:
+    """Text decoded so far from an async stream of byte chunks."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk; return False once the stream is exhausted."""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.text += self._utf8.decode(b"", final=True)
+            return False
+        if self.pos >= _COMPACT_AT:
+            self.text = self.text[self.pos :]
+            self.pos = 0
+        self.text += self._utf8.decode(chunk)
+        return True
+
+    async def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of stream)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, char: str) -> None:
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found or 'end of input'!r}")
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Decode one complete JSON value at the current position."""
+        if await self.peek() not in '"[{':
+            # A number or literal is only complete once a delimiter follows
+            # ("12" + "34", "-5" + ".0"), or at the end of input.
+            while _SCALAR_END.search(self.text, self.pos) is None and await self.fill():
+                pass
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value is cut off at the chunk boundary.
+                # Retry only once the pending text has doubled, so a value
+                # spanning k chunks is decoded O(log k) times, not k times.
+                pending = len(self.text) - self.pos
+                grew = False
+                while len(self.text) - self.pos < 2 * pending and await self.fill():
+                    grew = True
+                if grew:
+                    continue
+                raise
+            self.pos = end
+            return obj
+
+
+async def iter_array(chunks: AsyncIterator[bytes], key: Optional[str] = None) -> AsyncIterator[Any]:
+    """Yield the elements of a JSON array as they are decoded from *chunks*.
+
+    If the document is an object, the array under its top-level *key* is
+    streamed instead; sibling members are decoded and discarded, and a
+    missing key yields nothing.  A bare top-level array is accepted either
+    way, matching the connectors' old ``data.get(key, []) if dict else data``.
+    """
+    buf = _Buffer(chunks)
+    first = await buf.peek()
+    if first == "{":
+        if key is None:
+            raise ValueError("JSON stream is an object but no array key was given")
+        buf.pos += 1
+        while True:
+            if await buf.peek() == "}":
+                return
+            name = await buf.value()
+            await buf.expect(":")
+            if name == key and await buf.peek() == "[":
+                break
+            value = await buf.value()
+            if name == key and value is not None:
+                raise ValueError(f"JSON member {key!r} is not an array")
+            if await buf.peek() == ",":
+                buf.pos += 1
+    elif first != "[":
+        raise ValueError(f"Expected a JSON array or object, found {first or 'end of input'!r}")
+
+    buf.pos += 1
+    if await buf.peek() == "]":
+        return
+    while True:
+        yield await buf.value()
+        sep = await buf.peek()
+        buf.pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {sep or 'end of input'!r}")
+
+
+async def fetch_array(
+    client: Transport, url: str, *, params: Mapping[str, Any], key: Optional[str] = None
+) -> AsyncIterator[Any]:
+    """GET *url* through *client* and yield the elements of its JSON array body.
+
+    Raises :class:`httpx.HTTPStatusError` for error statuses before anything
+    is yielded, like ``resp.raise_for_status()`` after a plain ``get``.
+    """
+    async with client.stream(url, params=params) as resp:
+        resp.raise_for_status()
+        chunks = resp.aiter_bytes()
+        async for item in iter_array(chunks, key):
+            yield item
+        # Read to EOF (at most the closing brackets) so the connection goes
+        # back to the pool instead of being closed with the response.
+        async for _ in chunks:
+            pass
@@ -0,0 +1,335 @@
+"""Slug/board bookkeeping shared by the Lever and Ashby connectors.
+
+Both ATSs expose boards by a slug that can disappear (404/410) when a company
+moves elsewhere.  A small SQLite registry (WAL mode, one file for both
+sources) remembers, per slug, its streak of consecutive "gone" responses,
+when it last answered 200, and smoothed fetch latency and posting rate, so
+that:
+
+* slugs seen alive within ``ttl_hrs`` are trusted without a probe,
+* the remaining slugs are probed concurrently under a bounded semaphore,
+* or, with probing disabled, the real fetch response is classified instead
+  (see :func:`classify_iter`),
+* discovery scripts add new slugs without rewriting the whole store.
+
+Updates are buffered in memory and applied by :meth:`SlugRegistry.save` in a
+single transaction as relative upserts (``fails = fails + n``), so parallel
+workers and scripts can share the file without losing each other's changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+from httpx import HTTPStatusError
+
+from ..transport import Transport, ensure_transport
+from ..utils import chunk
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+FAIL_THRESHOLD = 3
+DEFAULT_TTL_HRS = 24.0
+DEFAULT_CONCURRENCY = 20
+GONE_STATUSES = (404, 410)
+
+# Registry file shared by every source (stored alongside this module).
+REGISTRY_FILE: Path = Path(__file__).with_name("slugs.sqlite3")
+
+# Weight of the newest observation in the latency / posting-rate averages.
+_EWMA_ALPHA = 0.3
+# SQLite's default host-parameter limit is 999.
+_LOOKUP_BATCH = 900
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS slugs (
+        source        TEXT NOT NULL,
+        slug          TEXT NOT NULL,
+        fails         INTEGER NOT NULL DEFAULT 0,
+        last_ok       REAL,
+        last_checked  REAL,
+        latency_ms    REAL,
+        postings_per_day REAL,
+        added_at      REAL NOT NULL,
+        PRIMARY KEY (source, slug)
+    ) WITHOUT ROWID
+    """,
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+_UPSERT_OK = (
+    "INSERT INTO slugs (source, slug, fails, last_ok, last_checked, latency_ms, postings_per_day, added_at) "
+    "VALUES (?, ?, 0, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (source, slug) DO UPDATE SET fails = 0, last_ok = excluded.last_ok, "
+    "last_checked = excluded.last_checked, "
+    f"latency_ms = CASE WHEN excluded.latency_ms IS NULL THEN latency_ms WHEN latency_ms IS NULL "
+    f"THEN excluded.latency_ms ELSE {1 - _EWMA_ALPHA} * latency_ms + {_EWMA_ALPHA} * excluded.latency_ms END, "
+    f"postings_per_day = CASE WHEN excluded.postings_per_day IS NULL THEN postings_per_day "
+    f"WHEN postings_per_day IS NULL THEN excluded.postings_per_day "
+    f"ELSE {1 - _EWMA_ALPHA} * postings_per_day + {_EWMA_ALPHA} * excluded.postings_per_day END"
+)
+_UPSERT_GONE = (
+    "INSERT INTO slugs (source, slug, fails, last_ok, last_checked, added_at) VALUES (?, ?, ?, NULL, ?, ?) "
+    "ON CONFLICT (source, slug) DO UPDATE SET fails = fails + excluded.fails, last_ok = NULL, "
+    "last_checked = excluded.last_checked"
+)
+_INSERT_NEW = "INSERT OR IGNORE INTO slugs (source, slug, added_at) VALUES (?, ?, ?)"
+
+
+def registry_path(default: Path = REGISTRY_FILE) -> Path:
+    """Return *default*, relocated under ``$JD_FILTER_REGISTRY_DIR`` when set.
+
+    Lets benchmarks and sharded workers (which inherit the environment) keep
+    registries out of the package directory.
+    """
+    root = os.getenv("JD_FILTER_REGISTRY_DIR")
+    return Path(root) / default.name if root else default
+
+
+class SlugRegistry:
+    """SQLite-backed ``(source, slug)`` health registry.
+
+    Reads go through a per-instance cache filled by :meth:`prefetch` (or one
+    row at a time); writes are buffered until :meth:`save`.  On first use for
+    a source, a legacy JSON registry (*legacy_json*, either ``{"slug": fails}``
+    or ``{"slug": {"fails": n, ...}}``) is imported once.
+    """
+
+    def __init__(self, path: Path, source: str, *, legacy_json: Optional[Path] = None) -> None:
+        self.path = path
+        self.source = source
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Sharded workers share the file; wait out each other's writes.
+        self._conn = sqlite3.connect(path, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+        self._conn.commit()
+        if legacy_json is not None:
+            self._import_legacy(legacy_json)
+        # slug -> (fails, last_ok) as last read or as changed locally.
+        self._rows: Dict[str, Tuple[int, Optional[float]]] = {}
+        self._ok: Dict[str, Tuple[float, Optional[float], Optional[float]]] = {}
+        self._gone: Dict[str, int] = {}
+        self._new: List[str] = []
+
+    def __enter__(self) -> "SlugRegistry":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Save pending changes and close the connection."""
+        self.save()
+        self._conn.close()
+
+    def _import_legacy(self, legacy: Path) -> None:
+        key = f"imported:{self.source}"
+        with self._conn:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return
+            try:
+                raw = json.loads(legacy.read_text()) if legacy.exists() else {}
+            except Exception:
+                raw = {}
+            now = time.time()
+            rows = []
+            for slug, val in raw.items():
+                fails = int(val.get("fails", 0)) if isinstance(val, dict) else int(val)
+                last_ok = val.get("last_ok") if isinstance(val, dict) else None
+                rows.append((self.source, slug, fails, last_ok, now))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO slugs (source, slug, fails, last_ok, added_at) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(legacy)))
+        if rows:
+            logger.info("Imported %d %s slugs from %s", len(rows), self.source, legacy)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def prefetch(self, slugs: Iterable[str]) -> None:
+        """Load the rows of *slugs* in a few batched queries."""
+        missing = [s for s in dict.fromkeys(slugs) if s not in self._rows]
+        for batch in chunk(missing, _LOOKUP_BATCH):
+            marks = ",".join("?" * len(batch))
+            found = {
+                slug: (fails, last_ok)
+                for slug, fails, last_ok in self._conn.execute(
+                    f"SELECT slug, fails, last_ok FROM slugs WHERE source = ? AND slug IN ({marks})",
+                    (self.source, *batch),
+                )
+            }
+            for slug in batch:
+                self._rows[slug] = found.get(slug, (0, None))
+
+    def _row(self, slug: str) -> Tuple[int, Optional[float]]:
+        if slug not in self._rows:
+            self.prefetch([slug])
+        return self._rows[slug]
+
+    def fails(self, slug: str) -> int:
+        """Current streak of consecutive 404/410 responses for *slug*."""
+        return self._row(slug)[0]
+
+    def is_fresh(self, slug: str, ttl_hrs: float) -> bool:
+        """Return True if *slug* answered 200 within the last *ttl_hrs* hours."""
+        last_ok = self._row(slug)[1]
+        return last_ok is not None and time.time() - last_ok < ttl_hrs * 3600
+
+    def slugs(self, *, include_dead: bool = False) -> List[str]:
+        """Return every stored slug (by default without those at the fail threshold)."""
+        sql = "SELECT slug FROM slugs WHERE source = ?"
+        if not include_dead:
+            sql += f" AND fails < {FAIL_THRESHOLD}"
+        return [row[0] for row in self._conn.execute(sql + " ORDER BY slug", (self.source,))]
+
+    def stats(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Return the stored row of *slug* as a dict (pending changes not included)."""
+        cur = self._conn.execute("SELECT * FROM slugs WHERE source = ? AND slug = ?", (self.source, slug))
+        row = cur.fetchone()
+        return dict(zip((d[0] for d in cur.description), row)) if row else None
+
+    # ------------------------------------------------------------------
+    # Writes (buffered until save)
+    # ------------------------------------------------------------------
+
+    def add(self, slugs: Iterable[str]) -> None:
+        """Register newly discovered *slugs*; known ones are left untouched."""
+        self._new.extend(slugs)
+
+    def record_ok(
+        self, slug: str, *, latency: Optional[float] = None, postings_per_day: Optional[float] = None
+    ) -> None:
+        """Record a 200 for *slug*, with its latency (seconds) and posting rate if known."""
+        now = time.time()
+        self._rows[slug] = (0, now)
+        self._gone.pop(slug, None)
+        self._ok[slug] = (now, None if latency is None else latency * 1000, postings_per_day)
+
+    def record_gone(self, slug: str) -> bool:
+        """Count a 404/410 for *slug*; return False once its streak hits the threshold.
+
+        The slug stays in the registry, so a later 200 revives it, while each
+        further failure keeps it excluded.
+        """
+        fails = self._row(slug)[0] + 1
+        self._rows[slug] = (fails, None)
+        self._ok.pop(slug, None)
+        self._gone[slug] = self._gone.get(slug, 0) + 1
+        return fails < FAIL_THRESHOLD
+
+    def save(self) -> None:
+        """Apply buffered changes in one transaction."""
+        if not (self._ok or self._gone or self._new):
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(_INSERT_NEW, [(self.source, s, now) for s in self._new])
+            self._conn.executemany(
+                _UPSERT_OK,
+                [(self.source, s, ts, ts, lat, rate, now) for s, (ts, lat, rate) in self._ok.items()],
+            )
+            self._conn.executemany(
+                _UPSERT_GONE, [(self.source, s, n, now, now) for s, n in self._gone.items()]
+            )
+        self._ok.clear()
+        self._gone.clear()
+        self._new.clear()
+
+
+async def validate_slugs(
+    slugs: List[str],
+    *,
+    registry: SlugRegistry,
+    url_for: Callable[[str], str],
+    params: Mapping[str, Any],
+    label: str,
+    transport: Transport | None = None,
+    ttl_hrs: float = DEFAULT_TTL_HRS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[str]:
+    """Return the subset of *slugs* worth fetching, probing stale ones concurrently.
+
+    Transient errors (5xx, timeouts) keep the slug; only 404/410 count towards
+    the drop threshold.  Input order is preserved.
+    """
+    registry.prefetch(slugs)
+    keep: Dict[str, bool] = {}
+    to_probe: List[str] = []
+    for slug in slugs:
+        if registry.is_fresh(slug, ttl_hrs):
+            keep[slug] = True
+        else:
+            to_probe.append(slug)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _probe(client: Transport, slug: str) -> None:
+        async with sem:
+            start = time.perf_counter()
+            try:
+                resp = await client.get(url_for(slug), params=params, timeout=10)
+                resp.raise_for_status()
+            except HTTPStatusError as exc:
+                if exc.response.status_code in GONE_STATUSES:
+                    keep[slug] = registry.record_gone(slug)
+                else:
+                    keep[slug] = True
+            except Exception:
+                keep[slug] = True
+            else:
+                registry.record_ok(slug, latency=time.perf_counter() - start)
+                keep[slug] = True
+
+    if to_probe:
+        async with ensure_transport(transport) as client:
+            await asyncio.gather(*(_probe(client, s) for s in to_probe))
+    registry.save()
+
+    valid = [s for s in slugs if keep.get(s)]
+    logger.info(
+        "collector_status.%s %s/%s (probed %s)", label, len(valid), len(slugs), len(to_probe)
+    )
+    return valid
+
+
+async def classify_iter(
+    registry: SlugRegistry,
+    slug: str,
+    items: AsyncIterator[T],
+    *,
+    window_hrs: Optional[float] = None,
+) -> AsyncIterator[T]:
+    """Re-yield *items* and record the fetch outcome for *slug* in *registry*.
+
+    A 404/410 counts towards the slug's fail streak (so the real fetch can
+    stand in for a probe); a complete fetch records its duration and, given
+    the look-back *window_hrs*, the slug's postings per day.  Exceptions
+    propagate unchanged so the caller's failure handling still applies.
+    """
+    start = time.perf_counter()
+    n = 0
+    try:
+        async for item in items:
+            n += 1
+            yield item
+    except HTTPStatusError as exc:
+        if exc.response.status_code in GONE_STATUSES:
+            registry.record_gone(slug)
+        raise
+    rate = n * 24 / window_hrs if window_hrs else None
+    registry.record_ok(slug, latency=time.perf_counter() - start, postings_per_day=rate)
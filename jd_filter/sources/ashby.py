@@ -3,82 +3,66 @@
 from __future__ import annotations
 
 import datetime as _dt
-from typing import List
-import json
+from typing import AsyncIterator, List, Optional
 from pathlib import Path
-from httpx import HTTPStatusError
 
-import httpx
-
-from ..models import JobPost
+from ..models import JobPost, JobRecord
+from ..transport import Transport, ensure_transport
+from ..utils import utc_cutoff
+from ._jsonstream import fetch_array
+from ._slugs import DEFAULT_CONCURRENCY, DEFAULT_TTL_HRS, SlugRegistry, registry_path, validate_slugs
 
 BASE_URL = "https://api.ashbyhq.com/posting-api/job-board/{board}"
 
-# Path to persistent board registry
+# Legacy JSON registry (stored alongside this module); imported into the
+# SQLite registry on first use and no longer written.
 _BOARDS_FILE: Path = Path(__file__).with_name("ashby_boards.json")
 
 
-def _load_registry() -> dict[str, int]:
-    if _BOARDS_FILE.exists():
-        try:
-            return json.loads(_BOARDS_FILE.read_text())  # type: ignore
-        except Exception:
-            pass
-    return {}
-
+def load_registry() -> SlugRegistry:
+    """Return the persistent Ashby board registry (close it when done)."""
+    return SlugRegistry(registry_path(), "ashby", legacy_json=_BOARDS_FILE)
 
-def _save_registry(reg: dict[str, int]) -> None:
-    _BOARDS_FILE.write_text(json.dumps(reg, indent=2))
 
-
-async def validate_ashby_boards(boards: list[str]) -> list[str]:
+async def validate_ashby_boards(
+    boards: list[str],
+    *,
+    transport: Transport | None = None,
+    ttl_hrs: float = DEFAULT_TTL_HRS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[str]:
     """Return boards that respond 200; increment fail counters on 404/410.
 
-    After 3 consecutive failures a board is skipped until rediscovered.
+    Boards seen alive within *ttl_hrs* skip the probe; the others are probed
+    concurrently.  After 3 consecutive failures a board is skipped until it
+    answers 200 again.
     """
-    reg = _load_registry()
-    valid: list[str] = []
-
-    async with httpx.AsyncClient(timeout=10) as client:
-        for board in boards:
-            try:
-                resp = await client.get(
-                    BASE_URL.format(board=board),
-                    params={"limit": 1},
-                )
-                resp.raise_for_status()
-                reg.pop(board, None)
-                valid.append(board)
-            except HTTPStatusError as exc:
-                if exc.response.status_code in (404, 410):
-                    reg[board] = reg.get(board, 0) + 1
-                    if reg[board] < 3:
-                        valid.append(board)
-                else:
-                    valid.append(board)
-
-    dropped = [b for b, fails in reg.items() if fails >= 3]
-    for b in dropped:
-        reg.pop(b, None)
-
-    _save_registry(reg)
-
-    # metric
-    try:
-        import logging
-
-        logging.getLogger(__name__).info(
-            "collector_status.ashby %s/%s", len(valid), len(boards)
+    with load_registry() as registry:
+        return await validate_slugs(
+            boards,
+            registry=registry,
+            url_for=lambda board: BASE_URL.format(board=board),
+            params={"limit": 1},
+            label="ashby",
+            transport=transport,
+            ttl_hrs=ttl_hrs,
+            concurrency=concurrency,
         )
-    except Exception:
-        pass
 
-    return [b for b in valid if b not in dropped]
 
+async def iter_ashby(
+    board: str,
+    *,
+    since_hrs: int = 24,
+    since: Optional[_dt.datetime] = None,
+    transport: Transport | None = None,
+) -> AsyncIterator[JobRecord]:
+    """Yield postings from *board* created in the last *since_hrs* hours (or at/after *since*).
 
-async def fetch_ashby(board: str, *, since_hrs: int = 24) -> List[JobPost]:
-    """Return postings from *board* created in the last *since_hrs* hours using the public feed."""
-    cutoff = _dt.datetime.utcnow() - _dt.timedelta(hours=since_hrs)
+    The posting API has no pagination, so the response body is decoded
+    incrementally and each posting is yielded as soon as it is complete.
+    """
+    cutoff = utc_cutoff(since, since_hrs)
     created_after_iso = cutoff.isoformat(timespec="seconds") + "Z"
 
     params = {
@@ -86,24 +70,32 @@ async def fetch_ashby(board: str, *, since_hrs: int = 24) -> List[JobPost]:
         "created_after": created_after_iso,
     }
 
-    async with httpx.AsyncClient(http2=True, timeout=20) as client:
-        resp = await client.get(BASE_URL.format(board=board), params=params)
-        resp.raise_for_status()
-        data: list[dict] = resp.json()
-
-    jobs: list[JobPost] = []
-    for p in data:
-        posted = p.get("createdAt") or p.get("created_at")
-        jobs.append(
-            JobPost(
+    async with ensure_transport(transport) as client:
+        # The posting API wraps results under "jobs"; older responses were a
+        # bare list.  Either way postings are decoded one at a time.
+        async for p in fetch_array(client, BASE_URL.format(board=board), params=params, key="jobs"):
+            posted = p.get("createdAt") or p.get("created_at")
+            created_at = _dt.datetime.fromisoformat(posted.rstrip("Z")) if posted else None
+            if created_at is not None and created_at.tzinfo is not None:
+                created_at = created_at.astimezone(_dt.timezone.utc).replace(tzinfo=None)
+            # The filter is sent with second precision and not every board
+            # honours it, so the exact cutoff is applied here.
+            if created_at is not None and created_at < cutoff:
+                continue
+            yield JobRecord(
                 id=str(p.get("id")),
                 title=p.get("title", ""),
                 company=p.get("companyName") or board,
                 location=p.get("jobLocation", {}).get("location") if isinstance(p.get("jobLocation"), dict) else p.get("location"),
                 url=p.get("url"),
                 description=p.get("descriptionPlain") or p.get("description"),
-                created_at=_dt.datetime.fromisoformat(posted.rstrip("Z")) if posted else None,
+                created_at=created_at,
                 source="ashby",
             )
-        )
-    return jobs 
\ No newline at end of file
+
+
+async def fetch_ashby(
+    board: str, *, since_hrs: int = 24, since: Optional[_dt.datetime] = None, transport: Transport | None = None
+) -> List[JobPost]:
+    """Collect :func:`iter_ashby` into a list of validated :class:`JobPost`."""
+    return [rec.to_post() async for rec in iter_ashby(board, since_hrs=since_hrs, since=since, transport=transport)]
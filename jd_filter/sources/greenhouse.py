@@ -3,43 +3,57 @@
 from __future__ import annotations
 
 import datetime as _dt
-from typing import List
+from typing import AsyncIterator, List, Optional
 
-import httpx
-
-from ..models import JobPost
+from ..models import JobPost, JobRecord
+from ..transport import Transport, ensure_transport
+from ..utils import utc_cutoff
+from ._jsonstream import fetch_array
 
 BASE_URL = "https://boards-api.greenhouse.io/v1/boards/{org}/jobs"
 
-async def fetch_greenhouse(org: str, *, since_hrs: int = 24) -> List[JobPost]:
-    """Return all postings for *org* created in the last *since_hrs* hours."""
-    cutoff = _dt.datetime.utcnow() - _dt.timedelta(hours=since_hrs)
+async def iter_greenhouse(
+    org: str,
+    *,
+    since_hrs: int = 24,
+    since: Optional[_dt.datetime] = None,
+    transport: Transport | None = None,
+) -> AsyncIterator[JobRecord]:
+    """Yield all postings for *org* created in the last *since_hrs* hours (or at/after *since*).
+
+    The API only filters by date, so up to a day of older postings comes
+    back; those are dropped here against the exact cutoff.
+    """
+    cutoff = utc_cutoff(since, since_hrs)
     created_after = cutoff.strftime("%Y-%m-%d")
 
     params = {
         "created_after": created_after,
     }
 
-    async with httpx.AsyncClient(http2=True, timeout=20) as client:
-        resp = await client.get(BASE_URL.format(org=org), params=params)
-        resp.raise_for_status()
-        data = resp.json()
-
-    # the API wraps results under "jobs"
-    postings: list[dict] = data.get("jobs", []) if isinstance(data, dict) else data  # fallback
-
-    jobs: list[JobPost] = []
-    for p in postings:
-        jobs.append(
-            JobPost(
+    async with ensure_transport(transport) as client:
+        # the API wraps results under "jobs"; decoded one posting at a time
+        async for p in fetch_array(client, BASE_URL.format(org=org), params=params, key="jobs"):
+            posted = p.get("created_at")
+            created_at = _dt.datetime.strptime(posted, "%Y-%m-%dT%H:%M:%S%z").astimezone(_dt.timezone.utc).replace(tzinfo=None) if posted else None
+            if created_at is not None and created_at < cutoff:
+                continue
+            yield JobRecord(
                 id=str(p.get("id")),
                 title=p.get("title", ""),
                 company=org,
                 location=(p.get("location", {}) or {}).get("name") if isinstance(p.get("location"), dict) else p.get("location"),
                 url=p.get("absolute_url"),
                 description=p.get("content"),
-                created_at=_dt.datetime.strptime(p.get("created_at"), "%Y-%m-%dT%H:%M:%S%z").astimezone(_dt.timezone.utc).replace(tzinfo=None) if p.get("created_at") else None,
+                created_at=created_at,
                 source="greenhouse",
             )
-        )
-    return jobs 
\ No newline at end of file
+
+
+async def fetch_greenhouse(
+    org: str, *, since_hrs: int = 24, since: Optional[_dt.datetime] = None, transport: Transport | None = None
+) -> List[JobPost]:
+    """Collect :func:`iter_greenhouse` into a list of validated :class:`JobPost`."""
+    return [
+        rec.to_post() async for rec in iter_greenhouse(org, since_hrs=since_hrs, since=since, transport=transport)
+    ]
@@ -3,113 +3,108 @@
 from __future__ import annotations
 
 import datetime as _dt
-from typing import List
-import json
+from typing import AsyncIterator, List, Optional
 from pathlib import Path
-from httpx import HTTPStatusError
 
-import httpx
-
-from ..models import JobPost
+from ..models import JobPost, JobRecord
+from ..transport import Transport, ensure_transport
+from ..utils import utc_cutoff, utc_epoch
+from ._jsonstream import fetch_array
+from ._slugs import DEFAULT_CONCURRENCY, DEFAULT_TTL_HRS, SlugRegistry, registry_path, validate_slugs
 
 BASE_URL = "https://api.lever.co/v0/postings/{org}"
 
-# Path to slug cache (stored alongside this module)
-_CACHE_FILE: Path = Path(__file__).with_name("lever_slugs.json")
-
+# Postings requested per page (the API's ``limit``); bounds each response body.
+PAGE_SIZE = 100
 
-def _load_cache() -> dict[str, int]:
-    if _CACHE_FILE.exists():
-        try:
-            return json.loads(_CACHE_FILE.read_text())  # type: ignore
-        except Exception:
-            pass
-    return {}
+# Legacy JSON registry (stored alongside this module); imported into the
+# SQLite registry on first use and no longer written.
+_CACHE_FILE: Path = Path(__file__).with_name("lever_slugs.json")
 
 
-def _save_cache(cache: dict[str, int]) -> None:
-    _CACHE_FILE.write_text(json.dumps(cache, indent=2))
+def load_registry() -> SlugRegistry:
+    """Return the persistent Lever slug registry (close it when done)."""
+    return SlugRegistry(registry_path(), "lever", legacy_json=_CACHE_FILE)
 
 
-async def validate_lever_slugs(slugs: list[str]) -> list[str]:
+async def validate_lever_slugs(
+    slugs: list[str],
+    *,
+    transport: Transport | None = None,
+    ttl_hrs: float = DEFAULT_TTL_HRS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[str]:
     """Return *slugs* that are valid (no repeated 404/410). Persistent cache controls dropping.
 
-    When a slug triggers a 404/410, its fail counter increments; after 3 consecutive
-    failures it is removed from the returned list and persisted.
+    Slugs that answered 200 within *ttl_hrs* are trusted without a request; the
+    rest are probed concurrently (at most *concurrency* at a time).  When a slug
+    triggers a 404/410, its fail streak increments; after 3 consecutive
+    failures it is left out of the returned list until it answers 200 again.
     """
-    cache = _load_cache()
-    valid: list[str] = []
-
-    async with httpx.AsyncClient(timeout=10) as client:
-        for slug in slugs:
-            try:
-                resp = await client.get(
-                    BASE_URL.format(org=slug), params={"limit": 1, "mode": "json"}
-                )
-                resp.raise_for_status()
-                # Success -> reset failures
-                cache.pop(slug, None)
-                valid.append(slug)
-            except HTTPStatusError as exc:
-                if exc.response.status_code in (404, 410):
-                    cache[slug] = cache.get(slug, 0) + 1
-                    if cache[slug] < 3:
-                        # keep trying until we hit the threshold
-                        valid.append(slug)
-                else:
-                    valid.append(slug)  # keep slug for transient errors
-
-    # Drop slugs that have reached threshold
-    dropped = [s for s, fails in cache.items() if fails >= 3]
-    for d in dropped:
-        cache.pop(d, None)
-
-    _save_cache(cache)
-
-    # Emit simple metric via stdout
-    try:
-        import logging
-
-        logging.getLogger(__name__).info(
-            "collector_status.lever %s/%s", len(valid), len(slugs)
+    with load_registry() as registry:
+        return await validate_slugs(
+            slugs,
+            registry=registry,
+            url_for=lambda slug: BASE_URL.format(org=slug),
+            params={"limit": 1, "mode": "json"},
+            label="lever",
+            transport=transport,
+            ttl_hrs=ttl_hrs,
+            concurrency=concurrency,
         )
-    except Exception:
-        pass
 
-    # Filter out dropped slugs
-    return [s for s in valid if s not in dropped]
 
-
-async def fetch_lever(org: str, *, since_hrs: int = 24) -> List[JobPost]:
-    """Return all postings for *org* created in the last *since_hrs* hours.
+async def iter_lever(
+    org: str,
+    *,
+    since_hrs: int = 24,
+    since: Optional[_dt.datetime] = None,
+    transport: Transport | None = None,
+    page_size: int = PAGE_SIZE,
+) -> AsyncIterator[JobRecord]:
+    """Yield all postings for *org* created in the last *since_hrs* hours (or at/after *since*).
 
     Lever API accepts a `createdAt` query parameter in milliseconds epoch.
+    The board is fetched *page_size* postings at a time via ``skip``/``limit``
+    and each page is decoded incrementally, so postings are yielded as they
+    arrive and memory does not grow with the size of the board.
     """
-    cutoff = _dt.datetime.utcnow() - _dt.timedelta(hours=since_hrs)
-    created_ms = int(cutoff.timestamp() * 1000)
+    cutoff = utc_cutoff(since, since_hrs)
+    created_ms = int(utc_epoch(cutoff) * 1000)
 
     params = {
         "mode": "json",
         "createdAt": created_ms,
+        "limit": page_size,
     }
 
-    async with httpx.AsyncClient(http2=True, timeout=20) as client:
-        resp = await client.get(BASE_URL.format(org=org), params=params)
-        resp.raise_for_status()
-        data: list[dict] = resp.json()
-
-    jobs: list[JobPost] = []
-    for p in data:
-        jobs.append(
-            JobPost(
-                id=p["id"],
-                title=p.get("text", ""),
-                company=org,
-                location=p.get("categories", {}).get("location"),
-                url=p["hostedUrl"],
-                description=p.get("description"),
-                created_at=_dt.datetime.utcfromtimestamp(p.get("createdAt", 0) / 1000),
-                source="lever",
-            )
-        )
-    return jobs 
\ No newline at end of file
+    async with ensure_transport(transport) as client:
+        skip = 0
+        while True:
+            n = 0
+            async for p in fetch_array(client, BASE_URL.format(org=org), params={**params, "skip": skip}):
+                n += 1
+                created_at = _dt.datetime.utcfromtimestamp(p.get("createdAt", 0) / 1000)
+                if "createdAt" in p and created_at < cutoff:
+                    continue
+                yield JobRecord(
+                    id=p["id"],
+                    title=p.get("text", ""),
+                    company=org,
+                    location=p.get("categories", {}).get("location"),
+                    url=p["hostedUrl"],
+                    description=p.get("description"),
+                    created_at=created_at,
+                    source="lever",
+                )
+            # A short page is the last one.
+            if n < page_size:
+                break
+            skip += n
+
+
+async def fetch_lever(
+    org: str, *, since_hrs: int = 24, since: Optional[_dt.datetime] = None, transport: Transport | None = None
+) -> List[JobPost]:
+    """Collect :func:`iter_lever` into a list of validated :class:`JobPost`."""
+    return [rec.to_post() async for rec in iter_lever(org, since_hrs=since_hrs, since=since, transport=transport)]
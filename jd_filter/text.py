@@ -0,0 +1,286 @@
+"""HTML-to-text normalization of posting descriptions, cached by content hash.
+
+Greenhouse ``content`` is HTML that is itself HTML-escaped, Lever
+``description`` is plain HTML, and Ashby sends either.  Run through the
+filters as-is, tags, entities and inline styles bloat the text being scanned
+and produce spurious matches (``style="..."``, ``&amp;``).  This stage turns
+every description into plain text once, right after it is decoded:
+
+    normalizer = TextNormalizer("text_cache.sqlite3", workers=4)
+    async for job in normalizer.apply(iter_lever("openai")):
+        ...  # job.description is plain text
+    normalizer.close()
+
+Conversions are cached under a hash of the raw description, in memory (LRU)
+and optionally in a SQLite file, since the same posting text recurs every
+run.  Cache misses can be converted in a thread or process pool so the
+parsing overlaps fetching instead of blocking the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import html
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from .models import JobRecord
+
+# Elements that start a new line of text.
+_BLOCK_TAGS = frozenset(
+    "address article aside blockquote br dd div dl dt footer h1 h2 h3 h4 h5 h6 "
+    "header hr li main nav ol p pre section table td th tr ul".split()
+)
+# Elements whose content is never text.
+_SKIP_TAGS = frozenset(("script", "style", "head", "title", "noscript", "template"))
+_SPACES = re.compile(r"[ \t\r\f\v\xa0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    hash      BLOB PRIMARY KEY,
+    text      TEXT NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag: str, attrs: Any) -> None:
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self.parts.append(data)
+
+
+def _tidy(text: str) -> str:
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def html_to_text(raw: str) -> str:
+    """Return the visible text of the HTML fragment *raw*.
+
+    Entity-escaped HTML (``&lt;p&gt;...``, as Greenhouse sends it) is
+    unescaped first.  Block elements become line breaks, ``script``/``style``
+    content is dropped and runs of whitespace collapse to one space.  Text
+    without markup or entities only has its whitespace tidied.
+    """
+    if "<" not in raw:
+        if "&" not in raw:
+            return _tidy(raw)
+        raw = html.unescape(raw)
+        if "<" not in raw:
+            return _tidy(raw)
+    parser = _TextExtractor()
+    parser.feed(raw)
+    parser.close()
+    return _tidy("".join(parser.parts))
+
+
+@dataclass
+class NormalizeStats:
+    """Counters for one :class:`TextNormalizer`."""
+
+    hits: int = 0
+    misses: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    # Wall seconds spent converting cache misses (in the pool, if any).
+    secs: float = 0.0
+
+
+class TextNormalizer:
+    """Convert descriptions to plain text, memoized by content hash.
+
+    Parameters
+    ----------
+    cache_path
+        Optional SQLite file persisting conversions between runs; entries
+        unused for ``max_age_days`` are dropped by :meth:`expire`.
+    max_entries
+        Size of the in-memory LRU in front of the file.
+    workers
+        Convert cache misses in a pool of this many workers (0 converts
+        inline on the event loop).
+    processes
+        Use a process pool instead of threads; worth it for large boards of
+        long descriptions, since the parser holds the GIL.
+    """
+
+    def __init__(
+        self,
+        cache_path: str | Path | None = None,
+        *,
+        max_entries: int = 50_000,
+        workers: int = 0,
+        processes: bool = False,
+        flush_every: int = 500,
+    ) -> None:
+        self.stats = NormalizeStats()
+        self._max_entries = max_entries
+        self._lru: "OrderedDict[bytes, str]" = OrderedDict()
+        self._flush_every = flush_every
+        self._pending: List[Tuple[bytes, str, float]] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        if cache_path is not None:
+            path = Path(cache_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+        self._executor: Optional[Executor] = None
+        if workers > 0:
+            pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            self._executor = pool(max_workers=workers)
+
+    def __enter__(self) -> "TextNormalizer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Flush pending cache entries and shut the pool down."""
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(raw: str) -> bytes:
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    def _lookup(self, key: bytes) -> Optional[str]:
+        text = self._lru.get(key)
+        if text is not None:
+            self._lru.move_to_end(key)
+            return text
+        if self._conn is None:
+            return None
+        row = self._conn.execute("SELECT text FROM texts WHERE hash = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        # Refresh last_used so entries still in use do not expire.
+        self._pending.append((key, row[0], time.time()))
+        self._remember(key, row[0])
+        return row[0]
+
+    def _remember(self, key: bytes, text: str) -> None:
+        self._lru[key] = text
+        if len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
+        if len(self._pending) >= self._flush_every:
+            self.flush()
+
+    def _store(self, key: bytes, text: str) -> None:
+        if self._conn is not None:
+            self._pending.append((key, text, time.time()))
+        self._remember(key, text)
+
+    def flush(self) -> None:
+        """Write buffered conversions to the cache file in one transaction."""
+        if self._conn is None or not self._pending:
+            self._pending.clear()
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO texts (hash, text, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT (hash) DO UPDATE SET last_used = excluded.last_used",
+                self._pending,
+            )
+        self._pending.clear()
+
+    def expire(self, max_age_days: float) -> int:
+        """Delete file entries unused for *max_age_days*; return the number removed."""
+        if self._conn is None:
+            return 0
+        self.flush()
+        cutoff = time.time() - max_age_days * 86400
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM texts WHERE last_used < ?", (cutoff,))
+        return cur.rowcount
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    def _hit(self, raw: str) -> Tuple[bytes, Optional[str]]:
+        key = self._key(raw)
+        text = self._lookup(key)
+        self.stats.bytes_in += len(raw)
+        if text is not None:
+            self.stats.hits += 1
+            self.stats.bytes_out += len(text)
+        return key, text
+
+    def _miss(self, key: bytes, text: str, secs: float) -> str:
+        self.stats.misses += 1
+        self.stats.bytes_out += len(text)
+        self.stats.secs += secs
+        self._store(key, text)
+        return text
+
+    def normalize(self, raw: Optional[str]) -> Optional[str]:
+        """Return the plain text of *raw*, converting inline on a cache miss."""
+        if not raw:
+            return raw
+        key, text = self._hit(raw)
+        if text is not None:
+            return text
+        start = time.perf_counter()
+        return self._miss(key, html_to_text(raw), time.perf_counter() - start)
+
+    async def anormalize(self, raw: Optional[str]) -> Optional[str]:
+        """Like :meth:`normalize`, but convert cache misses in the pool (if any)."""
+        if not raw or self._executor is None:
+            return self.normalize(raw)
+        key, text = self._hit(raw)
+        if text is not None:
+            return text
+        start = time.perf_counter()
+        text = await asyncio.get_running_loop().run_in_executor(self._executor, html_to_text, raw)
+        return self._miss(key, text, time.perf_counter() - start)
+
+    async def apply(self, items: AsyncIterator[JobRecord]) -> AsyncIterator[JobRecord]:
+        """Re-yield *items* with descriptions (and titles) converted to plain text."""
+        async for job in items:
+            job.description = await self.anormalize(job.description)
+            if job.title and ("&" in job.title or "<" in job.title):
+                job.title = html_to_text(job.title)
+            yield job
@@ -2,25 +2,35 @@
 
 from __future__ import annotations
 
+import datetime as _dt
 import hashlib
 import os
-from typing import Iterable, List, Sequence, TypeVar
+from typing import Iterable, List, Optional, Sequence, TypeVar
 
-from .models import JobPost
+from .models import Job, JobPost
 
 T = TypeVar("T")
 
 
+class UrlDeduper:
+    """Incremental URL-hash deduper for postings that arrive one at a time."""
+
+    def __init__(self) -> None:
+        self._seen: set[bytes] = set()
+
+    def add(self, job: Job) -> bool:
+        """Return True the first time *job*'s URL is seen, False afterwards."""
+        sig = hashlib.sha1(str(job.url).encode()).digest()
+        if sig in self._seen:
+            return False
+        self._seen.add(sig)
+        return True
+
+
 def dedupe(jobs: Sequence[JobPost]) -> List[JobPost]:
     """Return *jobs* stripped of duplicates based on URL hash."""
-    seen: set[str] = set()
-    unique: list[JobPost] = []
-    for j in jobs:
-        sig = hashlib.sha1(str(j.url).encode()).hexdigest()
-        if sig not in seen:
-            seen.add(sig)
-            unique.append(j)
-    return unique
+    deduper = UrlDeduper()
+    return [j for j in jobs if deduper.add(j)]
 
 
 def chunk(seq: Sequence[T], size: int) -> Iterable[Sequence[T]]:  # pragma: no cover
@@ -29,6 +39,20 @@ def chunk(seq: Sequence[T], size: int) -> Iterable[Sequence[T]]:  # pragma: no c
         yield seq[i : i + size]
 
 
+def utc_cutoff(since: Optional[_dt.datetime], since_hrs: float) -> _dt.datetime:
+    """Return the naive-UTC fetch cutoff: *since* if given, else *since_hrs* ago."""
+    if since is None:
+        return _dt.datetime.utcnow() - _dt.timedelta(hours=since_hrs)
+    if since.tzinfo is not None:
+        since = since.astimezone(_dt.timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def utc_epoch(ts: _dt.datetime) -> float:
+    """Return Unix seconds of the naive-UTC datetime *ts*."""
+    return ts.replace(tzinfo=_dt.timezone.utc).timestamp()
+
+
 def get_env(key: str, default: str | None = None) -> str:
     """Return env var *key* or *default*, raising if missing & no default supplied."""
     val = os.getenv(key, default)
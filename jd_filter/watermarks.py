@@ -0,0 +1,141 @@
+"""Per-board high-water marks for exact incremental fetching.
+
+A watermark is the newest ``created_at`` among the postings of one
+``(source, org)`` that a run fetched *and* persisted.  The next run asks the
+ATS for postings from that instant on (instead of a fixed ``since_hrs``
+window), so a skipped cron run loses nothing and a frequent one transfers
+little:
+
+    with WatermarkStore("watermarks.sqlite3") as marks:
+        since = marks.get("greenhouse", "deepmind")      # None on first run
+        items = marks.track("greenhouse", "deepmind", iter_greenhouse("deepmind", since=since))
+        ...consume items, write them to the sinks...
+        marks.commit()                                   # only after sinks succeeded
+
+Marks observed through :meth:`WatermarkStore.track` stay pending until
+:meth:`~WatermarkStore.commit`, which writes those of boards whose fetch ran to
+completion in one transaction; a failed fetch or a crash before the sinks
+commit leaves the stored marks untouched.  Marks only move forward.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from .models import JobRecord
+
+Key = Tuple[str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    source     TEXT NOT NULL,
+    org        TEXT NOT NULL,
+    -- Unix seconds of the newest created_at persisted for the board.
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, org)
+) WITHOUT ROWID
+"""
+
+
+def _to_epoch(ts: _dt.datetime) -> float:
+    # Connectors produce naive UTC datetimes.
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=_dt.timezone.utc)
+    return ts.timestamp()
+
+
+def _from_epoch(secs: float) -> _dt.datetime:
+    return _dt.datetime.fromtimestamp(secs, _dt.timezone.utc).replace(tzinfo=None)
+
+
+class WatermarkStore:
+    """SQLite-backed ``(source, org) -> newest created_at`` table with staged updates."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Sharded workers share the file, each committing its own boards.
+        self._conn = sqlite3.connect(self.path, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._marks: Dict[Key, float] = {
+            (source, org): ts for source, org, ts in self._conn.execute("SELECT source, org, created_at FROM watermarks")
+        }
+        # Newest created_at seen this run, and boards whose fetch completed.
+        self._pending: Dict[Key, float] = {}
+        self._complete: Set[Key] = set()
+
+    def __enter__(self) -> "WatermarkStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close without committing; uncommitted marks are dropped."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return len(self._marks)
+
+    def get(self, source: str, org: str) -> Optional[_dt.datetime]:
+        """Return the committed mark of a board as naive UTC, or None if it has none."""
+        ts = self._marks.get((source, org))
+        return None if ts is None else _from_epoch(ts)
+
+    def observe(self, source: str, org: str, created_at: Optional[_dt.datetime]) -> None:
+        """Stage *created_at* as a candidate mark for the board."""
+        if created_at is None:
+            return
+        key = (source, org)
+        ts = _to_epoch(created_at)
+        if ts > self._pending.get(key, float("-inf")):
+            self._pending[key] = ts
+
+    def complete(self, source: str, org: str) -> None:
+        """Mark the board's fetch as finished, so :meth:`commit` may advance it."""
+        self._complete.add((source, org))
+
+    async def track(self, source: str, org: str, items: AsyncIterator[JobRecord]) -> AsyncIterator[JobRecord]:
+        """Re-yield *items*, staging their ``created_at`` and completing the board at the end.
+
+        If *items* raises (or the consumer stops early), the board is not
+        completed and its mark does not move.
+        """
+        async for job in items:
+            self.observe(source, org, job.created_at)
+            yield job
+        self.complete(source, org)
+
+    def commit(self) -> int:
+        """Persist staged marks of completed boards in one transaction; return how many moved."""
+        rows = [
+            (source, org, ts)
+            for (source, org), ts in self._pending.items()
+            if (source, org) in self._complete and ts > self._marks.get((source, org), float("-inf"))
+        ]
+        if rows:
+            now = time.time()
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO watermarks (source, org, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (source, org) DO UPDATE SET "
+                    "created_at = max(watermarks.created_at, excluded.created_at), updated_at = excluded.updated_at",
+                    [(source, org, ts, now) for source, org, ts in rows],
+                )
+            for source, org, ts in rows:
+                self._marks[(source, org)] = ts
+        self.rollback()
+        return len(rows)
+
+    def rollback(self) -> None:
+        """Drop staged marks, e.g. after a failed sink write."""
+        self._pending.clear()
+        self._complete.clear()
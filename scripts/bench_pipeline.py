@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+"""End-to-end pipeline benchmark against a local mock ATS server (offline).
+
+Example:
+    python scripts/bench_pipeline.py --orgs 1000
+    python scripts/bench_pipeline.py --orgs 50000 --latency-ms 80 --rate-429 0.01 --desc-bytes 20000
+    python scripts/bench_pipeline.py --orgs 5000 --json bench.json --baseline last.json
+
+Starts ``mock_ats.py`` in a child process, splits ``--orgs`` evenly across
+Lever, Greenhouse and Ashby, and runs :func:`jd_filter.pipeline.run` end to end
+through a transport whose hosts are redirected to the mock (or, with
+``--workers N``, :func:`jd_filter.shard.run_sharded` over N processes; add
+``--server-procs`` so the mock itself is not the bottleneck).  Slug registries,
+sinks and the seen index all live in a temporary directory, so the checked-in
+registries are never touched.
+
+Reports wall time, jobs/sec, peak RSS of the pipeline process, per-stage
+seconds, rejection reasons, the slowest boards and per-host transport
+counters.  With ``--baseline`` the run fails
+(exit 1) when jobs/sec drops more than ``--tolerance`` below a previous
+``--json`` report.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mock_ats import MockConfig, run_in_process  # noqa: E402
+
+from jd_filter import pipeline  # noqa: E402
+from jd_filter.metrics import MetricsRegistry  # noqa: E402
+from jd_filter.ratelimit import RetryBudget  # noqa: E402
+from jd_filter.shard import run_sharded  # noqa: E402
+from jd_filter.transport import HostLimits, Transport  # noqa: E402
+
+HOSTS = ("api.lever.co", "boards-api.greenhouse.io", "api.ashbyhq.com")
+
+
+def make_orgs(n: int) -> dict[str, list[str]]:
+    sources = ("lever", "greenhouse", "ashby")
+    orgs: dict[str, list[str]] = {s: [] for s in sources}
+    for i in range(n):
+        orgs[sources[i % 3]].append(f"org{i:06d}")
+    return orgs
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def peak_child_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _limits(args: argparse.Namespace) -> HostLimits:
+    return HostLimits(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+        max_concurrency=args.max_concurrency,
+        rate_per_sec=args.rate_per_host or None,
+        burst=max(1, int(args.rate_per_host * 2)),
+    )
+
+
+def bench_sharded(args: argparse.Namespace, port: int, workdir: Path) -> dict:
+    """Run the same workload through ``run_sharded`` with ``--workers`` processes."""
+    sinks = set(args.sinks)
+    start = time.perf_counter()
+    results = run_sharded(
+        make_orgs(args.orgs),
+        args.workers,
+        host_map={h: f"http://127.0.0.1:{port}" for h in HOSTS},
+        csv_path=workdir / "out.csv" if "csv" in sinks else None,
+        parquet_dir=workdir / "parquet" if "parquet" in sinks else None,
+        seen_path=workdir / "seen.sqlite3" if args.seen else None,
+        default_limits=_limits(args),
+        retry_budget=RetryBudget(max_retries=10 * args.orgs, max_sleep_secs=float("inf")),
+        probe=args.probe,
+        batch_size=args.batch_size,
+    )
+    wall = time.perf_counter() - start
+    fetched = sum(r["fetched"] for r in results)
+    stage_secs: dict = {}
+    rejected: dict = {}
+    for r in results:
+        for k, v in r["stage_secs"].items():
+            stage_secs[k] = stage_secs.get(k, 0.0) + v
+        for k, v in r["rejected"].items():
+            rejected[k] = rejected.get(k, 0) + v
+    return {
+        "orgs": args.orgs,
+        "workers": args.workers,
+        "wall_secs": round(wall, 3),
+        "fetched": fetched,
+        "kept": sum(r["filtered"] for r in results),
+        "jobs_per_sec": round(fetched / wall, 1) if wall else 0.0,
+        "peak_rss_mb": round(max(peak_rss_mb(), peak_child_rss_mb()), 1),
+        # Summed over workers, so these exceed wall time.
+        "stage_secs": {k: round(v, 3) for k, v in stage_secs.items()},
+        "rejected": rejected,
+    }
+
+
+async def bench(args: argparse.Namespace, port: int, workdir: Path) -> dict:
+    limits = _limits(args)
+    stats = pipeline.PipelineStats()
+    metrics = MetricsRegistry()
+    orgs = make_orgs(args.orgs)
+    sinks = set(args.sinks)
+
+    start = time.perf_counter()
+    async with Transport(
+        default_limits=limits,
+        budget=RetryBudget(max_retries=10 * args.orgs, max_sleep_secs=float("inf")),
+        host_map={h: f"http://127.0.0.1:{port}" for h in HOSTS},
+        metrics=metrics,
+    ) as transport:
+        await pipeline.run(
+            orgs,
+            csv_path=workdir / "out.csv" if "csv" in sinks else None,
+            db_uri=f"sqlite:///{workdir / 'jobs.sqlite3'}" if "sqlite" in sinks else None,
+            parquet_dir=workdir / "parquet" if "parquet" in sinks else None,
+            seen_path=workdir / "seen.sqlite3" if args.seen else None,
+            archive_dir=workdir / "archive" if args.archive else None,
+            transport=transport,
+            probe=args.probe,
+            batch_size=args.batch_size,
+            stats=stats,
+            metrics=metrics,
+        )
+        hosts = transport.report()
+    wall = time.perf_counter() - start
+    if args.metrics_prom:
+        metrics.write_prometheus(args.metrics_prom)
+    slowest = sorted(metrics.get("org_fetch_seconds").samples().items(), key=lambda kv: -kv[1])[:5]
+
+    return {
+        "orgs": args.orgs,
+        "wall_secs": round(wall, 3),
+        "fetched": stats.fetched,
+        "kept": stats.filtered,
+        "jobs_per_sec": round(stats.fetched / wall, 1) if wall else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stage_secs": {k: round(v, 3) for k, v in stats.stage_secs.items()},
+        "rejected": stats.rejected,
+        "slowest_boards": {f"{src}/{org}": round(secs, 3) for (src, org), secs in slowest},
+        "response_mb": round(sum(metrics.get("response_bytes_total").samples().values()) / 1e6, 1),
+        "requests": sum(h["requests"] for h in hosts.values()),
+        "retries": sum(h["retries"] for h in hosts.values()),
+        "throttled": sum(h["throttled"] for h in hosts.values()),
+        "connections_opened": sum(h["connections_opened"] for h in hosts.values()),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"orgs={report['orgs']}  fetched={report['fetched']}  kept={report['kept']}  "
+        f"wall={report['wall_secs']:.2f}s  {report['jobs_per_sec']:.0f} jobs/s  "
+        f"peak_rss={report['peak_rss_mb']:.0f} MB"
+    )
+    if "requests" in report:
+        print(
+            f"requests={report['requests']}  retries={report['retries']}  "
+            f"429s={report['throttled']}  connections={report['connections_opened']}  "
+            f"received={report['response_mb']:.1f} MB"
+        )
+    else:
+        print(f"workers={report['workers']} (stage seconds summed over workers)")
+    print(f"rejected: {report['rejected']}")
+    if "slowest_boards" in report:
+        print(f"slowest boards: {report['slowest_boards']}")
+    wall = report["wall_secs"] or 1.0
+    order = ["fetch", "dedupe", "filters", "validate", "seen", "sinks"]
+    stages = sorted(report["stage_secs"].items(), key=lambda kv: order.index(kv[0]) if kv[0] in order else len(order))
+    for stage, secs in stages:
+        print(f"  {stage:<10} {secs:8.3f}s  {100 * secs / wall:5.1f}%")
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument("--orgs", type=int, default=1_000, help="Total boards, split across the three ATSs")
+    parser.add_argument("--postings-per-org", type=int, default=20)
+    parser.add_argument("--desc-bytes", type=int, default=2_000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--dead-rate", type=float, default=0.01)
+    parser.add_argument("--max-connections", type=int, default=10)
+    parser.add_argument("--max-concurrency", type=int, default=50)
+    parser.add_argument("--rate-per-host", type=float, default=0.0, help="0 disables the token bucket")
+    parser.add_argument("--sinks", nargs="*", default=["csv"], choices=["csv", "sqlite", "parquet"])
+    parser.add_argument("--seen", action="store_true", help="Also maintain a seen index")
+    parser.add_argument("--archive", action="store_true", help="Also archive every fetched posting")
+    parser.add_argument("--probe", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1, help="Shard across this many pipeline processes")
+    parser.add_argument("--server-procs", type=int, default=1, help="Mock server processes sharing the port")
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    parser.add_argument("--metrics-prom", type=Path, help="Also write the run's Prometheus metrics here")
+    parser.add_argument("--baseline", type=Path, help="Previous --json report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed jobs/sec drop vs. baseline")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    config = MockConfig(
+        postings_per_org=args.postings_per_org,
+        desc_bytes=args.desc_bytes,
+        latency_ms=args.latency_ms,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        dead_rate=args.dead_rate,
+    )
+    ctx = mp.get_context("spawn")
+    port_queue = ctx.Queue()
+    reuse = args.server_procs > 1
+    servers = [ctx.Process(target=run_in_process, args=(config, port_queue, 0, reuse), daemon=True)]
+    servers[0].start()
+    try:
+        port = port_queue.get(timeout=30)
+        for _ in range(args.server_procs - 1):
+            servers.append(ctx.Process(target=run_in_process, args=(config, port_queue, port, reuse), daemon=True))
+            servers[-1].start()
+            port_queue.get(timeout=30)
+        with tempfile.TemporaryDirectory() as tmp:
+            # Inherited by sharded workers, keeps slug registries in the temp dir.
+            os.environ["JD_FILTER_REGISTRY_DIR"] = tmp
+            if args.workers > 1:
+                report = bench_sharded(args, port, Path(tmp))
+            else:
+                report = asyncio.run(bench(args, port, Path(tmp)))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.join()
+
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.baseline:
+        base = json.loads(args.baseline.read_text())
+        floor = base["jobs_per_sec"] * (1 - args.tolerance)
+        if report["jobs_per_sec"] < floor:
+            print(f"REGRESSION: {report['jobs_per_sec']:.0f} jobs/s < {floor:.0f} (baseline {base['jobs_per_sec']:.0f})")
+            sys.exit(1)
+        print(f"OK vs. baseline ({base['jobs_per_sec']:.0f} jobs/s)")
+
+
+if __name__ == "__main__":
+    main()
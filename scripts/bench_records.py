@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""Benchmark parse-to-sink throughput: pydantic everywhere vs. compact records.
+
+Example:
+    python scripts/bench_records.py --n 10000 --repeat 5
+
+Decodes a synthetic Lever-style JSON payload and pushes it through dedupe,
+the hard filters and a CSV writer, twice:
+
+* ``JobPost`` path – the previous pipeline: a validated ``JobPost`` per
+  posting, then ``model_dump()`` into a DataFrame for ``to_csv``;
+* ``JobRecord`` path – the current pipeline: ``__slots__`` records on the hot
+  path, validation only for postings that pass the filters.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from jd_filter.filters import is_us, passes_keyword_filter  # noqa: E402
+from jd_filter.models import JobPost, JobRecord  # noqa: E402
+from jd_filter.sinks.csvfile import CsvSink  # noqa: E402
+from jd_filter.utils import UrlDeduper, dedupe  # noqa: E402
+
+
+def make_payload(n: int) -> bytes:
+    now_ms = int(time.time() * 1000)
+    postings = []
+    for i in range(n):
+        ml = i % 10 == 0
+        postings.append(
+            {
+                "id": f"p-{i}",
+                "text": "Machine Learning Engineer" if ml else "Account Executive",
+                "categories": {"location": "Remote - US" if i % 3 else "London, UK"},
+                "hostedUrl": f"https://jobs.lever.co/acme/p-{i}",
+                "description": ("Build pytorch models. " if ml else "Grow revenue. ") * 60,
+                "createdAt": now_ms,
+            }
+        )
+    return json.dumps(postings).encode()
+
+
+def _fields(p: dict) -> dict:
+    return dict(
+        id=p["id"],
+        title=p.get("text", ""),
+        company="acme",
+        location=p.get("categories", {}).get("location"),
+        url=p["hostedUrl"],
+        description=p.get("description"),
+        created_at=_dt.datetime.utcfromtimestamp(p.get("createdAt", 0) / 1000),
+        source="lever",
+    )
+
+
+def jobpost_path(payload: bytes) -> int:
+    jobs = [JobPost(**_fields(p)) for p in json.loads(payload)]
+    kept = [j for j in dedupe(jobs) if is_us(j) and passes_keyword_filter(j)]
+    pd.DataFrame([j.model_dump() for j in kept]).to_csv(io.StringIO(), index=False)
+    return len(kept)
+
+
+def record_path(payload: bytes, out: Path) -> int:
+    deduper = UrlDeduper()
+    sink = CsvSink(out)
+    kept = []
+    for p in json.loads(payload):
+        rec = JobRecord(**_fields(p))
+        if deduper.add(rec) and is_us(rec) and passes_keyword_filter(rec):
+            kept.append(rec.to_post())
+    sink.write(kept)
+    sink.close()
+    return len(kept)
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Record construction benchmark")
+    parser.add_argument("--n", type=int, default=10_000, help="Postings per payload")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import logging
+    import tempfile
+
+    logging.disable(logging.INFO)
+    payload = make_payload(args.n)
+    print(f"Payload: {args.n} postings, {len(payload) / 1e6:.1f} MB")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "out.csv"
+        for name, fn in (("JobPost ", lambda: jobpost_path(payload)), ("JobRecord", lambda: record_path(payload, out))):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                kept = fn()
+                best = min(best, time.perf_counter() - start)
+            per_10k = best * 10_000 / args.n
+            print(f"{name}: {per_10k * 1000:8.1f} ms / 10k postings  ({args.n / best:9.0f} postings/s, kept={kept})")
+
+
+if __name__ == "__main__":
+    main()
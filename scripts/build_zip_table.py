@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Generate the bundled ZIP -> state table used by jd_filter.filters.location.
+
+Example:
+    python scripts/build_zip_table.py                 # from uszipcode's simple DB
+    python scripts/build_zip_table.py --source zipcodes
+    python scripts/build_zip_table.py --verify        # compare table vs. uszipcode
+
+``--source uszipcode`` (default) reproduces the previous runtime behaviour
+exactly, since ``is_us`` used ``SearchEngine(simple_zipcode=True)``; it needs
+the uszipcode SQLite file (downloaded on first use).  ``--source zipcodes``
+uses the ``zipcodes`` package's bundled dataset for offline builds (install
+it with ``pip install zipcodes``; the runtime never needs it).  The table
+currently in the tree is a ``zipcodes`` build -- see the zipstate module
+docstring.
+
+``--verify`` checks all 100,000 five-digit ZIPs: the table must resolve a
+state exactly when ``SearchEngine.by_zipcode`` does, and to the same state.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from jd_filter.filters.zipstate import TABLE_FILE, ZIP_SPACE, decode_table, encode_table  # noqa: E402
+
+
+def from_uszipcode() -> dict[str, str]:
+    from uszipcode import SearchEngine
+    from uszipcode.model import SimpleZipcode
+
+    search = SearchEngine(simple_zipcode=True)
+    rows = search.ses.query(SimpleZipcode.zipcode, SimpleZipcode.state).all()
+    return {z: s for z, s in rows if z and s}
+
+
+def from_zipcodes() -> dict[str, str]:
+    import zipcodes
+
+    return {z["zip_code"]: z["state"] for z in zipcodes.list_all() if z.get("state")}
+
+
+SOURCES = {"uszipcode": from_uszipcode, "zipcodes": from_zipcodes}
+
+
+def verify(path: Path) -> int:
+    """Return the number of ZIPs where *path*'s table disagrees with uszipcode."""
+    from uszipcode import SearchEngine
+
+    body, states = decode_table(path.read_bytes())
+    search = SearchEngine(simple_zipcode=True)
+    mismatches = 0
+    for i in range(ZIP_SPACE):
+        zipc = f"{i:05d}"
+        res = search.by_zipcode(zipc)
+        expected = (res.to_dict().get("state") if res else None) or None
+        got = states[body[i] - 1] if body[i] else None
+        if expected != got:
+            mismatches += 1
+            if mismatches <= 20:
+                print(f"  {zipc}: uszipcode={expected!r} table={got!r}")
+    return mismatches
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Build the ZIP -> state lookup table")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="uszipcode")
+    parser.add_argument("--output", type=Path, default=TABLE_FILE)
+    parser.add_argument("--verify", action="store_true", help="Compare --output against uszipcode and exit")
+    args = parser.parse_args()
+
+    if args.verify:
+        bad = verify(args.output)
+        print(f"{bad} mismatching ZIPs")
+        sys.exit(1 if bad else 0)
+
+    mapping = SOURCES[args.source]()
+    blob = encode_table(mapping)
+    args.output.write_bytes(blob)
+    print(f"Wrote {len(mapping)} ZIPs to {args.output} ({len(blob)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Fail when package or CLI startup pulls in heavy modules or exceeds its budget.
+
+Example:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --scale 2 --json startup.json
+
+Each case runs in a fresh interpreter under ``python -X importtime``.  A case
+fails if any of its forbidden top-level modules (pandas, SQLAlchemy, NumPy,
+pyarrow, ...) was imported, or if the summed import time (best of
+``--repeat`` runs, after one untimed warm-up run so a cold OS file cache is
+not charged to the first) is above its budget times ``--scale``.
+Budgets are loose enough for a CI runner (interpreter startup, including
+``site``, is counted); ``--scale`` adjusts them for slower machines.
+Exit status is 1 on any failure, so this can gate CI.
+``tests/test_import_time.py`` checks the forbidden modules, without timing,
+as part of the test suite.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Optional sinks, near-duplicate detection and ranking only.
+_HEAVY = ("pandas", "sqlalchemy", "numpy", "pyarrow", "scipy", "uszipcode")
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    argv: Tuple[str, ...]
+    budget_ms: float
+    forbidden: Tuple[str, ...]
+
+
+CASES = (
+    Case("import jd_filter", ("-c", "import jd_filter"), 150.0, _HEAVY + ("httpx", "pydantic")),
+    Case("import jd_filter.pipeline", ("-c", "import jd_filter.pipeline"), 600.0, _HEAVY),
+    # typer/rich dominate here; jd_filter itself must not be imported at all.
+    Case("cli.py run --help", (str(ROOT / "cli.py"), "run", "--help"), 600.0, _HEAVY + ("httpx", "pydantic")),
+)
+
+
+def measure(argv: Tuple[str, ...]) -> Tuple[float, Dict[str, float]]:
+    """Return total import milliseconds and cumulative ms per top-level package."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} failed:\n{proc.stderr[-2000:]}")
+    total_us = 0
+    packages: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        total_us += int(self_us)
+        top = name.split(".")[0]
+        if name == top:
+            packages[top] = max(packages.get(top, 0.0), int(cumulative_us) / 1000)
+    return total_us / 1000, packages
+
+
+def forbidden_imports(case: Case, packages: Dict[str, float]) -> List[str]:
+    """Return the forbidden top-level modules among *packages*."""
+    return [m for m in case.forbidden if m in packages]
+
+
+def check(case: Case, repeat: int, scale: float) -> Tuple[dict, List[str]]:
+    measure(case.argv)  # warm-up: loads the files into the OS cache
+    runs = [measure(case.argv) for _ in range(repeat)]
+    total_ms, packages = min(runs, key=lambda r: r[0])
+    problems = [f"imports {m}" for m in forbidden_imports(case, packages)]
+    budget = case.budget_ms * scale
+    if total_ms > budget:
+        problems.append(f"{total_ms:.0f} ms > budget {budget:.0f} ms")
+    slowest = dict(sorted(packages.items(), key=lambda kv: -kv[1])[:5])
+    report = {"total_ms": round(total_ms, 1), "budget_ms": budget, "slowest": slowest, "problems": problems}
+    return report, problems
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI hosts)")
+    parser.add_argument("--json", type=Path, default=None, help="Write the report here")
+    args = parser.parse_args()
+
+    reports = {}
+    failed = False
+    for case in CASES:
+        report, problems = check(case, args.repeat, args.scale)
+        reports[case.name] = report
+        status = "FAIL" if problems else "ok"
+        slowest = ", ".join(f"{k} {v:.0f}" for k, v in report["slowest"].items())
+        print(f"{status:<4} {case.name:<28} {report['total_ms']:7.1f} ms / {report['budget_ms']:.0f}  ({slowest})")
+        for problem in problems:
+            print(f"       - {problem}")
+        failed |= bool(problems)
+
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
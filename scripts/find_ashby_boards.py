@@ -3,75 +3,315 @@
 
 Example:
     python scripts/find_ashby_boards.py --input urls.txt
+    python scripts/find_ashby_boards.py --input urls.txt --checkpoint crawl.sqlite3 --concurrency 100
 
 The script fetches each URL, looks for pattern 'jobs.ashbyhq.com/<board>',
-and appends new boards into 'jd_filter/sources/ashby_boards.json'.
+and adds new boards to the shared slug registry used by
+:mod:`jd_filter.sources.ashby`.
+
+The crawl is built for URL lists of hundreds of thousands of entries:
+
+* response bodies are read incrementally and the download stops at the first
+  match or after ``--max-bytes``, so memory per request is bounded;
+* the input is read in windows of ``--window`` URLs, grouped by domain and
+  scheduled round-robin with at most one request in flight per domain, so
+  no single site monopolizes the crawl or gets hammered;
+* once a domain yields a board its remaining URLs are skipped;
+* every finished URL (and every board found) is checkpointed in a SQLite
+  file and boards are added to the registry as they are found, so an
+  interrupted crawl resumes where it stopped when re-run with the same
+  ``--checkpoint``.
 """
 from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import re
+import sqlite3
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Set
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 import httpx
-from tqdm.asyncio import tqdm
+from tqdm import tqdm
 
-BOARDS_FILE = Path(__file__).resolve().parent.parent / "jd_filter" / "sources" / "ashby_boards.json"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-ASYNC_SEMAPHORE = asyncio.Semaphore(20)
-PATTERN = re.compile(r"jobs\.ashbyhq\.com/([A-Za-z0-9\-]+)")
+from jd_filter.sources._slugs import SlugRegistry  # noqa: E402
+from jd_filter.sources.ashby import load_registry  # noqa: E402
 
-def load_boards() -> Set[str]:
-    if BOARDS_FILE.exists():
-        try:
-            return set(json.loads(BOARDS_FILE.read_text()).keys())
-        except Exception:
-            return set()
-    return set()
+PATTERN = re.compile(rb"jobs\.ashbyhq\.com/([A-Za-z0-9\-]+)")
+# Bytes kept from the previous chunk so a match split across chunks is found.
+_OVERLAP = 256
+# SQLite's default host-parameter limit is 999.
+_LOOKUP_BATCH = 500
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS urls (
+        url     TEXT PRIMARY KEY,
+        domain  TEXT NOT NULL,
+        status  TEXT NOT NULL,
+        bytes   INTEGER NOT NULL,
+        done_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS boards (
+        board  TEXT PRIMARY KEY,
+        domain TEXT NOT NULL,
+        url    TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+)
+
+
+@dataclass
+class Probe:
+    """Outcome of scanning one URL."""
+
+    url: str
+    domain: str
+    # "found", "none" (no match within the cap), "capped" or "error".
+    status: str
+    boards: Tuple[str, ...] = ()
+    bytes: int = 0
+
+
+def normalize_url(raw: str) -> Optional[str]:
+    url = raw.strip()
+    if not url or url.startswith("#"):
+        return None
+    return url if "://" in url else f"https://{url}"
+
+
+def domain_of(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class Checkpoint:
+    """SQLite record of finished URLs and discovered boards, written in batches."""
+
+    def __init__(self, path: str | Path, *, flush_every: int = 200) -> None:
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+        self._conn.commit()
+        self._flush_every = flush_every
+        self._pending: List[Probe] = []
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
 
-def save_boards(boards: Set[str]) -> None:
-    data = {b: {"fails": 0} for b in sorted(boards)}
-    BOARDS_FILE.write_text(json.dumps(data, indent=2))
+    def finished_domains(self) -> Set[str]:
+        return {row[0] for row in self._conn.execute("SELECT DISTINCT domain FROM boards")}
 
-async def fetch_html(client: httpx.AsyncClient, url: str) -> str:
+    def done(self, urls: List[str], *, retry_errors: bool = False) -> Set[str]:
+        """Return the subset of *urls* already finished in an earlier run."""
+        skip = " AND status != 'error'" if retry_errors else ""
+        found: Set[str] = set()
+        for i in range(0, len(urls), _LOOKUP_BATCH):
+            batch = urls[i : i + _LOOKUP_BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = self._conn.execute(f"SELECT url FROM urls WHERE url IN ({marks}){skip}", batch)
+            found.update(row[0] for row in rows)
+        return found
+
+    def record(self, probe: Probe) -> bool:
+        """Buffer *probe*; return True when the buffer was flushed."""
+        self._pending.append(probe)
+        if len(self._pending) >= self._flush_every:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO urls (url, domain, status, bytes, done_at) VALUES (?, ?, ?, ?, ?)",
+                [(p.url, p.domain, p.status, p.bytes, now) for p in self._pending],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO boards (board, domain, url) VALUES (?, ?, ?)",
+                [(b, p.domain, p.url) for p in self._pending for b in p.boards],
+            )
+        self._pending.clear()
+
+
+async def probe(client: httpx.AsyncClient, url: str, domain: str, *, max_bytes: int) -> Probe:
+    """Stream *url* until a board link is found, the body ends or *max_bytes* are read."""
+    seen = 0
+    tail = b""
     try:
-        async with ASYNC_SEMAPHORE:
-            r = await client.get(url, timeout=10)
-            r.raise_for_status()
-            return r.text
-    except Exception:
-        return ""
-
-async def crawl(urls: list[str]) -> Set[str]:
-    boards: Set[str] = set()
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        for html in tqdm.as_completed([fetch_html(client, u) for u in urls], total=len(urls)):
-            content = await html
-            for match in PATTERN.finditer(content):
-                boards.add(match.group(1))
-    return boards
+        async with client.stream("GET", url) as resp:
+            if resp.status_code >= 400:
+                return Probe(url, domain, "error")
+            async for chunk in resp.aiter_bytes():
+                seen += len(chunk)
+                buf = tail + chunk
+                # A match touching the end of the buffer may continue in the
+                # next chunk; it is picked up again from the overlap.
+                boards = tuple(dict.fromkeys(m.group(1).decode() for m in PATTERN.finditer(buf) if m.end() < len(buf)))
+                if boards:
+                    return Probe(url, domain, "found", boards, seen)
+                if seen >= max_bytes:
+                    return Probe(url, domain, "capped", bytes=seen)
+                tail = buf[-_OVERLAP:]
+    except (httpx.HTTPError, ValueError):
+        return Probe(url, domain, "error", bytes=seen)
+    boards = tuple(dict.fromkeys(m.group(1).decode() for m in PATTERN.finditer(tail)))
+    return Probe(url, domain, "found" if boards else "none", boards, seen)
+
+
+def windows(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    urls = (u for u in map(normalize_url, lines) if u)
+    while True:
+        window = list(islice(urls, size))
+        if not window:
+            return
+        yield list(dict.fromkeys(window))
+
+
+async def crawl(
+    lines: Iterable[str],
+    checkpoint: Checkpoint,
+    registry: SlugRegistry,
+    *,
+    concurrency: int = 50,
+    max_bytes: int = 256 * 1024,
+    timeout: float = 10.0,
+    window: int = 20_000,
+    retry_errors: bool = False,
+    progress: Optional[tqdm] = None,
+) -> Dict[str, int]:
+    """Scan *lines* (URLs) and return counts per probe status.
+
+    Boards are added to *registry* (and saved) each time the checkpoint is
+    flushed, so both stay consistent if the crawl is interrupted.
+    """
+    counts: Dict[str, int] = {}
+    finished = checkpoint.finished_domains()
+    known = set(registry.slugs(include_dead=True))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=min(concurrency, 20))
+    headers = {"User-Agent": "jd-filter board discovery"}
+
+    async with httpx.AsyncClient(
+        follow_redirects=True, timeout=timeout, limits=limits, headers=headers
+    ) as client:
+        for urls in windows(lines, window):
+            done = checkpoint.done(urls, retry_errors=retry_errors)
+            queues: Dict[str, Deque[str]] = {}
+            for url in urls:
+                domain = domain_of(url)
+                if url in done or domain in finished or not domain:
+                    counts["skipped"] = counts.get("skipped", 0) + 1
+                    continue
+                queues.setdefault(domain, deque()).append(url)
+            if progress is not None:
+                progress.update(len(urls) - sum(len(q) for q in queues.values()))
+
+            # Round-robin over domains, one request in flight per domain.
+            ring: Deque[str] = deque(queues)
+            in_flight: Dict[asyncio.Task, str] = {}
+            while ring or in_flight:
+                while ring and len(in_flight) < concurrency:
+                    domain = ring.popleft()
+                    url = queues[domain].popleft()
+                    task = asyncio.create_task(probe(client, url, domain, max_bytes=max_bytes))
+                    in_flight[task] = domain
+                ready, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in ready:
+                    domain = in_flight.pop(task)
+                    result = task.result()
+                    counts[result.status] = counts.get(result.status, 0) + 1
+                    if result.boards:
+                        finished.add(domain)
+                        new = [b for b in result.boards if b not in known]
+                        known.update(new)
+                        registry.add(new)
+                        skipped = len(queues[domain])
+                        counts["skipped"] = counts.get("skipped", 0) + skipped
+                        queues[domain].clear()
+                        if progress is not None:
+                            progress.update(skipped)
+                    if queues[domain]:
+                        ring.append(domain)
+                    if checkpoint.record(result):
+                        registry.save()
+                    if progress is not None:
+                        progress.update(1)
+            checkpoint.flush()
+            registry.save()
+    return counts
+
+
+def _count_lines(path: Path) -> int:
+    with path.open("rb") as fh:
+        return sum(1 for line in fh if line.strip())
+
 
 def main() -> None:  # pragma: no cover
     parser = argparse.ArgumentParser(description="Discover Ashby board names from company URLs")
     parser.add_argument("--input", required=True, help="Text file containing URLs to scan (one per line)")
+    parser.add_argument(
+        "--checkpoint", default="ashby_crawl.sqlite3", help="SQLite file of finished URLs; re-run to resume"
+    )
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight (one per domain)")
+    parser.add_argument("--max-bytes", type=int, default=256 * 1024, help="Stop reading a page after this many bytes")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--window", type=int, default=20_000, help="URLs read and scheduled together")
+    parser.add_argument("--retry-errors", action="store_true", help="Re-scan URLs that failed in an earlier run")
     args = parser.parse_args()
 
-    urls = [l.strip() for l in Path(args.input).read_text().splitlines() if l.strip()]
-    existing = load_boards()
-    print(f"Loaded {len(existing)} existing boards")
+    path = Path(args.input)
+    checkpoint = Checkpoint(args.checkpoint)
+    with load_registry() as registry:
+        before = set(registry.slugs(include_dead=True))
+        print(f"Loaded {len(before)} existing boards")
+        try:
+            with path.open(encoding="utf-8", errors="replace") as fh, tqdm(total=_count_lines(path)) as bar:
+                counts = asyncio.run(
+                    crawl(
+                        fh,
+                        checkpoint,
+                        registry,
+                        concurrency=args.concurrency,
+                        max_bytes=args.max_bytes,
+                        timeout=args.timeout,
+                        window=args.window,
+                        retry_errors=args.retry_errors,
+                        progress=bar,
+                    )
+                )
+        except KeyboardInterrupt:
+            print(f"Interrupted; re-run with --checkpoint {args.checkpoint} to resume.")
+            counts = {}
+        finally:
+            checkpoint.close()
+            registry.save()
+        added = set(registry.slugs(include_dead=True)) - before
+        if counts:
+            print("URLs: " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+        print(f"Discovered {len(added)} new boards")
 
-    new_boards = asyncio.run(crawl(urls))
-    added = new_boards - existing
-    print(f"Discovered {len(added)} new boards")
+        if added:
+            print(f"Added to {registry.path}.")
+        else:
+            print("No new boards found.")
 
-    if added:
-        save_boards(existing | added)
-        print("ashby_boards.json updated.")
-    else:
-        print("No new boards found.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
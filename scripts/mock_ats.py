@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+"""Local HTTP server emulating the Lever, Greenhouse and Ashby posting APIs.
+
+Example:
+    python scripts/mock_ats.py --port 8080 --postings-per-org 20 --latency-ms 50 --rate-429 0.01
+
+Any org slug is accepted; its postings are generated deterministically from
+the slug, so repeated runs see identical boards.  A configurable share of
+slugs answer 404 (dead boards), requests can be delayed and throttled with
+429, and descriptions can be padded to stress parsing and sinks.  Point the
+pipeline at it with ``Transport(host_map=...)`` (see ``bench_pipeline.py``).
+
+Served paths (query parameters as used by the connectors):
+
+* ``/v0/postings/<org>``            – Lever (``createdAt``, ``limit``, ``skip``)
+* ``/v1/boards/<org>/jobs``         – Greenhouse, ``{"jobs": [...]}``
+* ``/posting-api/job-board/<board>`` – Ashby, ``{"jobs": [...]}``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as _dt
+import html
+import json
+import random
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+_TITLES = [
+    ("Machine Learning Engineer", True),
+    ("Senior Data Scientist", True),
+    ("Applied Scientist, LLM", True),
+    ("Account Executive", False),
+    ("Product Designer", False),
+    ("Customer Success Manager", False),
+    ("Backend Engineer", False),
+]
+_LOCATIONS = [
+    "San Francisco, CA",
+    "Remote - US",
+    "New York, NY 10001",
+    "London, UK",
+    "Berlin, Germany",
+    "Toronto, Canada",
+]
+_ML_TEXT = "You will train and deploy deep learning models with PyTorch and serve LLMs. "
+_OTHER_TEXT = "You will grow revenue and partner with customers across the region. "
+
+
+@dataclass(frozen=True)
+class MockConfig:
+    """Shape of the data and failures the mock server produces."""
+
+    postings_per_org: int = 20
+    desc_bytes: int = 2_000
+    latency_ms: float = 0.0
+    rate_429: float = 0.0
+    retry_after: Optional[int] = None
+    dead_rate: float = 0.0
+    seed: int = 0
+
+
+class MockATS:
+    """Generate responses for the three ATS APIs from a :class:`MockConfig`."""
+
+    def __init__(self, config: MockConfig) -> None:
+        self.config = config
+        self.requests = 0
+        self._started = time.time()
+        self.throttled = 0
+        self._rng = random.Random(config.seed)
+        self._desc = {
+            ml: ((_ML_TEXT if ml else _OTHER_TEXT) * (config.desc_bytes // 60 + 1))[: config.desc_bytes]
+            for ml in (True, False)
+        }
+        # Lever sends HTML descriptions, Greenhouse sends them entity-escaped.
+        self._html = {
+            ml: f'<div><p style="font-size: 12pt">{text}</p><ul><li>Benefits &amp; perks</li></ul></div>'
+            for ml, text in self._desc.items()
+        }
+        self._escaped = {ml: html.escape(text) for ml, text in self._html.items()}
+
+    def _is_dead(self, org: str) -> bool:
+        return zlib.crc32(f"{self.config.seed}:{org}".encode()) % 10_000 < self.config.dead_rate * 10_000
+
+    def _postings(self, source: str, org: str) -> List[Tuple[str, str, bool, str, float]]:
+        rng = random.Random(f"{self.config.seed}:{source}:{org}")
+        # Anchored at server start, so repeated requests see the same postings.
+        now = self._started
+        out = []
+        for k in range(rng.randint(0, 2 * self.config.postings_per_org)):
+            title, ml = rng.choice(_TITLES)
+            out.append((f"{org}-{k}", title, ml, rng.choice(_LOCATIONS), now - rng.uniform(0, 20 * 3600)))
+        return out
+
+    def _lever(self, org: str, query: Dict[str, str]) -> bytes:
+        since_ms = int(query.get("createdAt", 0))
+        rows = [
+            {
+                "id": pid,
+                "text": title,
+                "categories": {"location": loc},
+                "hostedUrl": f"https://jobs.lever.co/{org}/{pid}",
+                "description": self._html[ml],
+                "createdAt": int(ts * 1000),
+            }
+            for pid, title, ml, loc, ts in self._postings("lever", org)
+            if ts * 1000 >= since_ms
+        ]
+        skip = int(query.get("skip", 0))
+        limit = int(query["limit"]) if "limit" in query else len(rows)
+        return json.dumps(rows[skip : skip + limit]).encode()
+
+    def _greenhouse(self, org: str, query: Dict[str, str]) -> bytes:
+        # Like the real API, the filter is date-granular.
+        since = query.get("created_after")
+        since_ts = _dt.datetime.strptime(since, "%Y-%m-%d").replace(tzinfo=_dt.timezone.utc).timestamp() if since else 0
+        jobs = [
+            {
+                "id": pid,
+                "title": title,
+                "location": {"name": loc},
+                "absolute_url": f"https://boards.greenhouse.io/{org}/jobs/{pid}",
+                "content": self._escaped[ml],
+                "created_at": _dt.datetime.fromtimestamp(ts, _dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z"),
+            }
+            for pid, title, ml, loc, ts in self._postings("greenhouse", org)
+            if ts >= since_ts
+        ]
+        return json.dumps({"jobs": jobs}).encode()
+
+    def _ashby(self, board: str, query: Dict[str, str]) -> bytes:
+        jobs = [
+            {
+                "id": pid,
+                "title": title,
+                "companyName": board,
+                "location": loc,
+                "url": f"https://jobs.ashbyhq.com/{board}/{pid}",
+                "descriptionPlain": self._desc[ml],
+                "createdAt": _dt.datetime.utcfromtimestamp(ts).isoformat(timespec="seconds") + "Z",
+            }
+            for pid, title, ml, loc, ts in self._postings("ashby", board)
+        ]
+        if "limit" in query:
+            jobs = jobs[: int(query["limit"])]
+        return json.dumps({"jobs": jobs}).encode()
+
+    def respond(self, target: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Return ``(status, headers, body)`` for a request target."""
+        self.requests += 1
+        parts = urlsplit(target)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        segs = [s for s in parts.path.split("/") if s]
+
+        if self.config.rate_429 and self._rng.random() < self.config.rate_429:
+            self.throttled += 1
+            headers = {}
+            if self.config.retry_after is not None:
+                headers["Retry-After"] = str(self.config.retry_after)
+            return 429, headers, b'{"error": "rate limited"}'
+
+        if len(segs) == 3 and segs[:2] == ["v0", "postings"]:
+            org, body = segs[2], lambda: self._lever(segs[2], query)
+        elif len(segs) == 4 and segs[:2] == ["v1", "boards"] and segs[3] == "jobs":
+            org, body = segs[2], lambda: self._greenhouse(segs[2], query)
+        elif len(segs) == 3 and segs[:2] == ["posting-api", "job-board"]:
+            org, body = segs[2], lambda: self._ashby(segs[2], query)
+        else:
+            return 404, {}, b'{"error": "unknown path"}'
+        if self._is_dead(org):
+            return 404, {}, b'{"error": "not found"}'
+        return 200, {"Content-Type": "application/json"}, body()
+
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests"}
+
+
+async def _handle(app: MockATS, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    latency = app.config.latency_ms / 1000
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            _method, target, _version = lines[0].split(" ", 2)
+            close = any(line.lower() == "connection: close" for line in lines[1:])
+            if latency:
+                await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+            status, headers, body = app.respond(target)
+            headers = {**headers, "Content-Length": str(len(body))}
+            if close:
+                headers["Connection"] = "close"
+            out = f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            out += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+            writer.write(out.encode("latin-1") + b"\r\n" + body)
+            await writer.drain()
+            if close:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(
+    config: MockConfig, host: str = "127.0.0.1", port: int = 0, *, on_ready=None, reuse_port: bool = False
+) -> None:
+    """Serve *config* forever; ``on_ready(port)`` is called once listening.
+
+    With *reuse_port*, several processes can listen on the same port and the
+    kernel spreads connections across them.
+    """
+    app = MockATS(config)
+    server = await asyncio.start_server(
+        lambda r, w: _handle(app, r, w), host, port, backlog=4096, limit=1 << 20, reuse_port=reuse_port or None
+    )
+    if on_ready is not None:
+        on_ready(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+def run_in_process(config: MockConfig, port_queue, port: int = 0, reuse_port: bool = False) -> None:
+    """``multiprocessing`` target: serve and report the bound port on *port_queue*."""
+    asyncio.run(serve(config, port=port, on_ready=port_queue.put, reuse_port=reuse_port))
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Mock Lever/Greenhouse/Ashby server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--postings-per-org", type=int, default=20, help="Mean postings per board")
+    parser.add_argument("--desc-bytes", type=int, default=2_000, help="Description length per posting")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean injected latency per request")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests answered 429")
+    parser.add_argument("--retry-after", type=int, default=None, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--dead-rate", type=float, default=0.0, help="Share of slugs answering 404")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        postings_per_org=args.postings_per_org,
+        desc_bytes=args.desc_bytes,
+        latency_ms=args.latency_ms,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        dead_rate=args.dead_rate,
+        seed=args.seed,
+    )
+    print(f"Serving mock ATS APIs on http://{args.host}:{args.port}")
+    asyncio.run(serve(config, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
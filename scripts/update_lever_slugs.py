@@ -1,12 +1,12 @@
 #!/usr/bin/env python
-"""Refresh lever_slugs.json using SerpAPI or GitHub code search.
+"""Add Lever slugs found via SerpAPI to the shared slug registry.
 
-Requires env var SERPAPI_KEY. Falls back to public GitHub search if no key.
+Requires env var SERPAPI_KEY. New slugs are inserted into the SQLite registry
+used by :mod:`jd_filter.sources.lever`; existing entries keep their history.
 """
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import re
 import sys
@@ -14,25 +14,13 @@ from pathlib import Path
 from typing import Set
 
 import httpx
-from tqdm.asyncio import tqdm
-
-SLUGS_FILE = Path(__file__).resolve().parent.parent / "jd_filter" / "sources" / "lever_slugs.json"
-PATTERN = re.compile(r"jobs\.lever\.co/([A-Za-z0-9\-]+)")
-SERP_ENDPOINT = "https://serpapi.com/search.json"
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def load_slugs() -> Set[str]:
-    if SLUGS_FILE.exists():
-        try:
-            return set(json.loads(SLUGS_FILE.read_text()).keys())
-        except Exception:
-            pass
-    return set()
+from jd_filter.sources.lever import load_registry  # noqa: E402
 
-
-def save_slugs(slugs: Set[str]) -> None:
-    data = {s: {"fails": 0} for s in sorted(slugs)}
-    SLUGS_FILE.write_text(json.dumps(data, indent=2))
+PATTERN = re.compile(r"jobs\.lever\.co/([A-Za-z0-9\-]+)")
+SERP_ENDPOINT = "https://serpapi.com/search.json"
 
 
 async def search_serpapi(query: str, pages: int = 3) -> Set[str]:
@@ -62,15 +50,15 @@ async def search_serpapi(query: str, pages: int = 3) -> Set[str]:
 
 async def main() -> None:  # pragma: no cover
     print("Refreshing Lever slugs…")
-    existing = load_slugs()
-    print(f"Loaded {len(existing)} existing slugs")
+    with load_registry() as registry:
+        existing = set(registry.slugs(include_dead=True))
+        print(f"Loaded {len(existing)} existing slugs")
 
-    serp_slugs = await search_serpapi("site:jobs.lever.co", pages=3)
-    print(f"SerpAPI found {len(serp_slugs)} slugs")
+        serp_slugs = await search_serpapi("site:jobs.lever.co", pages=3)
+        print(f"SerpAPI found {len(serp_slugs)} slugs")
 
-    updated = existing | serp_slugs
-    save_slugs(updated)
-    print(f"lever_slugs.json now holds {len(updated)} slugs")
+        registry.add(sorted(serp_slugs - existing))
+    print(f"Registry {registry.path} now holds {len(existing | serp_slugs)} Lever slugs")
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
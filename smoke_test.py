@@ -4,51 +4,56 @@ Usage (inside virtualenv):
 
     python smoke_test.py
 
-It patches the source connectors to return synthetic job postings so the test
-runs offline and deterministically.
+It patches the source connectors (and slug validation) as imported by
+``jd_filter.pipeline`` to yield synthetic job postings so the test runs
+offline and deterministically.  For volume testing against a mock ATS server
+see ``scripts/bench_pipeline.py``.
 """
 
 from __future__ import annotations
 
 import asyncio
+import os
 import tempfile
 from pathlib import Path
 
-from jd_filter.models import JobPost
+from jd_filter.models import JobRecord
 from jd_filter import pipeline
-import jd_filter.sources as sources
 
 # ---------------------------------------------------------------------------
 # Build mock job postings ----------------------------------------------------
 # ---------------------------------------------------------------------------
 
-good_us_job = JobPost(
+good_us_job = JobRecord(
     id="1",
     title="Machine Learning Engineer",
     company="AcmeAI",
     location="San Francisco, CA, United States",
     url="https://jobs.example.com/1",
     description="Work with PyTorch on LLMs.",
+    created_at=None,
     source="lever",
 )
 
-bad_keyword_job = JobPost(
+bad_keyword_job = JobRecord(
     id="2",
     title="Senior Sales Executive",
     company="SalesCorp",
     location="New York, NY, US",
     url="https://jobs.example.com/2",
     description="Close enterprise deals.",
+    created_at=None,
     source="lever",
 )
 
-non_us_job = JobPost(
+non_us_job = JobRecord(
     id="3",
     title="ML Engineer",
     company="EuroAI",
     location="Berlin, Germany",
     url="https://jobs.example.com/3",
     description="AI and Deep Learning using PyTorch.",
+    created_at=None,
     source="lever",
 )
 
@@ -59,14 +64,22 @@ MOCK_JOBS = [good_us_job, bad_keyword_job, non_us_job]
 # Monkey-patch async fetchers -------------------------------------------------
 # ---------------------------------------------------------------------------
 
-async def _mock_fetch(org: str, since_hrs: int = 24):  # noqa: D401
-    # Return the same MOCK_JOBS regardless of org
-    return MOCK_JOBS
+async def _mock_iter(org: str, *, since_hrs: int = 24, since=None, transport=None):  # noqa: D401
+    # Yield the same MOCK_JOBS regardless of org
+    for job in MOCK_JOBS:
+        yield job
 
-# Apply the patch
-sources.fetch_lever = _mock_fetch  # type: ignore
-sources.fetch_greenhouse = _mock_fetch  # type: ignore
-sources.fetch_ashby = _mock_fetch  # type: ignore
+
+async def _mock_validate(slugs, **kwargs):  # noqa: D401
+    # Every slug is alive; never touch the network or the slug registries
+    return list(slugs)
+
+# Apply the patch where the pipeline looks the names up
+pipeline.iter_lever = _mock_iter  # type: ignore
+pipeline.iter_greenhouse = _mock_iter  # type: ignore
+pipeline.iter_ashby = _mock_iter  # type: ignore
+pipeline.validate_lever_slugs = _mock_validate  # type: ignore
+pipeline.validate_ashby_boards = _mock_validate  # type: ignore
 
 
 # ---------------------------------------------------------------------------
@@ -75,6 +88,8 @@ sources.fetch_ashby = _mock_fetch  # type: ignore
 
 def main():  # noqa: D401
     with tempfile.TemporaryDirectory() as tmpdir:
+        # Fetch outcomes are recorded in the slug registry; keep it out of the package.
+        os.environ["JD_FILTER_REGISTRY_DIR"] = tmpdir
         csv_path = Path(tmpdir) / "out.csv"
         asyncio.run(
             pipeline.run(
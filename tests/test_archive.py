@@ -0,0 +1,93 @@
+"""Archive raw storage, append-only index runs and crash leftovers."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from jd_filter.archive import Archive  # noqa: E402
+from jd_filter.models import JobRecord  # noqa: E402
+
+
+def _job(id: str, description: str = "<p>Python &amp; ML</p>", source: str = "lever") -> JobRecord:
+    return JobRecord(
+        id=id,
+        title="ML Engineer",
+        company="Acme",
+        location="Remote",
+        url=f"https://jobs.example.com/{id}",
+        description=description,
+        created_at=datetime(2024, 5, 1),
+        source=source,
+    )
+
+
+def _runs(root):
+    return sorted(p.name for p in root.glob("index-*.bin"))
+
+
+def test_keeps_the_posting_as_fetched(tmp_path):
+    job = _job("1")
+    with Archive(tmp_path) as archive:
+        archive.append(job)
+        # Normalizing afterwards (as the pipeline does) leaves the archived copy raw.
+        job.description = "Python & ML"
+    assert Archive(tmp_path, readonly=True).get("lever", "1").description == "<p>Python &amp; ML</p>"
+
+
+def test_commit_appends_a_run_instead_of_rewriting(tmp_path):
+    with Archive(tmp_path, threaded=False) as archive:
+        for i in range(8):
+            archive.append(_job(str(i)))
+        archive.commit()
+        assert _runs(tmp_path) == ["index-000001-000001.bin"]
+        first = (tmp_path / "index-000001-000001.bin").stat().st_ino
+
+        archive.append(_job("8"))
+        archive.commit()
+        # The small new run sits next to the first one, which is untouched.
+        assert _runs(tmp_path) == ["index-000001-000001.bin", "index-000002-000002.bin"]
+        assert (tmp_path / "index-000001-000001.bin").stat().st_ino == first
+
+        for i in range(9, 13):
+            archive.append(_job(str(i)))
+        archive.commit()
+        # Runs of similar size are merged.
+        assert _runs(tmp_path) == ["index-000001-000003.bin"]
+        assert len(archive) == 13
+
+
+def test_newest_version_wins_across_runs(tmp_path):
+    with Archive(tmp_path, threaded=False) as archive:
+        for i in range(10):
+            archive.append(_job(str(i), "v1"))
+        archive.commit()
+        assert not archive.append(_job("3", "v1"))
+        archive.append(_job("3", "v2"))
+        archive.commit()
+        assert len(_runs(tmp_path)) == 2
+        assert len(archive) == 10
+
+    archive = Archive(tmp_path, readonly=True)
+    assert archive.get("lever", "3").description == "v2"
+    assert [j.description for j in archive.scan() if j.id == "3"] == ["v2"]
+
+
+def test_ignores_runs_left_behind_by_an_interrupted_merge(tmp_path):
+    with Archive(tmp_path, threaded=False) as archive:
+        archive.append(_job("1", "v1"))
+        archive.commit()
+        # Stale copy of the first run, as if a merge crashed before unlinking it.
+        stale = (tmp_path / "index-000001-000001.bin").read_bytes()
+        archive.append(_job("1", "v2"))
+        archive.commit()
+    assert _runs(tmp_path) == ["index-000001-000002.bin"]
+    (tmp_path / "index-000001-000001.bin").write_bytes(stale)
+
+    assert Archive(tmp_path, readonly=True).get("lever", "1").description == "v2"
+    with Archive(tmp_path) as archive:
+        assert archive.get("lever", "1").description == "v2"
+    assert _runs(tmp_path) == ["index-000001-000002.bin"]
@@ -0,0 +1,86 @@
+"""CsvSink append mode across restarts."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+from datetime import datetime
+
+import pytest
+
+from jd_filter import scheduler
+from jd_filter.models import JobRecord
+from jd_filter.pipeline import _open_sinks
+from jd_filter.sinks.csvfile import CsvSink
+
+
+def _job(id: str) -> JobRecord:
+    return JobRecord(
+        id=id,
+        title=f"Engineer {id}",
+        company="Acme",
+        location="Remote",
+        url=f"https://jobs.example.com/{id}",
+        description="Python",
+        created_at=datetime(2024, 5, 1),
+        source="lever",
+    )
+
+
+def _ids(path):
+    with path.open(newline="", encoding="utf-8") as fh:
+        return [row["id"] for row in csv.DictReader(fh)]
+
+
+def test_rows_survive_a_restart(tmp_path):
+    path = tmp_path / "jobs.csv"
+    for ids in (["1", "2"], ["3"]):
+        (sink,) = _open_sinks(path, None, append=True)
+        sink.write([_job(i) for i in ids])
+        sink.close()
+    assert _ids(path) == ["1", "2", "3"]
+    assert path.read_text(encoding="utf-8").count("id,title") == 1
+
+
+def test_append_to_empty_file_writes_header(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.touch()
+    sink = CsvSink(path, append=True)
+    sink.write([_job("1")])
+    sink.close()
+    assert _ids(path) == ["1"]
+
+
+def test_append_rejects_other_columns(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        CsvSink(path, append=True).write([_job("1")])
+
+
+def test_without_append_replaces(tmp_path):
+    path = tmp_path / "jobs.csv"
+    for i in ("1", "2"):
+        sink = CsvSink(path)
+        sink.write([_job(i)])
+        sink.close()
+    assert _ids(path) == ["2"]
+
+
+def test_scheduler_opens_csv_for_append(tmp_path, monkeypatch):
+    opened = {}
+
+    def fake_open_sinks(*args, **kwargs):
+        opened.update(kwargs)
+        return []
+
+    monkeypatch.setattr(scheduler, "_open_sinks", fake_open_sinks)
+    sched = scheduler.Scheduler(
+        {"lever": ["acme"]},
+        state_path=tmp_path / "state.sqlite3",
+        seen_path=tmp_path / "seen.sqlite3",
+        csv_path=tmp_path / "jobs.csv",
+        normalize=False,
+    )
+    asyncio.run(sched.serve(cycles=0))
+    assert opened["append"] is True
@@ -0,0 +1,18 @@
+"""Startup paths must not import heavy optional modules (no timing here)."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import check_import_time  # noqa: E402
+
+
+@pytest.mark.parametrize("case", check_import_time.CASES, ids=lambda c: c.name)
+def test_no_forbidden_imports(case):
+    _, packages = check_import_time.measure(case.argv)
+    assert check_import_time.forbidden_imports(case, packages) == []
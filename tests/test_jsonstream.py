@@ -0,0 +1,125 @@
+"""Incremental JSON array decoding: chunk boundaries, keyed bodies, bad input."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, List
+
+import pytest
+
+from jd_filter.sources import _jsonstream
+from jd_filter.sources._jsonstream import fetch_array, iter_array
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def _collect(data: bytes | str, size: int = 1, key: str | None = None) -> List[Any]:
+    if isinstance(data, str):
+        data = data.encode()
+
+    async def _main() -> List[Any]:
+        return [x async for x in iter_array(_chunks(data, size), key)]
+
+    return asyncio.run(_main())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_values_split_across_chunks(size):
+    items = [12345, -0.5e10, "café ☃ \"quoted\" \\ done", {"a": [1, 2, {"b": None}]}, True, None, []]
+    assert _collect(json.dumps(items, ensure_ascii=False), size) == items
+
+
+def test_number_ending_at_chunk_edge_is_not_cut_short():
+    # "12" arrives on its own; the rest of the number follows.
+    async def chunks():
+        for part in (b"[12", b"34", b", 5]"):
+            yield part
+
+    async def _main():
+        return [x async for x in iter_array(chunks())]
+
+    assert asyncio.run(_main()) == [1234, 5]
+
+
+def test_keyed_object_and_bare_array():
+    body = {"meta": {"jobs": ["not", "these"]}, "count": 2, "jobs": [{"id": 1}, {"id": 2}], "after": [3]}
+    assert _collect(json.dumps(body), 5, key="jobs") == [{"id": 1}, {"id": 2}]
+    assert _collect('[{"id": 1}]', 5, key="jobs") == [{"id": 1}]
+    assert _collect('{"other": []}', 5, key="jobs") == []
+    assert _collect('{"jobs": null}', 5, key="jobs") == []
+    assert _collect(" [ ] ", 1) == []
+    with pytest.raises(ValueError, match="no array key"):
+        _collect('{"jobs": []}')
+    with pytest.raises(ValueError, match="not an array"):
+        _collect('{"jobs": 3}', key="jobs")
+
+
+@pytest.mark.parametrize("body", ['[{"id": 1}, {"id": 2', '[{"id": 1}, "abc', "[1, 2", '{"jobs": [1', "", "[1 2]"])
+def test_truncated_or_malformed_input_raises(body):
+    with pytest.raises(ValueError):
+        _collect(body, 3, key="jobs")
+
+
+def test_large_element_is_decoded_a_logarithmic_number_of_times(monkeypatch):
+    calls = 0
+    decoder = _jsonstream._decoder
+
+    class Counting:
+        def raw_decode(self, s, idx=0):
+            nonlocal calls
+            calls += 1
+            return decoder.raw_decode(s, idx)
+
+    monkeypatch.setattr(_jsonstream, "_decoder", Counting())
+    element = {"description": "x" * 2_000_000}
+    assert _collect(json.dumps([element, 1]), 1000) == [element, 1]
+    # 2000 chunks for the element; one decode per chunk would be 2000 calls.
+    assert calls < 30
+
+
+class _Response:
+    def __init__(self, data: bytes, status: int = 200) -> None:
+        self.data = data
+        self.status = status
+        self.read = 0
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    async def aiter_bytes(self):
+        for i in range(0, len(self.data), 4):
+            self.read = i + 4
+            yield self.data[i : i + 4]
+
+
+class _Client:
+    def __init__(self, resp: _Response) -> None:
+        self.resp = resp
+
+    @asynccontextmanager
+    async def stream(self, url, *, params):
+        yield self.resp
+
+
+def test_fetch_array_reads_the_body_to_the_end():
+    resp = _Response(b'{"jobs": [{"id": 1}], "trailer": "' + b"t" * 40 + b'"}')
+
+    async def _main():
+        return [x async for x in fetch_array(_Client(resp), "https://x", params={}, key="jobs")]
+
+    assert asyncio.run(_main()) == [{"id": 1}]
+    assert resp.read >= len(resp.data)
+
+
+def test_fetch_array_raises_for_error_status():
+    async def _main():
+        return [x async for x in fetch_array(_Client(_Response(b"[]", 404)), "https://x", params={})]
+
+    with pytest.raises(RuntimeError, match="404"):
+        asyncio.run(_main())
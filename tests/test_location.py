@@ -0,0 +1,87 @@
+"""Location string classification."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from jd_filter.filters.location import LocationClassifier, classify_location
+from jd_filter.models import JobRecord
+
+
+@pytest.mark.parametrize(
+    "loc,country",
+    [
+        ("Berlin, DE", "DE"),
+        ("Toronto, CA", "CA"),
+        ("Vancouver, CA", "CA"),
+        ("Tel Aviv, IL", "IL"),
+        ("Bengaluru, IN", "IN"),
+        ("Bogota, CO", "CO"),
+        ("Jakarta, ID", "ID"),
+        ("Valletta, MT", "MT"),
+        ("Toronto, ON", "CA"),
+        ("Berlin, Germany", "DE"),
+    ],
+)
+def test_country_codes_are_not_read_as_states(loc, country):
+    assert classify_location(loc).country == country
+
+
+@pytest.mark.parametrize(
+    "loc,state",
+    [
+        ("Washington, DC", "DC"),
+        ("Washington, D.C.", "DC"),
+        ("Washington DC", "DC"),
+        ("Washington, DC, USA", "DC"),
+        ("Seattle, Washington", "WA"),
+        ("Vancouver, WA", "WA"),
+        ("San Francisco, CA", "CA"),
+        ("Remote - San Francisco, CA", "CA"),
+        ("Denver, CO", "CO"),
+        ("Chicago, IL", "IL"),
+        ("Boise, ID", "ID"),
+        ("Austin, TX", "TX"),
+        ("Paris, TX", "TX"),
+        ("Atlanta, GA", "GA"),
+        ("Palo Alto, CA 94301", "CA"),
+        # Ambiguous codes after a city not known to be foreign.
+        ("Santa Cruz, CA", "CA"),
+        ("Los Gatos, CA", "CA"),
+        ("Boulder, CO", "CO"),
+        ("Springfield, IL", "IL"),
+        ("Bloomington, IN", "IN"),
+        ("Remote - Coeur d'Alene, ID", "ID"),
+    ],
+)
+def test_us_locations(loc, state):
+    verdict = classify_location(loc)
+    assert (verdict.country, verdict.state) == ("US", state)
+
+
+@pytest.mark.parametrize("loc", ["Remote", "Gotham", "Springfield", ""])
+def test_unconfirmed_locations_are_ambiguous(loc):
+    assert classify_location(loc).ambiguous
+
+
+def _job(location: str, description: str) -> JobRecord:
+    return JobRecord(
+        id="1",
+        title="Engineer",
+        company="Acme",
+        location=location,
+        url="https://jobs.example.com/1",
+        description=description,
+        created_at=datetime(2024, 5, 1),
+        source="lever",
+    )
+
+
+def test_ambiguous_location_falls_back_to_description():
+    locations = LocationClassifier()
+    assert locations.is_us(_job("Springfield", "Open to candidates in the United States."))
+    assert not locations.is_us(_job("Springfield", "Hybrid role."))
+    assert locations.is_us(_job("Santa Cruz, CA", "Hybrid role."))
+    assert not locations.is_us(_job("Bengaluru, IN", "We are a US company."))
@@ -0,0 +1,76 @@
+"""NearDupIndex clustering and sharing one file between writers."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from jd_filter.neardup import NearDupIndex  # noqa: E402
+
+BODY = " ".join(f"word{i}" for i in range(200))
+
+
+def _job(source: str, id: str, description: str) -> SimpleNamespace:
+    return SimpleNamespace(source=source, id=id, title="Engineer", description=description)
+
+
+def test_copies_join_the_first_postings_cluster(tmp_path):
+    with NearDupIndex(tmp_path / "nd.sqlite3") as index:
+        assert index.check(_job("lever", "1", BODY)) is None
+        match = index.check(_job("lever", "2", BODY + " Austin"))
+        assert match is not None and match.cluster == "lever:1"
+        assert index.check(_job("lever", "3", "something else entirely different here")) is None
+        # Re-checking the representative does not turn it into a duplicate.
+        assert index.check(_job("lever", "1", BODY)) is None
+
+
+def test_concurrent_writers_share_one_file(tmp_path):
+    path = tmp_path / "nd.sqlite3"
+    NearDupIndex(path).close()
+    errors = []
+
+    def worker(source: str) -> None:
+        try:
+            with NearDupIndex(path, flush_every=20) as index:
+                for i in range(300):
+                    index.check(_job(source, str(i), f"{source} posting {i} " + BODY[: 50 + i]))
+                    if i % 50 == 0:
+                        time.sleep(0.01)  # let the other writer in
+        except Exception as exc:  # pragma: no cover – reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in ("lever", "ashby")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    with NearDupIndex(path) as index:
+        assert len(index) == 600
+
+
+def test_write_lock_is_released_every_flush_every_checks(tmp_path):
+    path = tmp_path / "nd.sqlite3"
+    other = sqlite3.connect(path, timeout=0)
+
+    def can_write() -> bool:
+        try:
+            other.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            return False
+        other.rollback()
+        return True
+
+    with NearDupIndex(path, flush_every=5) as index:
+        for i in range(4):
+            index.check(_job("lever", str(i), f"posting {i} " + BODY))
+        assert not can_write()
+        index.check(_job("lever", "4", "posting 4 " + BODY))
+        assert can_write()
+    other.close()
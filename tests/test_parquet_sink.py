@@ -0,0 +1,115 @@
+"""ParquetSink durability and partitioning."""
+
+from __future__ import annotations
+
+import datetime as dt
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import pyarrow.parquet as pq  # noqa: E402
+
+from jd_filter.models import JobRecord  # noqa: E402
+from jd_filter.sinks import parquet  # noqa: E402
+from jd_filter.sinks.parquet import ParquetSink, scan  # noqa: E402
+
+
+def _job(id: str, source: str = "lever") -> JobRecord:
+    return JobRecord(
+        id=id,
+        title=f"Engineer {id}",
+        company="Acme",
+        location="Remote",
+        url=f"https://jobs.example.com/{id}",
+        description="Python",
+        created_at=datetime(2024, 5, 1),
+        source=source,
+        profiles=("backend",),
+    )
+
+
+def _parts(root):
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("part-*.parquet"))
+
+
+def test_batches_are_compacted_into_one_file_per_partition(tmp_path):
+    sink = ParquetSink(tmp_path, run_date=dt.date(2024, 5, 1), run_id="r1")
+    for i in range(20):
+        sink.write([_job(str(i)), _job(f"a{i}", "ashby")])
+    # Staged (durable) but not yet part of the dataset.
+    assert len(list(tmp_path.rglob(".*.stage"))) == 40
+    assert _parts(tmp_path) == []
+    sink.flush()
+    assert _parts(tmp_path) == [
+        "source=ashby/run_date=2024-05-01/part-r1-00000.parquet",
+        "source=lever/run_date=2024-05-01/part-r1-00000.parquet",
+    ]
+    assert not list(tmp_path.rglob(".*.stage"))
+    table = scan(tmp_path, columns=["id", "source"])
+    assert table.num_rows == 40
+    sink.write([_job("late")])
+    sink.close()
+    assert scan(tmp_path).num_rows == 41
+    assert len(_parts(tmp_path)) == 3
+    assert not list(tmp_path.glob(".run-*.lock"))
+
+
+def test_rotates_at_rows_per_file(tmp_path):
+    sink = ParquetSink(tmp_path, run_date=dt.date(2024, 5, 1), run_id="r1", rows_per_file=10, row_group_size=4)
+    for i in range(25):
+        sink.write([_job(str(i))])
+    assert len(_parts(tmp_path)) == 2
+    sink.close()
+    assert len(_parts(tmp_path)) == 3
+    first = pq.ParquetFile(tmp_path / "source=lever/run_date=2024-05-01/part-r1-00000.parquet")
+    assert first.metadata.num_rows == 10
+    assert first.metadata.num_row_groups == 3
+
+
+def test_batches_staged_by_a_crashed_run_are_recovered(tmp_path):
+    crashed = ParquetSink(tmp_path, run_date=dt.date(2024, 5, 1), run_id="dead")
+    crashed.write([_job("1"), _job("2")])
+    crashed.write([_job("3")])
+    # Simulate the process dying: its lock goes away without close().
+    crashed._lock.close()
+
+    live = ParquetSink(tmp_path, run_date=dt.date(2024, 5, 1), run_id="live")
+    assert sorted(scan(tmp_path, columns=["id"])["id"].to_pylist()) == ["1", "2", "3"]
+    assert not list(tmp_path.rglob(".*.stage"))
+    live.close()
+
+
+def test_batches_of_a_live_run_are_left_alone(tmp_path):
+    running = ParquetSink(tmp_path, run_date=dt.date(2024, 5, 1), run_id="shard0")
+    running.write([_job("1")])
+    other = ParquetSink(tmp_path, run_date=dt.date(2024, 5, 1), run_id="shard1")
+    assert len(list(tmp_path.rglob(".shard0-*.stage"))) == 1
+    other.close()
+    running.close()
+    assert scan(tmp_path).num_rows == 1
+
+
+def test_partition_date_is_taken_per_write(tmp_path, monkeypatch):
+    now = [datetime(2024, 5, 1, 23, 59)]
+
+    class _Clock(dt.datetime):
+        @classmethod
+        def utcnow(cls):
+            return now[0]
+
+    monkeypatch.setattr(parquet, "_dt", SimpleNamespace(datetime=_Clock, date=dt.date))
+    sink = ParquetSink(tmp_path)
+    sink.write([_job("1")])
+    now[0] = datetime(2024, 5, 2, 0, 1)
+    sink.write([_job("2")])
+    sink.close()
+
+    table = scan(tmp_path, columns=["id", "run_date"])
+    assert sorted(zip(table["run_date"].to_pylist(), table["id"].to_pylist())) == [
+        ("2024-05-01", "1"),
+        ("2024-05-02", "2"),
+    ]
+    assert scan(tmp_path, since=dt.date(2024, 5, 2)).num_rows == 1
@@ -0,0 +1,28 @@
+"""Posting-rate window for incremental fetches."""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+
+from jd_filter.pipeline import _window_hrs
+
+
+def test_without_watermark_uses_lookback():
+    assert _window_hrs(None, 24) == 24
+
+
+def test_watermark_sets_window():
+    mark = dt.datetime.utcnow() - dt.timedelta(hours=6)
+    assert _window_hrs(mark, 24) == pytest.approx(6, abs=0.01)
+
+
+def test_aware_watermark():
+    mark = dt.datetime.now(dt.timezone.utc) - dt.timedelta(hours=30)
+    assert _window_hrs(mark, 24) == pytest.approx(30, abs=0.01)
+
+
+def test_recent_watermark_is_floored():
+    mark = dt.datetime.utcnow() - dt.timedelta(minutes=5)
+    assert _window_hrs(mark, 24) == 1.0
@@ -0,0 +1,89 @@
+"""PostgresSink schema upgrades, exercised through its SQLite code path."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+
+from jd_filter.models import JobRecord
+from jd_filter.sinks.postgres import PostgresSink, _copy_csv
+
+
+def _job(id: str, title: str, source: str = "lever") -> JobRecord:
+    return JobRecord(
+        id=id,
+        title=title,
+        company="Acme",
+        location="Remote",
+        url=f"https://jobs.example.com/{id}",
+        description="Python",
+        created_at=datetime(2024, 5, 1),
+        source=source,
+    )
+
+
+def test_upgrades_unkeyed_table_with_duplicates(tmp_path):
+    db = tmp_path / "jobs.db"
+    # The shape ``to_sql`` appends left behind: no key, repeated (source, id).
+    con = sqlite3.connect(db)
+    con.execute("CREATE TABLE jobs (id TEXT, title TEXT, company TEXT, source TEXT)")
+    con.executemany(
+        "INSERT INTO jobs VALUES (?, ?, ?, ?)",
+        [
+            ("1", "old", "Acme", "lever"),
+            ("2", "only", "Acme", "lever"),
+            ("1", "newer", "Acme", "lever"),
+            ("1", "other source", "Acme", "ashby"),
+            ("1", "newest", "Acme", "lever"),
+        ],
+    )
+    con.commit()
+    con.close()
+
+    sink = PostgresSink(f"sqlite:///{db}")
+    sink.write([_job("2", "updated"), _job("3", "new")])
+    sink.close()
+
+    con = sqlite3.connect(db)
+    rows = sorted(con.execute("SELECT source, id, title FROM jobs"))
+    con.close()
+    assert rows == [
+        ("ashby", "1", "other source"),
+        ("lever", "1", "newest"),
+        ("lever", "2", "updated"),
+        ("lever", "3", "new"),
+    ]
+
+
+def test_reopening_keeps_rows_and_upserts(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'jobs.db'}"
+    PostgresSink(uri).write([_job("1", "first")])
+    sink = PostgresSink(uri)
+    sink.write([_job("1", "second")])
+
+    con = sqlite3.connect(tmp_path / "jobs.db")
+    rows = list(con.execute("SELECT id, title FROM jobs"))
+    con.close()
+    assert rows == [("1", "second")]
+
+
+def test_last_duplicate_in_a_batch_wins(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'jobs.db'}"
+    PostgresSink(uri).write([_job("1", "first"), _job("2", "other"), _job("1", "last")])
+
+    con = sqlite3.connect(tmp_path / "jobs.db")
+    rows = sorted(con.execute("SELECT id, title FROM jobs"))
+    con.close()
+    assert rows == [("1", "last"), ("2", "other")]
+
+
+def test_copy_csv_keeps_null_apart_from_any_string():
+    text = _copy_csv([("1", None, "", r"\N", 'say "hi"', datetime(2024, 5, 1))])
+    # Only the unquoted empty field is read as NULL by COPY ... (FORMAT csv).
+    assert text == '"1",,"","\\N","say ""hi""","2024-05-01T00:00:00"\n'
+
+
+def test_copy_upsert_orders_duplicates_by_ingestion(tmp_path):
+    sql = PostgresSink(f"sqlite:///{tmp_path / 'jobs.db'}")._upsert_sql(select_from="_jobs_stage")
+    assert "SELECT DISTINCT ON (source, id)" in sql
+    assert sql.index("ORDER BY source, id, _ord DESC") < sql.index("ON CONFLICT")
@@ -0,0 +1,48 @@
+"""ProfileSet evaluation."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from jd_filter.filters.profiles import FilterProfile, ProfileSet
+from jd_filter.models import JobRecord
+
+
+def _job(title: str, description: str, location: str = "Austin, TX") -> JobRecord:
+    return JobRecord(
+        id="1",
+        title=title,
+        company="Acme",
+        location=location,
+        url="https://jobs.example.com/1",
+        description=description,
+        created_at=datetime(2024, 5, 1),
+        source="lever",
+    )
+
+
+PROFILES = ProfileSet(
+    [
+        FilterProfile(name="ml", keywords=("machine learning", "PyTorch"), exclude=("sales",)),
+        FilterProfile(name="infra", keywords=("kubernetes", "terraform"), exclude=("machine  learning",)),
+        FilterProfile(name="ml-us", keywords=("pytorch",), locations=("US",)),
+    ]
+)
+
+
+def test_terms_shared_across_profiles():
+    result = PROFILES.evaluate(_job("ML Engineer", "Machine\nLearning on Kubernetes with PyTorch."))
+    assert result.matched == ("ml", "ml-us")
+    assert result.reasons == {"infra": "bad_keyword"}
+
+
+def test_word_boundaries():
+    result = PROFILES.evaluate(_job("Engineer", "We use pytorchlike tools and salesforce."))
+    assert result.matched == ()
+    assert result.reason == "no_good_keyword"
+
+
+def test_exclusions_and_locations():
+    result = PROFILES.evaluate(_job("Sales Engineer", "PyTorch and terraform.", location="Berlin, Germany"))
+    assert result.matched == ("infra",)
+    assert result.reasons == {"ml": "bad_keyword", "ml-us": "not_us"}
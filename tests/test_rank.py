@@ -0,0 +1,83 @@
+"""Ranker scores are comparable across batches; statistics come from every posting."""
+
+from __future__ import annotations
+
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from jd_filter.rank import Ranker  # noqa: E402
+
+PROFILE = "Machine learning engineer working on PyTorch training infrastructure"
+
+
+def _job(i: int, description: str) -> SimpleNamespace:
+    return SimpleNamespace(title=f"Engineer {i}", description=description, score=None)
+
+
+DOCS = [
+    "We train large PyTorch models on GPU clusters.",
+    "Frontend engineer building React dashboards.",
+    "Machine learning infrastructure, training pipelines and PyTorch.",
+    "Sales engineer for enterprise accounts.",
+    "Data engineer maintaining Spark and Airflow pipelines for machine learning teams.",
+]
+
+
+def test_score_does_not_depend_on_batching():
+    jobs = [_job(i, d) for i, d in enumerate(DOCS)]
+    together = Ranker(PROFILE).score(jobs)
+    ranker = Ranker(PROFILE)
+    separate = [ranker.score([job])[0] for job in jobs]
+    assert separate == pytest.approx(together.tolist())
+
+
+def test_stored_statistics_are_used_by_later_rankers(tmp_path):
+    cache = tmp_path / "rank.sqlite3"
+    jobs = [_job(i, d) for i, d in enumerate(DOCS)]
+    with Ranker(PROFILE, cache) as first:
+        cold = first.score(jobs)
+        for job in jobs:
+            first.observe(job)
+        # Later batches of the same ranker still use the statistics it opened with.
+        assert first.score(jobs) == pytest.approx(cold)
+    with Ranker(PROFILE, cache) as second:
+        warm = second.score(jobs)
+    assert warm != pytest.approx(cold)
+    assert warm.argmax() in (0, 2)
+
+
+def test_profile_terms_keep_their_weight_when_fitted_on_every_posting(tmp_path):
+    kept = [_job(0, DOCS[0]), _job(2, DOCS[2])]
+
+    def fitted_on(docs, name):
+        cache = tmp_path / name
+        with Ranker(PROFILE, cache) as ranker:
+            ranker.score(kept)
+            # Scoring alone adds nothing to the statistics.
+            assert len(ranker) == 0
+            for i, d in enumerate(docs):
+                ranker.observe(_job(i, d))
+        with Ranker(PROFILE, cache) as ranker:
+            return ranker.score(kept)
+
+    # Fitted on the kept postings only, "pytorch" is in every document and
+    # weighs next to nothing.
+    assert (fitted_on(DOCS, "all.sqlite3") > 1.5 * fitted_on([DOCS[0], DOCS[2]], "kept.sqlite3")).all()
+
+
+def test_flush_prunes_the_vocabulary_to_max_terms(tmp_path):
+    cache = tmp_path / "rank.sqlite3"
+    with Ranker(PROFILE, cache, max_terms=5) as ranker:
+        for i in range(3):
+            ranker.observe(_job(i, "pytorch training " + f"rare{i}"))
+        ranker.flush()
+        assert len(ranker) == 5
+    con = sqlite3.connect(cache)
+    terms = dict(con.execute("SELECT term, df FROM terms"))
+    con.close()
+    # The terms every posting shares survive; one-off ones go first.
+    assert {"pytorch": 3, "training": 3, "engineer": 3}.items() <= terms.items()
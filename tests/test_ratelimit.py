@@ -0,0 +1,25 @@
+"""Retry-After handling in RetryPolicy."""
+
+from __future__ import annotations
+
+import httpx
+
+from jd_filter.ratelimit import RetryPolicy
+
+
+def _resp(retry_after: str | None = None) -> httpx.Response:
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return httpx.Response(429, headers=headers)
+
+
+def test_retry_after_within_max_delay_is_honoured_in_full():
+    assert RetryPolicy(max_delay=30.0).delay(1, _resp("12")) == 12.0
+
+
+def test_retry_after_beyond_max_delay_gives_up():
+    assert RetryPolicy(max_delay=30.0).delay(1, _resp("120")) is None
+
+
+def test_without_retry_after_backs_off():
+    delay = RetryPolicy(base_delay=0.5, max_delay=30.0).delay(3, _resp())
+    assert delay is not None and 0 <= delay <= 2.0
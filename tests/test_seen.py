@@ -0,0 +1,86 @@
+"""SeenIndex persistence across reopenings, expiry and shard merges."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+from jd_filter import seen as seen_module
+from jd_filter.models import JobRecord
+from jd_filter.seen import SeenIndex
+from jd_filter.shard import merge_seen
+
+
+def _job(id: str, title: str = "ML Engineer", source: str = "lever") -> JobRecord:
+    return JobRecord(
+        id=id,
+        title=title,
+        company="Acme",
+        location="Remote",
+        url=f"https://jobs.example.com/{id}",
+        description="Python",
+        created_at=datetime(2024, 5, 1),
+        source=source,
+    )
+
+
+def _at(monkeypatch, when: float) -> None:
+    monkeypatch.setattr(seen_module.time, "time", lambda: when)
+
+
+def test_marks_survive_reopening(tmp_path):
+    path = tmp_path / "seen.sqlite3"
+    with SeenIndex(path) as seen:
+        jobs = [_job("1"), _job("2")]
+        assert seen.filter_new(jobs) == jobs
+        seen.mark(jobs)
+
+    with SeenIndex(path) as seen:
+        assert len(seen) == 2
+        jobs = [_job("1"), _job("2", "Senior ML Engineer"), _job("3"), _job("1", source="ashby")]
+        # Unchanged postings are dropped; changed, new and other-source ones pass.
+        assert [(j.source, j.id) for j in seen.filter_new(jobs)] == [("lever", "2"), ("lever", "3"), ("ashby", "1")]
+
+
+def test_profile_changes_re_emit(tmp_path):
+    with SeenIndex(tmp_path / "seen.sqlite3") as seen:
+        seen.mark([_job("1")])
+        job = _job("1")
+        job.profiles = ["ml-us"]
+        assert seen.filter_new([job]) == [job]
+
+
+def test_expire_drops_entries_not_seen_recently(tmp_path, monkeypatch):
+    now = time.time()
+    with SeenIndex(tmp_path / "seen.sqlite3") as seen:
+        _at(monkeypatch, now - 40 * 86400)
+        seen.mark([_job("old"), _job("kept")])
+        _at(monkeypatch, now)
+        # Still listed, so its last_seen is refreshed.
+        seen.mark([_job("kept")])
+        assert seen.expire(30) == 1
+        assert [j.id for j in seen.filter_new([_job("old"), _job("kept")])] == ["old"]
+
+
+def test_merge_keeps_the_newest_content_and_earliest_first_seen(tmp_path, monkeypatch):
+    a, b, out = tmp_path / "a.sqlite3", tmp_path / "b.sqlite3", tmp_path / "out.sqlite3"
+    _at(monkeypatch, 1000.0)
+    with SeenIndex(a) as seen:
+        seen.mark([_job("1", "v1"), _job("2")])
+    _at(monkeypatch, 2000.0)
+    with SeenIndex(b) as seen:
+        seen.mark([_job("1", "v2"), _job("3")])
+
+    # Order-independent: merging b then a gives the same rows as a then b.
+    assert merge_seen([b, a], out) == 3
+    with SeenIndex(out) as merged:
+        rows = merged._conn.execute("SELECT id, content_hash, first_seen, last_seen FROM seen ORDER BY id").fetchall()
+        assert merged.filter_new([_job("1", "v2"), _job("2"), _job("3")]) == []
+        stale = _job("1", "v1")
+        assert merged.filter_new([stale]) == [stale]
+    assert [(r[0], r[2], r[3]) for r in rows] == [("1", 1000.0, 2000.0), ("2", 1000.0, 1000.0), ("3", 2000.0, 2000.0)]
+
+    out2 = tmp_path / "out2.sqlite3"
+    merge_seen([a, b], out2)
+    with SeenIndex(out2) as merged:
+        assert merged._conn.execute("SELECT id, content_hash, first_seen, last_seen FROM seen ORDER BY id").fetchall() == rows
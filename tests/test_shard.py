@@ -0,0 +1,59 @@
+"""run_sharded over local worker processes against the mock ATS server."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from mock_ats import MockConfig, run_in_process  # noqa: E402
+
+from jd_filter.neardup import NearDupIndex  # noqa: E402
+from jd_filter.shard import partition, run_sharded  # noqa: E402
+
+HOSTS = ("api.lever.co", "boards-api.greenhouse.io", "api.ashbyhq.com")
+ORGS = {"lever": [f"org{i:03d}" for i in range(0, 24, 3)], "greenhouse": [f"org{i:03d}" for i in range(1, 24, 3)]}
+
+
+@pytest.fixture
+def mock_ats(tmp_path, monkeypatch):
+    # Workers inherit the environment: keep their slug registries out of the package.
+    monkeypatch.setenv("JD_FILTER_REGISTRY_DIR", str(tmp_path / "registry"))
+    ctx = mp.get_context("spawn")
+    ports = ctx.Queue()
+    server = ctx.Process(target=run_in_process, args=(MockConfig(postings_per_org=5), ports), daemon=True)
+    server.start()
+    try:
+        port = ports.get(timeout=30)
+        yield {h: f"http://127.0.0.1:{port}" for h in HOSTS}
+    finally:
+        server.terminate()
+        server.join()
+
+
+def test_workers_share_the_near_dup_index(tmp_path, mock_ats):
+    assert all(any(shard.values()) for shard in partition(ORGS, 2))
+    near_dup = tmp_path / "near_dup.sqlite3"
+    results = run_sharded(
+        ORGS,
+        2,
+        host_map=mock_ats,
+        csv_path=tmp_path / "out.csv",
+        near_dup_path=near_dup,
+        probe=False,
+    )
+    assert len(results) == 2
+    assert all(r["fetched"] for r in results)
+    # Every posting that passed the filters was either kept or clustered, in one shared index.
+    assert sum(r["filtered"] for r in results) >= 1
+    with NearDupIndex(near_dup) as index:
+        assert len(index) >= 1
+
+
+def test_archive_needs_a_single_worker(tmp_path):
+    with pytest.raises(ValueError, match="single writer"):
+        run_sharded(ORGS, 2, csv_path=tmp_path / "out.csv", archive_dir=tmp_path / "archive")
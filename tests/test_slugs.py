@@ -0,0 +1,155 @@
+"""Slug registry round trips and validation: TTL skips, concurrent probes, the fail streak."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import httpx
+
+from jd_filter.sources import _slugs
+from jd_filter.sources._slugs import FAIL_THRESHOLD, SlugRegistry, validate_slugs
+
+
+class _Client:
+    """Answers probes from a ``slug -> status`` map (an exception is raised instead)."""
+
+    def __init__(self, statuses) -> None:
+        self.statuses = statuses
+        self.probed = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, url, *, params, timeout):
+        slug = url.rsplit("/", 1)[-1]
+        self.probed.append(slug)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            status = self.statuses.get(slug, 200)
+            if isinstance(status, Exception):
+                raise status
+            return httpx.Response(status, request=httpx.Request("GET", url))
+        finally:
+            self.in_flight -= 1
+
+
+def _validate(registry, client, slugs, **kwargs):
+    return asyncio.run(
+        validate_slugs(
+            slugs,
+            registry=registry,
+            url_for=lambda slug: f"https://ats.example.com/{slug}",
+            params={},
+            label="test",
+            transport=client,
+            **kwargs,
+        )
+    )
+
+
+def test_gone_slugs_are_dropped_at_the_threshold(tmp_path):
+    client = _Client({"gone": 404, "moved": 410, "flaky": 503, "down": httpx.ConnectError("boom")})
+    slugs = ["gone", "ok", "moved", "flaky", "down"]
+    with SlugRegistry(tmp_path / "slugs.sqlite3", "lever") as registry:
+        for _ in range(FAIL_THRESHOLD - 1):
+            # Stale OK slugs are probed every time with ttl_hrs=0.
+            assert _validate(registry, client, slugs, ttl_hrs=0) == slugs
+        # Transient errors never count; only the 404/410 streak does.
+        assert _validate(registry, client, slugs, ttl_hrs=0) == ["ok", "flaky", "down"]
+        assert registry.fails("gone") == FAIL_THRESHOLD
+        assert registry.fails("flaky") == 0
+
+
+def test_a_200_resets_the_streak(tmp_path):
+    with SlugRegistry(tmp_path / "slugs.sqlite3", "lever") as registry:
+        for _ in range(FAIL_THRESHOLD):
+            _validate(registry, _Client({"back": 404}), ["back"], ttl_hrs=0)
+        assert _validate(registry, _Client({}), ["back"], ttl_hrs=0) == ["back"]
+        assert registry.fails("back") == 0
+
+
+def test_fresh_slugs_skip_the_probe_until_the_ttl_expires(tmp_path, monkeypatch):
+    path = tmp_path / "slugs.sqlite3"
+    with SlugRegistry(path, "ashby") as registry:
+        _validate(registry, _Client({}), ["a", "b"], ttl_hrs=24)
+
+    client = _Client({})
+    with SlugRegistry(path, "ashby") as registry:
+        assert _validate(registry, client, ["a", "b", "c"], ttl_hrs=24) == ["a", "b", "c"]
+    assert client.probed == ["c"]
+
+    now = time.time()
+    monkeypatch.setattr(_slugs.time, "time", lambda: now + 25 * 3600)
+    client = _Client({"a": 404})
+    with SlugRegistry(path, "ashby") as registry:
+        assert not registry.is_fresh("a", 24)
+        assert _validate(registry, client, ["a", "b", "c"], ttl_hrs=24) == ["a", "b", "c"]
+        assert registry.fails("a") == 1
+    assert sorted(client.probed) == ["a", "b", "c"]
+
+
+def test_probes_run_concurrently_up_to_the_limit(tmp_path):
+    client = _Client({})
+    slugs = [f"s{i:02d}" for i in range(30)]
+    with SlugRegistry(tmp_path / "slugs.sqlite3", "lever") as registry:
+        assert _validate(registry, client, slugs, concurrency=5) == slugs
+    assert sorted(client.probed) == slugs
+    assert 1 < client.max_in_flight <= 5
+
+
+def test_added_slugs_persist_and_known_ones_are_left_alone(tmp_path):
+    path = tmp_path / "slugs.sqlite3"
+    with SlugRegistry(path, "lever") as registry:
+        registry.add(["acme", "globex"])
+        registry.record_ok("acme", latency=0.2, postings_per_day=4.0)
+        assert registry.slugs() == []  # buffered until save
+        registry.save()
+        assert registry.slugs() == ["acme", "globex"]
+
+    with SlugRegistry(path, "lever") as registry:
+        registry.add(["acme", "initech"])
+        registry.save()
+        assert registry.slugs() == ["acme", "globex", "initech"]
+        stats = registry.stats("acme")
+        assert stats["fails"] == 0 and stats["last_ok"] is not None
+        assert stats["latency_ms"] == 200.0 and stats["postings_per_day"] == 4.0
+    # Sources share the file but not their slugs.
+    with SlugRegistry(path, "ashby") as registry:
+        assert registry.slugs() == []
+
+
+def test_dead_slugs_are_hidden_until_revived(tmp_path):
+    path = tmp_path / "slugs.sqlite3"
+    with SlugRegistry(path, "ashby") as registry:
+        registry.add(["acme", "gone"])
+        assert [registry.record_gone("gone") for _ in range(FAIL_THRESHOLD)] == [True, True, False]
+
+    with SlugRegistry(path, "ashby") as registry:
+        assert registry.fails("gone") == FAIL_THRESHOLD
+        assert registry.slugs() == ["acme"]
+        assert registry.slugs(include_dead=True) == ["acme", "gone"]
+        assert not registry.record_gone("gone")
+        registry.record_ok("gone")
+
+    with SlugRegistry(path, "ashby") as registry:
+        assert registry.slugs() == ["acme", "gone"]
+        assert registry.stats("gone")["fails"] == 0
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    path = tmp_path / "slugs.sqlite3"
+    legacy = tmp_path / "lever_slugs.json"
+    legacy.write_text(json.dumps({"acme": 0, "gone": FAIL_THRESHOLD, "old": {"fails": 1, "last_ok": 1.0}}))
+    with SlugRegistry(path, "lever", legacy_json=legacy) as registry:
+        assert registry.slugs(include_dead=True) == ["acme", "gone", "old"]
+        assert registry.slugs() == ["acme", "old"]
+        assert registry.stats("old")["last_ok"] == 1.0
+        registry.record_ok("gone")
+
+    legacy.write_text(json.dumps({"acme": 0, "gone": FAIL_THRESHOLD, "new": 0}))
+    with SlugRegistry(path, "lever", legacy_json=legacy) as registry:
+        # The import already ran for this source, so "new" is not picked up.
+        assert registry.slugs() == ["acme", "gone", "old"]
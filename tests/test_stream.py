@@ -0,0 +1,70 @@
+"""Streaming batches: size boundaries, time-based flushes and per-posting filtering."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+from jd_filter import pipeline
+from jd_filter.models import JobRecord
+
+
+def _job(i: int, *, title: str = "Machine Learning Engineer", url: str | None = None) -> JobRecord:
+    return JobRecord(
+        id=str(i),
+        title=title,
+        company="Acme",
+        location="San Francisco, CA, United States",
+        url=url or f"https://jobs.example.com/{i}",
+        description="Work with PyTorch on LLMs.",
+        created_at=datetime.utcnow() - timedelta(hours=1),
+        source="lever",
+    )
+
+
+def _feed(monkeypatch, items) -> None:
+    """Replace the fetch stage: *items* are jobs, or float seconds to pause."""
+
+    async def fake_stream_jobs(orgs, since_hrs, **kwargs):
+        for item in items:
+            if isinstance(item, float):
+                await asyncio.sleep(item)
+            else:
+                yield item
+
+    monkeypatch.setattr(pipeline, "_stream_jobs", fake_stream_jobs)
+
+
+def _batches(**kwargs):
+    async def _main():
+        return [[j.id for j in batch] async for batch in pipeline.stream({}, **kwargs)]
+
+    return asyncio.run(_main())
+
+
+def test_batches_split_at_batch_size(monkeypatch):
+    _feed(monkeypatch, [_job(i) for i in range(7)])
+    assert _batches(batch_size=3, flush_secs=60) == [["0", "1", "2"], ["3", "4", "5"], ["6"]]
+
+
+def test_exact_multiple_leaves_no_empty_batch(monkeypatch):
+    _feed(monkeypatch, [_job(i) for i in range(6)])
+    assert _batches(batch_size=3, flush_secs=60) == [["0", "1", "2"], ["3", "4", "5"]]
+
+
+def test_rejected_postings_do_not_count_towards_a_batch(monkeypatch):
+    stats = pipeline.PipelineStats()
+    _feed(
+        monkeypatch,
+        [_job(0), _job(1, title="Sales Executive"), _job(2, url="https://jobs.example.com/0"), _job(3), _job(4)],
+    )
+    assert _batches(batch_size=2, flush_secs=60, stats=stats) == [["0", "3"], ["4"]]
+    assert (stats.fetched, stats.unique, stats.filtered) == (5, 4, 3)
+    assert stats.rejected["duplicate"] == 1
+
+
+def test_slow_sources_flush_after_flush_secs(monkeypatch):
+    # The first two arrive together; the third comes after flush_secs and
+    # flushes all three; the last one is flushed at the end of the stream.
+    _feed(monkeypatch, [_job(0), _job(1), 0.3, _job(2), _job(3)])
+    assert _batches(batch_size=100, flush_secs=0.2) == [["0", "1", "2"], ["3"]]
@@ -0,0 +1,47 @@
+"""html_to_text: entities, escaped markup and whitespace."""
+
+from __future__ import annotations
+
+import pytest
+
+from jd_filter.text import html_to_text
+
+
+@pytest.mark.parametrize(
+    "raw,text",
+    [
+        # Greenhouse sends its HTML entity-escaped, so "&" arrives as "&amp;amp;".
+        ("&lt;p&gt;Python &amp;amp; ML&lt;/p&gt;&lt;ul&gt;&lt;li&gt;PyTorch&lt;/li&gt;&lt;/ul&gt;", "Python & ML\n\nPyTorch"),
+        ("AT&amp;T", "AT&T"),
+        ("AT&T rocks", "AT&T rocks"),
+        ("<p>caf&eacute; &#8212; it&#x2019;s</p>", "café — it’s"),
+        ("x < y & z", "x < y & z"),
+    ],
+)
+def test_entities(raw, text):
+    assert html_to_text(raw) == text
+
+
+@pytest.mark.parametrize(
+    "raw,text",
+    [
+        ("a&nbsp;&nbsp;b\t\tc", "a b c"),
+        ("  plain   text \n\n\n\n more ", "plain text\n\nmore"),
+        ("<p>One</p>\n\n\n<p>Two</p><br/>Three", "One\n\nTwo\n\nThree"),
+        ("<div>a</div><div>b</div>", "a\n\nb"),
+        ("<span>in</span><b>line</b> <i>tags</i>", "inline tags"),
+        ("<ul>\n  <li> one </li>\n  <li>two</li>\n</ul>", "one\n\ntwo"),
+    ],
+)
+def test_whitespace(raw, text):
+    assert html_to_text(raw) == text
+
+
+def test_script_and_style_are_dropped():
+    raw = "<style>p { color: red }</style><p>Hi<script>track()</script> there</p><noscript>js off</noscript>"
+    assert html_to_text(raw) == "Hi there"
+
+
+def test_plain_text_is_only_tidied():
+    assert html_to_text("Python, PyTorch\n\nRemote (US)") == "Python, PyTorch\n\nRemote (US)"
+    assert html_to_text("") == ""
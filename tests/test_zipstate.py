@@ -0,0 +1,84 @@
+"""The bundled ZIP table against the uszipcode lookup it replaced."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from jd_filter.filters.zipstate import ZIP_SPACE, zip_to_state
+
+# Resolved by uszipcode's simple DB (the lookup ``is_us`` used before the table).
+KNOWN = {
+    "00501": "NY",
+    "00601": "PR",
+    "02139": "MA",
+    "10001": "NY",
+    "12345": "NY",
+    "20001": "DC",
+    "20500": "DC",
+    "30301": "GA",
+    "33101": "FL",
+    "60601": "IL",
+    "73301": "TX",
+    "85001": "AZ",
+    "94301": "CA",
+    "96815": "HI",
+    "98101": "WA",
+    "99501": "AK",
+}
+
+
+# Every 8th ZIP of the database bundled with uszipcode 0.1.3 (the last
+# release that ships one; see "source" in the file).
+FIXTURE = Path(__file__).with_name("data") / "uszipcode_states.json"
+
+
+def _old_lookup():
+    """Return the pre-table ``zip -> state`` function, or skip if its DB is not installed."""
+    search = pytest.importorskip("uszipcode.search")
+    if not search.is_simple_db_file_exists(search.HOME_USZIPCODE):
+        pytest.skip("uszipcode simple DB not downloaded")
+    engine = search.SearchEngine(simple_zipcode=True)
+
+    def lookup(zipc: str):
+        res = engine.by_zipcode(zipc)
+        return (res.to_dict().get("state") if res else None) or None
+
+    return lookup
+
+
+@pytest.mark.parametrize("zipc,state", sorted(KNOWN.items()))
+def test_known_zips(zipc, state):
+    assert zip_to_state(zipc) == state
+
+
+@pytest.mark.parametrize("zipc", ["00000", "99999", "1234", "123456", "abcde", ""])
+def test_unknown_or_malformed(zipc):
+    assert zip_to_state(zipc) is None
+
+
+def test_matches_uszipcode_fixture():
+    expected = json.loads(FIXTURE.read_text(encoding="utf-8"))["states"]
+    assert len(expected) > 4000
+    got = {zipc: zip_to_state(zipc) for zipc in expected}
+    assert got == expected
+
+
+def test_matches_uszipcode_on_sample():
+    lookup = _old_lookup()
+    sample = sorted({f"{i:05d}" for i in range(0, ZIP_SPACE, 37)} | set(KNOWN))
+    conflicts = []
+    missing = []
+    for zipc in sample:
+        expected, got = lookup(zipc), zip_to_state(zipc)
+        if expected and got and expected != got:
+            conflicts.append((zipc, expected, got))
+        elif bool(expected) != bool(got):
+            missing.append((zipc, expected, got))
+    # The table may be built from the ``zipcodes`` dataset (see zipstate.py);
+    # both derive from USPS data, so no ZIP may change state and only a few
+    # retired or newly issued ZIPs may be known to one source alone.
+    assert not conflicts, conflicts[:20]
+    assert len(missing) <= len(sample) // 200, missing[:20]